@@ -1,25 +1,24 @@
 import streamlit as st
+import json
 import tempfile
-import os
+import time
+from contextlib import nullcontext
 # import pandas as pd (Removed for Lite Mode)
 # import altair as alt (Removed for Lite Mode)
 # import plotly.graph_objects as go (Removed for Lite Mode)
 
-from src.utils.preprocess import extract_text, clean_text
-from src.utils.segmenter import segment_clauses
-from src.utils.classifier import classify_clause
-from src.utils.contract_classifier import classify_contract
-from src.engines.risk_engine import assess_risk_with_explanation, contract_risk_score, calculate_financial_risk
-from src.services.llm import analyze_clause_with_reasoning, generate_decision_summary
+from src.utils.preprocess import extract_text
+from src.engines.pipeline import analyze_contract, get_result_cache
+from src.engines.results import compact_analysis
+from src.services.llm import analyze_clause_with_reasoning, llm_configured
+from src.services.jobs import get_job_queue, submit_analysis_jobs, DONE, FINISHED_STATES
+from src.config import MAX_UPLOAD_BYTES, JOB_POLL_SECONDS
 from src.services.audit import log_event
 from src.services.export_pdf import export_professional_report
-from src.services.ner import extract_entities
-from src.utils.ambiguity import detect_ambiguity
+from src.utils.instrumentation import capture, metrics, metrics_snapshot, prometheus_text
 from src.utils.templates import generate_template
 from src.utils.vector_store import get_vector_kb
-from src.engines.comparison_engine import compare_clause_to_standard
-from src.services.multilingual import is_hindi, normalize_hindi_contract, format_for_display, detect_hindi_risk_keywords
-from src.engines.decision_engine import make_decision
+from src.engines.comparison_engine import compare_clauses_to_standard
 from src.engines.compliance_checker import check_compliance, generate_compliance_summary
 
 st.set_page_config(page_title="Contract Risk Bot 🇮🇳", layout="wide", page_icon="📜")
@@ -134,24 +133,17 @@ if page == "🔍 Analyze Contract":
         st.markdown("### 📥 Import Contract")
         uploaded_file = st.file_uploader("Upload Contract (PDF, DOCX, TXT)", type=["pdf", "docx", "txt"])
         
-        # Security: 5MB File Size Limit
-        MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
+        # Security: 5MB File Size Limit (shared with the API)
+        MAX_FILE_SIZE = MAX_UPLOAD_BYTES
         
         if uploaded_file is not None:
             if uploaded_file.size > MAX_FILE_SIZE:
                 st.error("⚠️ File is too large. Maximum size allowed is 5MB for security reasons.")
                 st.session_state["contract_text"] = None # Clear any previous file
             else:
-                tmp_file_path = None
                 try:
-                    # Save uploaded file to temp file for processing
-                    suffix = f".{uploaded_file.name.split('.')[-1]}"
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-                        tmp_file.write(uploaded_file.read())
-                        tmp_file_path = tmp_file.name
-
-                    # Process the file
-                    raw_text = extract_text(tmp_file_path)
+                    # Read straight from the in-memory upload (nothing is written to disk)
+                    raw_text = extract_text(uploaded_file)
                     
                     if len(raw_text) < 50:
                         st.error("⚠️ Could not extract text. The file might be empty or scanned image (OCR not supported in demo).")
@@ -163,11 +155,6 @@ if page == "🔍 Analyze Contract":
                 except Exception as e:
                     st.error(f"Error processing file: {str(e)}")
                     st.session_state["contract_text"] = None
-                
-                finally:
-                    # Security: Immediate Cleanup
-                    if tmp_file_path and os.path.exists(tmp_file_path):
-                        os.unlink(tmp_file_path)
         
         if st.session_state["analyzed_results"] is None:
             st.markdown("---")
@@ -211,132 +198,26 @@ if page == "🔍 Analyze Contract":
                 # Load AI Engine On-Demand
                 kb = get_vector_store()
                 
-                # Check for Hindi content
-                is_hindi_contract = is_hindi(raw_text)
+                # Run the fast keyword pipeline (normalize → classify → NER → segment → risk → decision)
+                profiling = st.session_state.get("profile_next_analysis", False)
+                with capture(cpu=True, memory=True) if profiling else nullcontext() as profile:
+                    # A profiled run skips the result cache, so the whole pipeline is measured
+                    analysis = analyze_contract(raw_text, cache=None if profiling else get_result_cache())
+                if profiling:
+                    st.session_state["last_profile"] = profile.to_dict()
+                    st.session_state["profile_next_analysis"] = False
                 
-                if is_hindi_contract:
+                if analysis.is_hindi:
                     st.info("🇮🇳 **Hindi Contract Detected** - Using multilingual analysis engine")
-                    
-                    # Normalize Hindi text
-                    normalized_text, translation_metadata = normalize_hindi_contract(raw_text)
-                    text = clean_text(normalized_text)
-                    display_text = format_for_display(raw_text, True)
-                    
-                    # Detect Hindi risk keywords
-                    hindi_risks = detect_hindi_risk_keywords(raw_text)
-                    
-                else:
-                    text = clean_text(raw_text)
-                    display_text = raw_text
-                    translation_metadata = {"is_hindi": False}
-                    hindi_risks = {"High": [], "Medium": []}
-                
-                # 1. Contract Classification
-                contract_type = classify_contract(text)
-                
-                # 2. Named Entity Recognition
-                entities = extract_entities(text)
-                
-                # 3. Clause Segmentation
-                clauses = segment_clauses(text)
-                
-                # 4. FAST Analysis (Keyword-Based Only - Instant Results!)
-                results = []
-                for idx, clause in enumerate(clauses, start=1):
-                    clause_type = classify_clause(clause)
-                    
-                    # Keyword-based risk assessment (fast!)
-                    risk_data = assess_risk_with_explanation(clause)
-                    risk = risk_data["risk"]
-                    triggers = risk_data.get("triggers", [])
-                    
-                    # Basic explanations (no AI needed)
-                    if risk == "High":
-                        explanation = "High risk detected by keyword analysis"
-                        suggestion = "Consult legal counsel before signing"
-                    elif risk == "Medium":
-                        explanation = "Medium risk - review carefully"
-                        suggestion = "Consider negotiating this clause"
-                    else:
-                        explanation = "Low risk - appears to be standard language"
-                        suggestion = "No changes needed"
-                    
-                    business_consequences = []
-                    negotiation_script = ""
-                    mitigation_strategies = []
-                    
-                    # Detect ambiguity
-                    ambiguity_terms = detect_ambiguity(clause)
-                    
-                    # Determine modality (Obligation/Right/Prohibition)
-                    clause_lower = clause.lower()
-                    if "shall not" in clause_lower or "will not" in clause_lower or "prohibited" in clause_lower:
-                        modality = "Prohibition"
-                    elif "shall" in clause_lower or "must" in clause_lower or "agree to" in clause_lower:
-                        modality = "Obligation"
-                    elif "may" in clause_lower or "entitled to" in clause_lower:
-                        modality = "Right"
-                    else:
-                        modality = "Other"
-                    
-                    results.append({
-                        "id": idx,
-                        "text": clause,
-                        "type": clause_type,
-                        "risk": risk,
-                        "explanation": explanation,
-                        "suggestion": suggestion,
-                        "modality": modality,
-                        "ambiguity": ambiguity_terms,
-                        "triggers": triggers,
-                        "business_consequences": business_consequences,
-                        "negotiation_script": negotiation_script,
-                        "mitigation_strategies": mitigation_strategies
-                    })
-                
-                # 5. Overall Risk Score
-                overall_risk = contract_risk_score(results)
-                
-                # 6. Financial Impact Calculation
-                financial_impact = calculate_financial_risk(results, entities)
-                
-                # 7. **NEW: DECISION GENERATION** - The key differentiator
-                decision = make_decision({
-                    'results': results,
-                    'high_risk_count': sum(1 for r in results if r["risk"] == "High"),
-                    'medium_risk_count': sum(1 for r in results if r["risk"] == "Medium"),
-                    'financial_impact': financial_impact,
-                    'contract_type': contract_type,
-                    'overall_risk': overall_risk
-                })
-                
-                # 8. **OPTIONAL: COMPLIANCE CHECKING** - Disabled for speed
-                # compliance_report = check_compliance(text, contract_type, results)
-                compliance_report = {
-                    "overall_status": "Not Analyzed (Speed Mode)",
-                    "violations": [],
-                    "warnings": []
-                }
                 
                 # Store results
-                st.session_state["analyzed_results"] = {
-                    "text": display_text,
-                    "norm_text": text,
-                    "contract_type": contract_type,
-                    "entities": entities,
-                    "clauses_count": len(clauses),
-                    "results": results,
-                    "overall_risk": overall_risk,
-                    "high_risk_count": sum(1 for r in results if r["risk"] == "High"),
-                    "medium_risk_count": sum(1 for r in results if r["risk"] == "Medium"),
-                    "financial_impact": financial_impact,
-                    "is_hindi": is_hindi_contract,
-                    "translation_metadata": translation_metadata,
-                    "hindi_risks": hindi_risks,
-                    "decision": decision,  # **NEW: Decision data**
-                    "compliance": compliance_report  # **NEW: Compliance data**
-                }
-                log_event(f"Analyzed {contract_type} ({'Hindi' if is_hindi_contract else 'English'}) with risk {overall_risk}")
+                # Clause results are kept as a compact table over the shared normalized text
+                analysis_dict = analysis.to_dict()
+                st.session_state["analyzed_results"] = compact_analysis(analysis_dict)
+                if llm_configured():
+                    # AI enhancement, compliance and the decision summary run in the background
+                    st.session_state["analyzed_results"]["jobs"] = submit_analysis_jobs(analysis_dict)
+                log_event(f"Analyzed {analysis.contract_type} ({'Hindi' if analysis.is_hindi else 'English'}) with risk {analysis.overall_risk}")
                 
                 st.success("✅ Analysis Complete!")
 
@@ -344,6 +225,45 @@ if page == "🔍 Analyze Contract":
     if st.session_state["analyzed_results"]:
         data = st.session_state["analyzed_results"]
         
+        # ═══════════════════════════════════════════════════════════════
+        # BACKGROUND AI JOBS - merge results into the clauses as they arrive
+        # ═══════════════════════════════════════════════════════════════
+        
+        jobs = data.setdefault("jobs", {})
+        merged_clauses = data.setdefault("ai_merged", set())  # clause indexes already updated by AI
+        job_status = {}  # kind -> snapshot, for jobs still queued or running
+        for kind, job_id in list(jobs.items()):
+            job = get_job_queue().get(job_id)
+            if kind == "enhance" and job is not None:
+                # Clause analyses stream in while the job runs: merge each one once
+                for idx, ai_analysis in job["partial"].items():
+                    if idx in merged_clauses or not ai_analysis:
+                        continue
+                    merged_clauses.add(idx)
+                    result = data["results"][idx]
+                    # Update results with AI insights
+                    result["explanation"] = ai_analysis.get("plain_english", result["explanation"])
+                    result["suggestion"] = ai_analysis.get("standard_alternative", result["suggestion"])
+                    result["business_consequences"] = ai_analysis.get("business_consequences", [])
+                    result["negotiation_script"] = ai_analysis.get("negotiation_script", "")
+                    result["mitigation_strategies"] = ai_analysis.get("mitigation_strategies", [])
+                    # Update risk if AI sees it differently
+                    ai_risk = ai_analysis.get("risk_level", result["risk"])
+                    if ai_risk in ["High", "Medium", "Low"]:
+                        result["risk"] = ai_risk
+            if job is not None and job["state"] not in FINISHED_STATES:
+                job_status[kind] = job
+                continue
+            del jobs[kind]
+            if job is None or job["state"] != DONE:
+                st.warning(f"⚠️ Background AI task '{kind}' failed: {job['error'] if job else 'expired'}")
+            elif kind == "enhance":
+                data["ai_enhanced"] = True
+            elif kind == "compliance":
+                data["compliance"] = job["result"]
+            elif kind == "decision_summary":
+                data["decision_summary"] = job["result"]
+        
         # Show Hindi processing info if applicable
         if data.get("is_hindi", False):
             st.info("""
@@ -550,6 +470,8 @@ if page == "🔍 Analyze Contract":
         compliance = data.get("compliance", {})
         if compliance:
             st.subheader("⚖️ Indian Law Compliance Check")
+            if "compliance" in job_status:
+                st.caption("⏳ Rule-based results below. Claude is reviewing the uncertain findings in the background...")
             
             status = compliance.get("overall_status", "Unknown")
             status_colors = {
@@ -573,15 +495,17 @@ if page == "🔍 Analyze Contract":
             if violations or warnings:
                 with st.expander(f"View {len(violations + warnings)} Compliance Issue(s)", expanded=(status == "Non-Compliant")):
                     for violation in violations:
-                        st.error(f"**{violation['law']}** ({violation['severity']})")
-                        st.markdown(f"- *Issue:* {violation['issue']}")
-                        st.markdown(f"- *Recommendation:* {violation['recommendation']}")
+                        clause_ref = f" — Clause {violation['clause_id']}" if violation.get('clause_id') else ""
+                        st.error(f"**{violation.get('law', 'Indian law')}** ({violation.get('severity', 'Medium')}){clause_ref}")
+                        st.markdown(f"- *Issue:* {violation.get('issue', '')}")
+                        st.markdown(f"- *Recommendation:* {violation.get('recommendation', '')}")
                         st.divider()
                     
                     for warning in warnings:
-                        st.warning(f"**{warning['law']}** ({warning['severity']})")
-                        st.markdown(f"- *Issue:* {warning['issue']}")
-                        st.markdown(f"- *Recommendation:* {warning['recommendation']}")
+                        clause_ref = f" — Clause {warning['clause_id']}" if warning.get('clause_id') else ""
+                        st.warning(f"**{warning.get('law', 'Indian law')}** ({warning.get('severity', 'Medium')}){clause_ref}")
+                        st.markdown(f"- *Issue:* {warning.get('issue', '')}")
+                        st.markdown(f"- *Recommendation:* {warning.get('recommendation', '')}")
                         st.divider()
         
         st.divider()
@@ -675,43 +599,16 @@ if page == "🔍 Analyze Contract":
         # 🚀 OPTIONAL: GET DETAILED AI ANALYSIS
         # ═══════════════════════════════════════════════════════════════
         
-        if os.getenv("ANTHROPIC_API_KEY") and not data.get("ai_enhanced", False):
+        if "enhance" in job_status:
+            enhance_job = job_status["enhance"]
+            st.info("💡 **Fast analysis complete!** Detailed AI analysis (business consequences, negotiation scripts) is running in the background.")
+            st.progress(enhance_job["progress"], text=f"🧠 {enhance_job['message']}")
+        elif llm_configured() and not data.get("ai_enhanced", False):
             st.info("💡 **Fast analysis complete!** For deeper insights, business consequences, and negotiation scripts, get detailed AI analysis below.")
             
             if st.button("🤖 Get Detailed AI Analysis", type="primary", use_container_width=True):
-                with st.spinner("🧠 Running deep AI analysis on all clauses... (3-5 seconds)"):
-                    # Prepare clauses for batch
-                    clauses_for_batch = []
-                    for result in data["results"]:
-                        clauses_for_batch.append({
-                            "text": result["text"],
-                            "type": result["type"]
-                        })
-                    
-                    # Run batch AI analysis
-                    from src.services.llm import analyze_all_clauses_batch
-                    batch_results = analyze_all_clauses_batch(clauses_for_batch)
-                    
-                    # Update results with AI insights
-                    for idx, result in enumerate(data["results"]):
-                        if batch_results and idx < len(batch_results):
-                            ai_analysis = batch_results[idx]
-                            result["explanation"] = ai_analysis.get("plain_english", result["explanation"])
-                            result["suggestion"] = ai_analysis.get("standard_alternative", result["suggestion"])
-                            result["business_consequences"] = ai_analysis.get("business_consequences", [])
-                            result["negotiation_script"] = ai_analysis.get("negotiation_script", "")
-                            result["mitigation_strategies"] = ai_analysis.get("mitigation_strategies", [])
-                            # Update risk if AI sees it differently
-                            ai_risk = ai_analysis.get("risk_level", result["risk"])
-                            if ai_risk in ["High", "Medium", "Low"]:
-                                result["risk"] = ai_risk
-                    
-                    # Mark as AI-enhanced
-                    st.session_state["analyzed_results"]["ai_enhanced"] = True
-                    data = st.session_state["analyzed_results"]
-                    
-                    st.success("✨ AI analysis complete! Scroll down to see detailed insights.")
-                    st.rerun()
+                jobs.update(submit_analysis_jobs(data, kinds=("enhance",)))
+                st.rerun()
         elif data.get("ai_enhanced", False):
             st.success("✨ **AI-Enhanced Analysis** - Showing detailed business insights and negotiation scripts")
         
@@ -780,18 +677,15 @@ if page == "🔍 Analyze Contract":
                 st.markdown("**Liability Caps:** " + (", ".join(liability_caps[:2]) if liability_caps else "None detected"))
         
         # Decision-focused AI Summary
-        if st.button("🧠 Generate Decision Summary (AI)", type="primary"):
-            with st.spinner("Consulting Claude AI for decision guidance..."):
-                summary = generate_decision_summary(
-                    data['norm_text'], 
-                    data.get('decision', {}),
-                    {
-                        'overall_risk': data['overall_risk'],
-                        'clauses': data['results']
-                    }
-                )
-                st.markdown("### 📋 AI Decision Summary")
-                st.markdown(summary)
+        if data.get("decision_summary"):
+            st.markdown("### 📋 AI Decision Summary")
+            st.markdown(data["decision_summary"])
+        elif "decision_summary" in job_status:
+            st.info("🧠 Consulting Claude AI for decision guidance... The summary will appear here.")
+        elif llm_configured():
+            if st.button("🧠 Generate Decision Summary (AI)", type="primary"):
+                jobs.update(submit_analysis_jobs(data, kinds=("decision_summary",)))
+                st.rerun()
         
         # Detailed Clause Analysis
         st.divider()
@@ -803,6 +697,16 @@ if page == "🔍 Analyze Contract":
             f"⚠️ Medium Risk ({data['medium_risk_count']})"
         ])
         
+        # Standard-clause comparisons for High/Medium clauses: computed once per analysis
+        # (one batched AI request) and kept with the results, so reruns reuse them
+        comparisons = data.setdefault("comparisons", {})
+        to_compare = [item for item in data["results"] if item["risk"] in ["High", "Medium"] and item["id"] not in comparisons]
+        if to_compare:
+            with st.spinner("⚖️ Comparing risky clauses with standard versions..."):
+                new_comparisons = compare_clauses_to_standard([{"text": item["text"], "type": item["type"]} for item in to_compare])
+                for item, comparison in zip(to_compare, new_comparisons):
+                    comparisons[item["id"]] = comparison
+        
         with tab_all:
             for item in data["results"]:
                 # Color-coded header
@@ -886,7 +790,7 @@ if page == "🔍 Analyze Contract":
                     
                     # Comparative Analysis for high/medium risk clauses
                     if item["risk"] in ["High", "Medium"]:
-                        comparison = compare_clause_to_standard(item['text'], item['type'])
+                        comparison = comparisons.get(item["id"])
                         if comparison:
                             st.markdown("---")
                             st.markdown("##### ⚖️ Comparison with Standard")
@@ -982,6 +886,11 @@ if page == "🔍 Analyze Contract":
                                 mime="application/pdf"
                             )
                 st.success("✅ Report ready for download!")
+        
+        # Poll background AI jobs until they finish
+        if job_status:
+            time.sleep(JOB_POLL_SECONDS)
+            st.rerun()
 
 elif page == "📄 Template Generator":
     st.header("📝 Smart Contract Template Generator")
@@ -1022,6 +931,12 @@ elif page == "🤖 AI Clause Search (RAG)":
         height=150,
         placeholder="Paste any clause from your contract here..."
     )
+    search_mode = st.radio(
+        "Search mode:",
+        ["Semantic (vector)", "Keyword (BM25)"],
+        horizontal=True,
+        help="Keyword mode ranks clauses sharing your exact terms, weighted by how rare each term is."
+    )
     
     if st.button("🔍 Search Knowledge Base", type="primary"):
         if user_clause:
@@ -1029,9 +944,12 @@ elif page == "🤖 AI Clause Search (RAG)":
                 kb = get_vector_store()
             
             with st.spinner("Searching for similar clauses..."):
-                results = kb.search(user_clause, top_k=5)
+                mode = "bm25" if search_mode.startswith("Keyword") else "vector"
+                results = kb.search(user_clause, top_k=5, mode=mode)
                 
                 st.subheader("🎯 Top Matching Clauses from Knowledge Base")
+                if not results:
+                    st.info("No knowledge base clause shares any terms with this text.")
                 
                 for idx, res in enumerate(results, 1):
                     score = res['score']
@@ -1158,6 +1076,48 @@ elif page == "🧠 Tech & Architecture":
     ```
     """)
 
+# ═══════════════════════════════════════════════════════════════
+# DIAGNOSTICS - hidden panel, open the app with ?diagnostics=1
+# ═══════════════════════════════════════════════════════════════
+
+if st.query_params.get("diagnostics") == "1":
+    with st.sidebar.expander("🩺 Diagnostics", expanded=True):
+        snapshot = metrics_snapshot()
+        if snapshot["spans"]:
+            st.dataframe([
+                {
+                    "stage": name,
+                    "calls": stats["calls"],
+                    "p50 ms": round(stats["p50_seconds"] * 1000, 2),
+                    "p95 ms": round(stats["p95_seconds"] * 1000, 2),
+                    "max ms": round(stats["max_seconds"] * 1000, 2),
+                    "errors": stats["errors"],
+                }
+                for name, stats in snapshot["spans"].items()
+            ], hide_index=True)
+        else:
+            st.caption("No timings recorded yet - analyze a contract first.")
+        if snapshot["counters"]:
+            st.json(snapshot["counters"], expanded=False)
+
+        c1, c2 = st.columns(2)
+        with c1:
+            st.download_button("Prometheus", prometheus_text(), file_name="metrics.prom", mime="text/plain")
+        with c2:
+            st.download_button("JSON", json.dumps(snapshot, indent=2), file_name="metrics.json", mime="application/json")
+        if st.button("Reset metrics"):
+            metrics.reset()
+            st.rerun()
+
+        st.checkbox("Profile the next analysis (cProfile + tracemalloc)", key="profile_next_analysis")
+        last_profile = st.session_state.get("last_profile")
+        if last_profile:
+            st.caption(f"Last profiled analysis: {last_profile['seconds'] * 1000:.0f} ms, "
+                       f"peak memory {last_profile['peak_bytes'] / 1024 ** 2:.1f} MB")
+            st.code(last_profile["profile_text"], language=None)
+            st.dataframe([{"allocated at": site, "KB": round(size / 1024, 1)}
+                          for site, size in last_profile["top_allocations"]], hide_index=True)
+
 # Footer
 st.divider()
 st.caption("🇮🇳 Built for Indian SMEs | Powered by Claude AI | ⚠️ Not a substitute for legal advice")
@@ -0,0 +1,216 @@
+"""
+Batch Analysis - Screens a directory of contracts from the command line.
+
+Runs the same fast keyword analysis as the Streamlit "Analyze Document" button
+(src/engines/pipeline.py) over every PDF/DOCX/TXT file given, one contract per
+worker process. Each contract gets a JSON result (or a line in results.jsonl),
+and summary.csv lists one row per contract.
+
+Progress is recorded in manifest.jsonl as contracts finish, keyed by a hash of
+the file content plus the analysis settings. Re-running with the same output
+directory skips contracts already analyzed, so an interrupted run picks up
+where it stopped, renamed or copied files are not analyzed twice, and changing
+the keyword tables re-analyzes everything.
+
+Usage:
+    python batch_analyze.py contracts/ more/contract.pdf -o results/ [--workers 8] [--format jsonl]
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List
+
+from src.engines.pipeline import analyze_contract, analysis_fingerprint, get_result_cache
+from src.services.cache import make_key
+from src.utils.preprocess import extract_text
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+# Start of PDF / DOCX (zip) files: text beginning with these is a document decoded as plain text
+BINARY_SIGNATURES = ("%PDF-", "PK\x03\x04")
+MANIFEST_FILE = "manifest.jsonl"
+SUMMARY_FILE = "summary.csv"
+RESULTS_JSONL_FILE = "results.jsonl"
+SUMMARY_COLUMNS = [
+    "file", "status", "contract_type", "language", "overall_risk", "verdict", "clauses",
+    "high_risk", "medium_risk", "penalty_amount", "seconds", "output", "error",
+]
+
+
+def collect_files(paths: Iterable[str]) -> List[str]:
+    """Expands files and directories (recursively) into supported contract files, sorted."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                found.extend(os.path.join(root, name) for name in names if name.lower().endswith(SUPPORTED_EXTENSIONS))
+        elif path.lower().endswith(SUPPORTED_EXTENSIONS) and os.path.isfile(path):
+            found.append(path)
+    return sorted(set(found))
+
+
+def content_key(path: str, fingerprint: str) -> str:
+    """Hash of the file bytes plus the analysis settings; identifies one analysis of one contract."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return make_key(digest.hexdigest(), fingerprint)
+
+
+def analyze_file(path: str, use_cache: bool = True) -> Dict:
+    """Worker: extracts and analyzes one contract. Never raises; failures come back as status "error"."""
+    start = time.perf_counter()
+    try:
+        with open(path, "rb") as f:
+            # extract_text reports failures as text instead of raising. Pages are decoded
+            # in this worker: the batch already runs one process per core.
+            raw_text = extract_text(f, workers=1)
+        if raw_text.startswith(f"Error extracting text from {f.name}"):
+            return {"status": "error", "error": raw_text, "seconds": time.perf_counter() - start}
+        if not raw_text.strip() or raw_text in ("Empty PDF file detected.", "Empty DOCX file detected."):
+            return {"status": "error", "error": "No text found", "seconds": time.perf_counter() - start}
+        if raw_text.startswith(BINARY_SIGNATURES):
+            return {"status": "error", "error": "Binary document was read as plain text (check the file extension)",
+                    "seconds": time.perf_counter() - start}
+
+        result = analyze_contract(raw_text, cache=get_result_cache() if use_cache else None, workers=1)
+        return {"status": "ok", "result": result.to_dict(), "seconds": time.perf_counter() - start}
+    except Exception as e:
+        return {"status": "error", "error": f"{type(e).__name__}: {e}", "seconds": time.perf_counter() - start}
+
+
+def summary_row(path: str, outcome: Dict, output: str = "") -> Dict:
+    row = {column: "" for column in SUMMARY_COLUMNS}
+    row.update(file=path, status=outcome["status"], seconds=round(outcome["seconds"], 3), output=output,
+               error=outcome.get("error", ""))
+    result = outcome.get("result")
+    if result:
+        row.update(
+            contract_type=result["contract_type"],
+            language="Hindi" if result["is_hindi"] else "English",
+            overall_risk=result["overall_risk"],
+            verdict=result["decision"].get("verdict", ""),
+            clauses=result["clauses_count"],
+            high_risk=result["high_risk_count"],
+            medium_risk=result["medium_risk_count"],
+            penalty_amount=result["financial_impact"].get("penalty_amount", ""),
+        )
+    return row
+
+
+def load_manifest(out_dir: str) -> Dict[str, Dict]:
+    """{content key: manifest entry} for contracts already analyzed successfully."""
+    done = {}
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line from an interrupted run
+                if entry.get("row", {}).get("status") == "ok":
+                    done[entry["key"]] = entry
+    return done
+
+
+def write_result(out_dir: str, key: str, path: str, outcome: Dict, fmt: str) -> str:
+    """Stores one contract's result; returns where it went."""
+    record = {"file": path, "key": key, **outcome["result"]}
+    if fmt == "jsonl":
+        with open(os.path.join(out_dir, RESULTS_JSONL_FILE), "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return RESULTS_JSONL_FILE
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    name = f"{stem}-{key[:12]}.json"
+    tmp_path = os.path.join(out_dir, name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, os.path.join(out_dir, name))  # never leave half a result behind
+    return name
+
+
+def run_batch(paths: Iterable[str], out_dir: str, workers: int = None, fmt: str = "json",
+              use_cache: bool = True, quiet: bool = False) -> List[Dict]:
+    """
+    Analyzes every contract under paths into out_dir, skipping ones already in its manifest.
+    Returns the summary rows (also written to summary.csv).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    files = collect_files(paths)
+    fingerprint = analysis_fingerprint()
+    done = load_manifest(out_dir)
+
+    rows = {}  # key -> summary row
+    pending = {}  # key -> path (duplicate content is analyzed once)
+    copies = []  # (key, path) of files whose content appears earlier in the batch
+    for path in files:
+        key = content_key(path, fingerprint)
+        if key in rows or key in pending:
+            copies.append((key, path))
+        elif key in done:
+            rows[key] = {**done[key]["row"], "file": path}
+        else:
+            pending[key] = path
+
+    def report(message):
+        if not quiet:
+            print(message, file=sys.stderr)
+
+    report(f"{len(files)} contracts: {len(rows)} already analyzed, {len(pending)} to analyze "
+           f"with {workers or os.cpu_count()} workers")
+
+    start = time.perf_counter()
+    with open(os.path.join(out_dir, MANIFEST_FILE), "a", encoding="utf-8") as manifest, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(analyze_file, path, use_cache): key for key, path in pending.items()}
+        for finished, future in enumerate(as_completed(futures), start=1):
+            key = futures[future]
+            path = pending[key]
+            outcome = future.result()
+            output = write_result(out_dir, key, path, outcome, fmt) if outcome["status"] == "ok" else ""
+            row = summary_row(path, outcome, output)
+            rows[key] = row
+            # Manifest last: a contract counts as done only once its result is on disk
+            manifest.write(json.dumps({"key": key, "row": row}, ensure_ascii=False) + "\n")
+            manifest.flush()
+            report(f"[{finished}/{len(pending)}] {row['status']:5} {row['overall_risk'] or '-':7} {path}")
+
+    ordered = sorted(list(rows.values()) + [{**rows[key], "file": path} for key, path in copies],
+                     key=lambda row: row["file"])
+    with open(os.path.join(out_dir, SUMMARY_FILE), "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(ordered)
+
+    failed = sum(1 for row in ordered if row["status"] != "ok")
+    report(f"Done in {time.perf_counter() - start:.1f}s: {len(ordered) - failed} analyzed, {failed} failed. "
+           f"Summary: {os.path.join(out_dir, SUMMARY_FILE)}")
+    return ordered
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a batch of contracts (PDF/DOCX/TXT) in parallel.")
+    parser.add_argument("paths", nargs="+", help="Contract files or directories (searched recursively)")
+    parser.add_argument("-o", "--output", default="batch_results", help="Output directory (default: batch_results)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--format", choices=["json", "jsonl"], default="json",
+                        help="One JSON file per contract, or one results.jsonl line per contract")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the shared analysis cache")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    rows = run_batch(args.paths, args.output, workers=args.workers, fmt=args.format,
+                     use_cache=not args.no_cache, quiet=args.quiet)
+    return 1 if any(row["status"] != "ok" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,360 @@
+"""
+Benchmark: the analysis engines on synthetic English and Hindi contracts of 1KB-20MB.
+
+Times each engine entry point on contracts from benchmarks/corpus.py:
+    extract_text (TXT, DOCX, PDF), segment_clauses, extract_entities,
+    assess_risk_with_explanation (every clause), make_decision,
+    compare_clause_to_standard (every clause with a standard), export_professional_report
+
+Each benchmark runs once to warm up, then repeats until it has --min-runs
+samples and --max-time seconds have passed (or --max-runs samples). Its
+inputs (documents, clauses, the keyword analysis) are built beforehand and
+not timed. compare_clause_to_standard runs against StubLLMClient, so it times
+the similarity scoring, prompt building and response parsing without network
+calls. Results are written as JSON. With --compare, median times are checked
+against an earlier results file, and the exit code is 1 if any benchmark is
+slower by more than --threshold.
+
+Usage:
+    python benchmarks/analyzer_benchmark.py [--sizes 1KB,10KB,100KB,1MB,20MB] [--languages en,hi]
+        [--filter extract] [--min-runs 3] [--max-time 2] [-o results.json]
+        [--compare benchmarks/results/baseline.json [--threshold 0.25]]
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+from functools import cached_property
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import LANGUAGES, generate_contract, parse_size, size_label  # noqa: E402
+from src.config import MAX_UPLOAD_BYTES, STANDARD_CLAUSES  # noqa: E402
+from src.engines import comparison_engine  # noqa: E402
+from src.engines.comparison_engine import compare_clause_to_standard  # noqa: E402
+from src.engines.decision_engine import make_decision  # noqa: E402
+from src.engines.pipeline import analyze_contract  # noqa: E402
+from src.engines.risk_engine import assess_risk_with_explanation  # noqa: E402
+from src.services import llm  # noqa: E402
+from src.services.export_pdf import export_professional_report  # noqa: E402
+from src.services.llm_gateway import LLMGateway  # noqa: E402
+from src.services.llm_stub import StubLLMClient  # noqa: E402
+from src.services.ner import extract_entities  # noqa: E402
+from src.utils.preprocess import extract_text  # noqa: E402
+from src.utils.segmenter import segment_clauses  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_SIZES = "1KB,10KB,100KB,1MB"
+SCHEMA_VERSION = 1
+UNLIMITED = 1e12  # per-minute rate limits for the stub gateway
+
+# Building DOCX/PDF test documents takes far longer than extracting them, so
+# those stop at 1MB of text. Comparison and report rendering stop at the upload
+# limit, the largest contract the app and API hand them.
+DOCUMENT_MAX_BYTES = 1024 * 1024
+
+
+# ═══════════════════════════════════════════════════════════════
+# WORKLOADS - one synthetic contract and the inputs derived from it
+# ═══════════════════════════════════════════════════════════════
+
+class _NamedBuffer(io.BytesIO):
+    """In-memory file with the .name extract_text() dispatches on."""
+
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+
+
+class Workload:
+    """A generated contract; derived inputs are built on first use and shared by the benchmarks."""
+
+    def __init__(self, language: str, size: int, seed: int):
+        self.language = language
+        self.size = size
+        self.text = generate_contract(size, language, seed)
+        self.bytes = len(self.text.encode("utf-8"))
+
+    @cached_property
+    def clauses(self):
+        return segment_clauses(self.text)
+
+    @cached_property
+    def analysis(self):
+        return analyze_contract(self.text, workers=1).to_dict()
+
+    @cached_property
+    def typed_clauses(self):
+        """(text, type) of the analyzed clauses that have a standard clause."""
+        return [(r["text"], r["type"]) for r in self.analysis["results"] if r["type"] in STANDARD_CLAUSES]
+
+    def docx_bytes(self) -> bytes:
+        from docx import Document
+
+        document = Document()
+        for line in self.text.split("\n"):
+            document.add_paragraph(line)
+        buffer = io.BytesIO()
+        document.save(buffer)
+        return buffer.getvalue()
+
+    def pdf_bytes(self) -> bytes:
+        import textwrap
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+
+        buffer = io.BytesIO()
+        pdf = canvas.Canvas(buffer, pagesize=A4)
+        y = A4[1] - 50
+        for paragraph in self.text.split("\n"):
+            for line in textwrap.wrap(paragraph, 95) or [""]:
+                if y < 50:
+                    pdf.showPage()
+                    y = A4[1] - 50
+                pdf.drawString(50, y, line)
+                y -= 14
+        pdf.save()
+        return buffer.getvalue()
+
+
+# ═══════════════════════════════════════════════════════════════
+# BENCHMARKS - setup(workload) returns (timed callable, items processed)
+# ═══════════════════════════════════════════════════════════════
+
+Benchmark = namedtuple("Benchmark", ["name", "setup", "languages", "max_bytes"])
+BENCHMARKS = []
+
+
+def benchmark(name, languages=LANGUAGES, max_bytes=None):
+    def register(setup):
+        BENCHMARKS.append(Benchmark(name, setup, languages, max_bytes))
+        return setup
+    return register
+
+
+def _extraction(data: bytes, filename: str):
+    def run():
+        text = extract_text(_NamedBuffer(data, filename))
+        if text.startswith("Error extracting text"):
+            raise RuntimeError(text)
+    return run, 1
+
+
+@benchmark("extract_text[txt]")
+def _extract_txt(workload):
+    return _extraction(workload.text.encode("utf-8"), "contract.txt")
+
+
+@benchmark("extract_text[docx]", max_bytes=DOCUMENT_MAX_BYTES)
+def _extract_docx(workload):
+    return _extraction(workload.docx_bytes(), "contract.docx")
+
+
+# The built-in PDF fonts have no Devanagari glyphs, so PDFs are English only
+@benchmark("extract_text[pdf]", languages=("en",), max_bytes=DOCUMENT_MAX_BYTES)
+def _extract_pdf(workload):
+    return _extraction(workload.pdf_bytes(), "contract.pdf")
+
+
+@benchmark("segment_clauses")
+def _segment(workload):
+    text = workload.text
+    return (lambda: segment_clauses(text)), 1
+
+
+@benchmark("extract_entities")
+def _entities(workload):
+    text = workload.text
+    return (lambda: extract_entities(text)), 1
+
+
+@benchmark("assess_risk_with_explanation")
+def _risk(workload):
+    clauses = workload.clauses
+
+    def run():
+        for clause in clauses:
+            assess_risk_with_explanation(clause)
+    return run, len(clauses)
+
+
+@benchmark("make_decision")
+def _decision(workload):
+    analysis = workload.analysis
+    return (lambda: make_decision(analysis)), len(analysis["results"])
+
+
+@benchmark("compare_clause_to_standard", max_bytes=MAX_UPLOAD_BYTES)
+def _compare(workload):
+    clauses = workload.typed_clauses
+
+    def run():
+        comparison_engine._COMPARISON_MEMO.clear()  # time the comparisons, not the memo
+        for text, clause_type in clauses:
+            compare_clause_to_standard(text, clause_type)
+    return run, len(clauses)
+
+
+@benchmark("export_professional_report", max_bytes=MAX_UPLOAD_BYTES)
+def _report(workload):
+    analysis = workload.analysis
+    report = {
+        'contract_type': analysis['contract_type'],
+        'overall_risk': analysis['overall_risk'],
+        'high_risk_count': analysis['high_risk_count'],
+        'medium_risk_count': analysis['medium_risk_count'],
+        'total_clauses': analysis['clauses_count'],
+        'clauses': analysis['results'],
+        'financial_impact': analysis['financial_impact'],
+    }
+    return (lambda: export_professional_report(io.BytesIO(), report)), len(analysis["results"])
+
+
+# ═══════════════════════════════════════════════════════════════
+# RUNNER
+# ═══════════════════════════════════════════════════════════════
+
+def measure(fn, min_runs: int, max_runs: int, max_time: float):
+    """Seconds per run after one warm-up run. A warm-up slower than max_time is the only sample."""
+    start = time.perf_counter()
+    fn()
+    warm_up = time.perf_counter() - start
+    if warm_up >= max_time:
+        return [warm_up]
+    samples = []
+    deadline = time.perf_counter() + max_time
+    while len(samples) < max_runs and (len(samples) < min_runs or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_benchmarks(sizes, languages, name_filter=None, seed=0, min_runs=3, max_runs=50, max_time=2.0):
+    """Runs every selected benchmark on every workload. Returns result rows, printing each."""
+    rows = []
+    print(f"{'benchmark':<30} {'lang':>4} {'size':>6} {'items':>7} {'runs':>5} {'median ms':>11} {'MB/s':>9}")
+    for language in languages:
+        for size in sizes:
+            workload = Workload(language, size, seed)
+            for bench in BENCHMARKS:
+                if name_filter and name_filter not in bench.name:
+                    continue
+                if language not in bench.languages or (bench.max_bytes and size > bench.max_bytes):
+                    continue
+                fn, items = bench.setup(workload)
+                samples = measure(fn, min_runs, max_runs, max_time)
+                median = statistics.median(samples)
+                row = {
+                    "benchmark": bench.name,
+                    "language": language,
+                    "size": size_label(size),
+                    "bytes": workload.bytes,
+                    "items": items,
+                    "runs": len(samples),
+                    "min_s": min(samples),
+                    "median_s": median,
+                    "mean_s": statistics.mean(samples),
+                    "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+                    "mb_per_s": workload.bytes / median / 1024 ** 2 if median else None,
+                }
+                rows.append(row)
+                print(f"{bench.name:<30} {language:>4} {row['size']:>6} {items:>7} {len(samples):>5} "
+                      f"{median * 1000:>11.2f} {row['mb_per_s'] or 0:>9.2f}")
+    return rows
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+                              timeout=10, check=True).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "commit": _git_commit(),
+    }
+
+
+def compare_results(rows, baseline_path: str, threshold: float) -> int:
+    """Prints median-time ratios against a baseline results file. Returns the number of regressions."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["benchmark"], r["language"], r["size"]): r for r in json.load(f)["results"]}
+    regressions = 0
+    print(f"\nCompared with {baseline_path} (regression: more than {threshold:.0%} slower):")
+    for row in rows:
+        previous = baseline.get((row["benchmark"], row["language"], row["size"]))
+        if previous is None or not previous["median_s"]:
+            continue
+        ratio = row["median_s"] / previous["median_s"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{row['benchmark']:<30} {row['language']:>4} {row['size']:>6} {ratio:>7.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--languages", default=",".join(LANGUAGES))
+    parser.add_argument("--filter", default=None, help="Only benchmarks whose name contains this")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-runs", type=int, default=3)
+    parser.add_argument("--max-runs", type=int, default=50)
+    parser.add_argument("--max-time", type=float, default=2.0, help="Seconds of repeats per benchmark")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Results JSON (default: benchmarks/results/benchmark-<UTC time>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown for --compare")
+    args = parser.parse_args()
+
+    # Offline, uncached and unthrottled, so comparisons time the local work and
+    # neither reach the API nor wait on the account rate limits
+    llm.set_client(StubLLMClient())
+    llm.gateway = LLMGateway(llm.client, requests_per_minute=UNLIMITED, input_tokens_per_minute=UNLIMITED,
+                             output_tokens_per_minute=UNLIMITED)
+    llm.set_response_cache(None)
+
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+    created = datetime.now(timezone.utc)
+    rows = run_benchmarks(sizes, args.languages.split(","), args.filter, args.seed,
+                          args.min_runs, args.max_runs, args.max_time)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"benchmark-{created:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "schema": SCHEMA_VERSION,
+            "created": created.isoformat(),
+            "environment": environment(),
+            "settings": {"seed": args.seed, "min_runs": args.min_runs, "max_runs": args.max_runs,
+                         "max_time": args.max_time},
+            "results": rows,
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare and compare_results(rows, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
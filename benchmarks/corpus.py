@@ -0,0 +1,213 @@
+"""
+Synthetic contract corpus: deterministic English and Hindi contracts of any size.
+
+generate_contract(size, language, seed) opens with a filled-in template from
+src/utils/templates.py (English) or a Hindi service agreement preamble, then
+appends numbered clauses until the text reaches `size` UTF-8 bytes. Clauses are
+numbered like the sample contracts: a "7. HEADING" line, then "7.1." with the
+STANDARD_CLAUSES safe wording (or its Hindi equivalent). About a third of them
+get a "7.2." risky sentence with RISK_KEYWORDS phrases, amounts, dates and
+notice periods, so the risk engine, NER and decision engine all have findings
+to work on. The segmenter splits at each "n.m" line, and generate_contract()
+checks that it finds one clause per subclause plus the opening. The same
+(size, language, seed) always gives the same text.
+
+Usage:
+    python benchmarks/corpus.py -o benchmarks/corpus [--sizes 1KB,100KB,1MB,20MB] [--languages en,hi] [--seed 0]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.config import STANDARD_CLAUSES  # noqa: E402
+from src.utils.segmenter import FALLBACK_MIN_CLAUSES, iter_clauses  # noqa: E402
+from src.utils.templates import generate_template  # noqa: E402
+
+LANGUAGES = ("en", "hi")
+DEFAULT_SIZES = "1KB,10KB,100KB,1MB,20MB"
+RISKY_SHARE = 0.35  # clauses that get a risky sentence
+
+TEMPLATE_TYPES = ["Non-Disclosure Agreement (NDA)", "Employment Agreement", "Freelance/Service Agreement"]
+COMPANIES = ["TechSolutions Pvt Ltd", "QuickFix IT Services", "Bharat Logistics LLP", "Sahyadri Foods Pvt Ltd",
+             "Ganga Textiles", "Nimbus Analytics Pvt Ltd", "Deccan Components", "Indus Legal Services"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August",
+          "September", "October", "November", "December"]
+
+# Risky sentences per language: {amount}, {days}, {date}, {party} are filled in
+RISKY_SENTENCES = {
+    "en": [
+        "The Client may terminate this Agreement at its sole discretion, without notice and without cause.",
+        "The Vendor shall indemnify and hold harmless the Client with unlimited liability and no liability cap.",
+        "A penalty of Rs. {amount} shall be payable as liquidated damages for every {days} days of delay.",
+        "This Agreement renews automatically unless terminated {days} days before {date}.",
+        "Any dispute shall be subject to arbitration in London and the exclusive jurisdiction of courts in London.",
+        "All rights shall belong to {party}, and intellectual property shall transfer on creation.",
+        "The licence granted herein is perpetual and irrevocable, and the Vendor agrees to waive all claims.",
+        "The Vendor shall use best efforts to deliver from time to time, subject to a lock-in period of {days} days.",
+        "The Employee shall be bound by a non-compete and exclusivity obligation for 2 years after {date}.",
+        "Fees of INR {amount} are due within {days} days, plus stamp duty as applicable.",
+    ],
+    "hi": [
+        "ग्राहक अपने पूर्ण विवेकाधिकार पर, बिना किसी कारण के, बिना सूचना के इस समझौते को समाप्त कर सकता है।",
+        "विक्रेता असीमित दायित्व के साथ ग्राहक को क्षतिपूर्ति देगा और हानिरहित रखेगा।",
+        "प्रत्येक {days} दिनों की देरी के लिए हर्जाना के रूप में {amount} रुपये का जुर्माना देय होगा।",
+        "यह समझौता {date} से पहले {days} दिनों की सूचना के बिना स्वतः नवीनीकृत होगा।",
+        "कोई भी विवाद न्यूयॉर्क, यूएसए के न्यायालयों के विशेष क्षेत्राधिकार के अधीन होगा।",
+        "मध्यस्थता का स्थान लंदन, यूके होगा और मध्यस्थ की नियुक्ति {party} द्वारा की जाएगी।",
+        "सभी बौद्धिक संपदा अधिकार स्थायी और अपरिवर्तनीय रूप से {party} के होंगे।",
+        "विक्रेता {days} दिनों की लॉक-इन अवधि तक इस समझौते को समाप्त नहीं कर सकता।",
+    ],
+}
+
+# Hindi wording of the STANDARD_CLAUSES safe clauses: (heading, body)
+HINDI_CLAUSES = {
+    "Termination": ("अवधि और समाप्ति", "कोई भी पक्ष दूसरे पक्ष को 30 दिनों की पूर्व लिखित सूचना देकर इस समझौते को समाप्त कर सकता है। समाप्ति पर, ग्राहक समाप्ति की तिथि तक प्रदान की गई सभी सेवाओं का भुगतान करेगा।"),
+    "Indemnity": ("क्षतिपूर्ति", "प्रत्येक पक्ष अपनी लापरवाही से उत्पन्न होने वाले तीसरे पक्ष के दावों के लिए दूसरे पक्ष को क्षतिपूर्ति देगा, जो इस समझौते के तहत भुगतान की गई कुल राशि तक सीमित होगी।"),
+    "Limitation of Liability": ("दायित्व की सीमा", "किसी भी पक्ष का कुल दायित्व पिछले 12 महीनों में भुगतान की गई फीस से अधिक नहीं होगा। कोई भी पक्ष अप्रत्यक्ष नुकसान के लिए उत्तरदायी नहीं होगा।"),
+    "Payment": ("भुगतान की शर्तें", "ग्राहक चालान प्राप्ति के 30 दिनों के भीतर भुगतान करेगा। विवादित राशि पर दोनों पक्ष सद्भावना से चर्चा करेंगे।"),
+    "Confidentiality": ("गोपनीयता", "प्रत्येक पक्ष दूसरे पक्ष की गोपनीय जानकारी को गोपनीय रखेगा और इसे केवल इस समझौते के प्रयोजनों के लिए उपयोग करेगा। यह दायित्व समाप्ति के बाद 2 वर्षों तक जारी रहेगा।"),
+    "Governing Law": ("शासी कानून और क्षेत्राधिकार", "यह समझौता भारत के कानूनों द्वारा शासित होगा। कोई भी विवाद बेंगलुरु, भारत के न्यायालयों के क्षेत्राधिकार के अधीन होगा।"),
+    "Intellectual Property": ("बौद्धिक संपदा", "पूर्ण भुगतान पर, इस समझौते के तहत बनाए गए कार्य का स्वामित्व ग्राहक को हस्तांतरित होगा। विक्रेता अपनी पूर्व-विद्यमान बौद्धिक संपदा का स्वामी बना रहेगा।"),
+    "Non-Compete": ("प्रतिस्पर्धा निषेध", "इस समझौते की अवधि के दौरान, विक्रेता ग्राहक के प्रत्यक्ष प्रतियोगियों को समान सेवाएं प्रदान नहीं करेगा।"),
+}
+
+HINDI_PREAMBLE = """सेवा अनुबंध
+
+यह सेवा अनुबंध ("समझौता") दिनांक {date} को निम्नलिखित के बीच किया गया है:
+
+{party_a} (इसके बाद "ग्राहक" के रूप में संदर्भित);
+
+और
+
+{party_b} (इसके बाद "विक्रेता" के रूप में संदर्भित)।
+
+अब, इसलिए, पक्षकार निम्नलिखित पर सहमत हैं:
+"""
+
+_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(B|KB|MB|GB)?\s*$", re.I)
+_UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+
+
+def parse_size(value: str) -> int:
+    """Bytes for '1KB', '20MB', '512' (binary units)."""
+    match = _SIZE.match(value)
+    if not match:
+        raise ValueError(f"Invalid size: {value!r} (expected e.g. 1KB, 20MB)")
+    return int(float(match.group(1)) * _UNITS[(match.group(2) or "B").upper()])
+
+
+def size_label(size: int) -> str:
+    """'20MB' for 20 * 1024 ** 2, the inverse of parse_size() for whole units."""
+    for unit in ("GB", "MB", "KB"):
+        if size >= _UNITS[unit] and size % _UNITS[unit] == 0:
+            return f"{size // _UNITS[unit]}{unit}"
+    return f"{size}B"
+
+
+def _date(rng: random.Random) -> str:
+    return f"{rng.randint(1, 28)} {rng.choice(MONTHS)}, {rng.randint(2024, 2030)}"
+
+
+def _amount(rng: random.Random) -> str:
+    return f"{rng.randint(1, 99)},{rng.randint(0, 99):02d},000"  # Indian grouping, e.g. 2,00,000
+
+
+def _risky_sentence(rng: random.Random, language: str, party: str) -> str:
+    return rng.choice(RISKY_SENTENCES[language]).format(
+        amount=_amount(rng), days=rng.choice([7, 15, 30, 45, 60, 90]), date=_date(rng), party=party)
+
+
+def _preamble(rng: random.Random, language: str):
+    """(opening text, number of its numbered clauses, the parties)."""
+    party_a, party_b = rng.sample(COMPANIES, 2)
+    if language == "hi":
+        return HINDI_PREAMBLE.format(date=_date(rng), party_a=party_a, party_b=party_b), 0, (party_a, party_b)
+    text = generate_template(rng.choice(TEMPLATE_TYPES), {"party_a": party_a, "party_b": party_b},
+                             _date(rng), f"{rng.randint(1, 5)} years")
+    return text, len(re.findall(r"^\d+\.", text, re.M)), (party_a, party_b)
+
+
+def _clause(rng: random.Random, language: str, number: int, parties):
+    """(clause text, number of its "n.m" subclauses)."""
+    clause_type = rng.choice(list(STANDARD_CLAUSES))
+    if language == "hi":
+        heading, body = HINDI_CLAUSES[clause_type]
+    else:
+        heading, body = clause_type.upper(), STANDARD_CLAUSES[clause_type]["safe"]
+    subclauses = [body]
+    if rng.random() < RISKY_SHARE:
+        subclauses.append(_risky_sentence(rng, language, rng.choice(parties)))
+    lines = "".join(f"{number}.{i}. {sentence}\n" for i, sentence in enumerate(subclauses, 1))
+    return f"\n{number}. {heading}\n{lines}", len(subclauses)
+
+
+def generate_contract(size: int, language: str = "en", seed: int = 0) -> str:
+    """
+    A synthetic contract of up to `size` UTF-8 bytes: the opening template or
+    preamble (always included), then whole clauses while they fit.
+    Raises RuntimeError if the segmenter does not find the clauses written.
+
+    Args:
+        size: Target size in bytes (see parse_size())
+        language: "en" or "hi"
+        seed: Different seeds give different contracts of the same size
+    """
+    if language not in LANGUAGES:
+        raise ValueError(f"Unknown language: {language} (expected one of {', '.join(LANGUAGES)})")
+    rng = random.Random(f"{language}:{size}:{seed}")
+    text, numbered, parties = _preamble(rng, language)
+    parts = [text]
+    used = len(text.encode("utf-8"))
+    number = numbered + 1
+    expected = 1  # the opening has no "n.m" numbering, so it segments as one clause
+    while True:
+        clause, subclauses = _clause(rng, language, number, parties)
+        clause_bytes = len(clause.encode("utf-8"))
+        if used + clause_bytes > size:
+            break
+        parts.append(clause)
+        used += clause_bytes
+        expected += subclauses
+        number += 1
+    contract = "".join(parts)
+
+    # Below FALLBACK_MIN_CLAUSES the segmenter also splits by sentences
+    found = sum(1 for _ in iter_clauses([contract]))
+    if expected >= FALLBACK_MIN_CLAUSES and found != expected:
+        raise RuntimeError(f"Segmenter found {found} clauses in the {language} {size_label(size)} contract, expected {expected}")
+    return contract
+
+
+def write_corpus(directory: str, sizes, languages=LANGUAGES, seed: int = 0):
+    """Writes <language>_<size>.txt for every combination. Returns the paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for language in languages:
+        for size in sizes:
+            path = os.path.join(directory, f"{language}_{size_label(size)}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(generate_contract(size, language, seed))
+            paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-o", "--output", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus"))
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--languages", default=",".join(LANGUAGES))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+    for path in write_corpus(args.output, sizes, args.languages.split(","), args.seed):
+        print(f"{os.path.getsize(path):>12,} bytes  {path}")
+
+
+if __name__ == "__main__":
+    main()
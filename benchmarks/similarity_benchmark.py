@@ -0,0 +1,110 @@
+"""
+Benchmark: clause similarity backends vs difflib.SequenceMatcher.
+
+Scores synthetic clauses of 50-5,000 words against every STANDARD_CLAUSES
+entry with each backend in src/utils/similarity.py, and reports:
+- latency per comparison (signature preparation excluded, as in the app)
+- agreement with the original difflib score: mean and 95th percentile
+  absolute difference, and how often the SAFE / REVIEW NEEDED / RISKY verdict
+  (thresholds 70 / 40) agrees
+
+Usage:
+    python benchmarks/similarity_benchmark.py [--repeat 3] [--seed 0]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.config import STANDARD_CLAUSES  # noqa: E402
+from src.utils.similarity import BACKENDS, difflib_ratio  # noqa: E402
+
+SAMPLE_CONTRACT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "sample_contract.txt")
+WORD_COUNTS = [50, 200, 1000, 5000]
+PERTURBATIONS = [0.0, 0.1, 0.3, 0.5]  # share of words replaced in near-match clauses
+
+
+def verdict(score):
+    return "SAFE" if score >= 70 else ("REVIEW NEEDED" if score >= 40 else "RISKY")
+
+
+def make_clause(rng, vocabulary, standard, words, perturbation):
+    """A clause of `words` words: the standard clause with some words replaced, padded with contract text."""
+    base = [w if rng.random() >= perturbation else rng.choice(vocabulary) for w in standard.split()]
+    while len(base) < words:
+        base.append(rng.choice(vocabulary))
+    return " ".join(base[:words])
+
+
+def time_backend(backend, clauses, repeat):
+    """Best-of-repeat mean milliseconds per comparison, and the scores."""
+    signatures = {clause_type: backend.prepare(s["safe"]) for clause_type, s in STANDARD_CLAUSES.items()}
+    best = None
+    scores = []
+    for _ in range(repeat):
+        scores = []
+        start = time.perf_counter()
+        for clause_type, text in clauses:
+            scores.append(int(backend.score(text, signatures[clause_type]) * 100))
+        elapsed = (time.perf_counter() - start) * 1000 / len(clauses)
+        best = elapsed if best is None else min(best, elapsed)
+    return best, scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with open(SAMPLE_CONTRACT, encoding="utf-8") as f:
+        vocabulary = f.read().split()
+
+    print(f"{'words':>6} {'backend':>10} {'ms/compare':>11} {'speedup':>8} {'mean |d|':>9} {'p95 |d|':>8} {'verdicts':>9}")
+    for words in WORD_COUNTS:
+        clauses = [
+            (clause_type, make_clause(rng, vocabulary, standard["safe"], words, perturbation))
+            for clause_type, standard in STANDARD_CLAUSES.items()
+            for perturbation in PERTURBATIONS
+        ]
+        reference_ms, reference = time_backend(BACKENDS["difflib"], clauses, args.repeat)
+        for name, backend in BACKENDS.items():
+            ms, scores = time_backend(backend, clauses, args.repeat)
+            diffs = sorted(abs(a - b) / 100 for a, b in zip(scores, reference))
+            agree = sum(verdict(a) == verdict(b) for a, b in zip(scores, reference)) / len(scores)
+            print(f"{words:>6} {name:>10} {ms:>11.3f} {reference_ms / ms:>7.1f}x "
+                  f"{statistics.mean(diffs):>9.3f} {diffs[int(0.95 * (len(diffs) - 1))]:>8.3f} {agree:>8.0%}")
+
+    # Near-matches (clause about as long as the standard), where verdicts matter most.
+    # difflib's autojunk heuristic drops common characters from strings of 200+
+    # characters, which makes its own score erratic here, so agreement is also
+    # shown against SequenceMatcher without autojunk.
+    print("\nNear-matches (standard clause with words replaced, no padding):")
+    print(f"{'replaced':>8} {'vs difflib: mean |d|':>21} {'verdicts':>9} {'vs no-autojunk: mean |d|':>25} {'verdicts':>9}")
+    for perturbation in PERTURBATIONS + [0.7]:
+        rows = []
+        for _ in range(10):
+            for standard in STANDARD_CLAUSES.values():
+                reference = standard["safe"]
+                text = make_clause(rng, vocabulary, reference, len(reference.split()), perturbation)
+                fast = int(BACKENDS["token_lcs"].score(text, BACKENDS["token_lcs"].prepare(reference)) * 100)
+                slow = int(difflib_ratio(text, reference.lower()) * 100)
+                exact = int(SequenceMatcher(None, text.lower(), reference.lower(), autojunk=False).ratio() * 100)
+                rows.append((fast, slow, exact))
+        cells = []
+        for column in (1, 2):
+            diffs = [abs(row[0] - row[column]) / 100 for row in rows]
+            agree = sum(verdict(row[0]) == verdict(row[column]) for row in rows) / len(rows)
+            cells.append((statistics.mean(diffs), agree))
+        print(f"{perturbation:>8.0%} {cells[0][0]:>21.3f} {cells[0][1]:>8.0%} {cells[1][0]:>25.3f} {cells[1][1]:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -186,6 +186,29 @@ STANDARD_CLAUSES = {
     }
 }
 
+# Clause type detection keywords (checked in this order - first match wins)
+CLAUSE_TYPE_KEYWORDS = {
+    "Termination": ["terminate", "termination", "cancel", "cancellation", "end this agreement"],
+    "Indemnity": ["indemn", "hold harmless", "hold the", "defend and protect"],
+    "Limitation of Liability": ["limitation of liability", "liability cap", "total liability", "shall not exceed", "maximum liability"],
+    "Intellectual Property": ["intellectual property", "ip rights", "copyright", "trademark", "patent", "proprietary rights", "work product"],
+    "Payment": ["payment", "pay", "fee", "invoice", "compensation", "remuneration", "consideration"],
+    "Confidentiality": ["confidential", "proprietary information", "non-disclosure", "trade secret"],
+    "Governing Law": ["governing law", "jurisdiction", "courts", "arbitration", "dispute resolution"],
+    "Non-Compete": ["non-compete", "non compete", "not compete", "exclusivity", "exclusive"],
+    "Force Majeure": ["force majeure", "act of god", "beyond reasonable control"],
+    "Warranties": ["warrant", "warranty", "guarantee", "represent and warrant"]
+}
+
+# Deal-breaker patterns checked in high-risk clauses by the decision engine
+RED_FLAG_PATTERNS = {
+    "unlimited_liability": ["unlimited liability", "unlimited indemnity", "no liability cap"],
+    "foreign_jurisdiction": ["courts in london", "courts at new york", "singapore", "arbitration in london"],
+    "instant_termination": ["without notice", "without cause", "sole discretion"],
+    "perpetual_obligations": ["perpetual", "irrevocable", "permanent"],
+    "assignment_of_all_ip": ["all intellectual property", "all ip rights", "assigns all rights"]
+}
+
 # Contract type detection keywords
 CONTRACT_TYPE_KEYWORDS = {
     "Employment Agreement": [
@@ -227,3 +250,92 @@ AMBIGUOUS_TERMS = [
     "substantial",
     "material"
 ]
+
+# Persistent cache of full contract analyses (see src/engines/pipeline.py)
+ANALYSIS_CACHE_PATH = "data/cache/analysis.sqlite3"
+ANALYSIS_CACHE_MAX_ENTRIES = 500
+ANALYSIS_CACHE_TTL_SECONDS = 7 * 24 * 3600  # 7 days
+
+# Persistent cache of Claude responses (see src/services/llm.py)
+LLM_CACHE_PATH = "data/cache/llm.sqlite3"
+LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024  # 50 MB
+
+# Batch clause analysis: clauses are split into chunks that run concurrently
+LLM_BATCH_MAX_CLAUSES = 8  # per request, so the answer fits in max_tokens
+LLM_BATCH_INPUT_TOKENS = 6000  # estimated prompt tokens of clause text per request
+LLM_BATCH_CONCURRENCY = 4  # requests in flight at once
+LLM_BATCH_RETRIES = 1  # extra attempts for clauses whose chunk failed or was truncated
+
+# Clause-vs-standard similarity scorer: "token_lcs" (fast) or "difflib" (see src/utils/similarity.py)
+SIMILARITY_BACKEND = "token_lcs"
+
+# Knowledge base for clause search (see src/utils/vector_store.py)
+KB_CORPUS_PATH = "data/knowledge_base/clauses.jsonl"  # one {"text", "type", "analysis"} object per line
+KB_VECTORS_PATH = "data/cache/kb_vectors.npz"  # embedded corpus, rebuilt when the corpus changes
+KB_EMBEDDING_DIM = 1024  # 4 KB per clause (float32)
+KB_BM25_K1 = 1.5  # term frequency saturation
+KB_BM25_B = 0.75  # document length normalization
+
+# Append-only audit log (see src/services/audit.py)
+AUDIT_LOG_PATH = "data/audit_logs.jsonl"
+AUDIT_LOG_MAX_BYTES = 10 * 1024 * 1024  # rotate past 10 MB
+AUDIT_LOG_MAX_AGE_SECONDS = 30 * 24 * 3600  # ... or once the oldest event is 30 days old
+AUDIT_LOG_BACKUPS = 5  # rotated files kept
+AUDIT_LOG_FLUSH_SECONDS = 0.5  # a batch is written at most this long after its first event
+AUDIT_LOG_MAX_BATCH = 500  # ... or as soon as it holds this many events
+
+# PDF extraction (see src/utils/preprocess.py): pages are decoded across processes
+# only for long documents, where ~5ms/page outweighs starting the pool
+PDF_PARALLEL_MIN_PAGES = 64
+PDF_PAGES_PER_TASK = 16
+
+# Upload limit for the app and the API (security: untrusted documents)
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024  # 5 MB
+
+# HTTP API (see src/services/api.py)
+API_PORT = 8000
+API_ANALYSIS_WORKERS = None  # keyword analysis processes (None = CPU count)
+API_LLM_THREADS = 16  # Claude requests in flight
+
+# Background AI jobs (see src/services/jobs.py)
+JOB_WORKERS = 4  # Claude tasks running at once, across all sessions
+JOB_RETENTION_SECONDS = 60 * 60  # finished jobs stay available to poll for an hour
+JOB_POLL_SECONDS = 1.0  # how often the UI reruns while a job is pending
+
+# Claude API gateway (see src/services/llm_gateway.py). Rate limits default to
+# the Anthropic tier-1 limits for Sonnet; raise them to match your account
+LLM_MAX_CONNECTIONS = 20
+LLM_KEEPALIVE_CONNECTIONS = 10
+LLM_CONNECT_TIMEOUT = 5.0  # seconds
+LLM_READ_TIMEOUT = 60.0  # seconds (batch responses take a while)
+LLM_REQUESTS_PER_MINUTE = 50
+LLM_INPUT_TOKENS_PER_MINUTE = 30000
+LLM_OUTPUT_TOKENS_PER_MINUTE = 8000
+LLM_MAX_RETRIES = 4  # for 429/529/5xx, timeouts and connection errors
+LLM_BACKOFF_BASE_SECONDS = 1.0
+LLM_BACKOFF_MAX_SECONDS = 30.0
+
+# Extra Hindi -> English legal terms merged over HINDI_LEGAL_DICT, if the file
+# exists: .tsv ("hindi<TAB>english" per line) or .json (see src/services/multilingual.py)
+HINDI_DICT_PATH = "data/hindi_legal_dict.tsv"
+
+# Script detection (see src/utils/scripts.py): texts longer than this are
+# profiled from evenly spaced windows instead of every character
+SCRIPT_SAMPLE_MIN_CHARS = 2_000_000
+SCRIPT_SAMPLE_WINDOWS = 64
+SCRIPT_SAMPLE_WINDOW_CHARS = 4096
+
+# Per-clause analysis (see analyze_clauses in src/engines/pipeline.py): the process
+# pool is used only on hosts with 2+ usable CPUs, and only for contracts where this
+# cost model predicts it is faster than one process. Measured on ~500-char clauses
+# (1.2k-14k clause contracts): ~30us per clause serially; the pool adds ~10us per
+# clause (pickling both ways) plus ~2ms per call. That gives ~400 clauses with 2
+# workers, ~160 with 4, but never on 1 CPU
+CLAUSE_SECONDS = 30e-6
+CLAUSE_POOL_SECONDS = 10e-6
+CLAUSE_POOL_CALL_SECONDS = 2e-3
+CLAUSE_CHUNK_SIZE = 128  # clauses per task, to amortize pickling
+
+# Instrumentation (src/utils/instrumentation.py): timing spans and counters per stage
+INSTRUMENTATION_ENABLED = True
+INSTRUMENTATION_WINDOW = 1000  # recent durations kept per span for p50/p95
@@ -1,23 +1,43 @@
-from src.config import STANDARD_CLAUSES
-from difflib import SequenceMatcher
-from src.services.llm import analyze_clause_differences
+import hashlib
+import threading
+from collections import OrderedDict
+from src.config import STANDARD_CLAUSES, SIMILARITY_BACKEND
+from src.services.llm import analyze_clause_differences_batch
+from src.utils.similarity import get_similarity_backend
 
-def compare_clause_to_standard(user_clause, clause_type):
-    """
-    Compares user's clause against the standard safe clause.
-    Returns side-by-side comparison with AI-generated difference analysis.
-    """
-    
-    if clause_type not in STANDARD_CLAUSES:
-        return None
-    
+# Similarity signatures of every standard clause, built once at import
+_backend = get_similarity_backend(SIMILARITY_BACKEND)
+_STANDARD_SIGNATURES = {
+    clause_type: _backend.prepare(standard["safe"]) for clause_type, standard in STANDARD_CLAUSES.items()
+}
+
+
+def standard_similarity(clause_text, clause_type):
+    """Similarity (0-100) of a clause to the standard safe clause of its type."""
+    return int(_backend.score(clause_text, _STANDARD_SIGNATURES[clause_type]) * 100)
+
+
+# Comparisons already computed in this process, keyed by (clause hash, clause type), least
+# recently used first. Shared by every Streamlit session thread, so only touched under the lock
+_COMPARISON_MEMO = OrderedDict()
+_COMPARISON_MEMO_SIZE = 1024
+_COMPARISON_MEMO_LOCK = threading.Lock()
+
+# Aspects of the fallback answers (API error / no API key) - those are retried, not memoized
+_UNAVAILABLE_ASPECTS = {"Analysis unavailable", "Missing API Key"}
+
+
+def _comparison_key(user_clause, clause_type):
+    return (hashlib.sha256(user_clause.encode("utf-8")).hexdigest(), clause_type)
+
+
+def _compare_text(user_clause, clause_type):
+    """Similarity part of the comparison (no LLM)."""
     standard_data = STANDARD_CLAUSES[clause_type]
     standard_clause = standard_data["safe"]
     
     # Calculate text similarity
-    similarity_score = int(SequenceMatcher(None, 
-                                          user_clause.lower(), 
-                                          standard_clause.lower()).ratio() * 100)
+    similarity_score = standard_similarity(user_clause, clause_type)
     
     # Determine verdict based on similarity
     if similarity_score >= 70:
@@ -30,9 +50,6 @@ def compare_clause_to_standard(user_clause, clause_type):
         verdict = "RISKY"
         verdict_color = "red"
     
-    # Get AI analysis of differences
-    diff_analysis = analyze_clause_differences(user_clause, standard_clause)
-    
     return {
         "user_clause": user_clause,
         "standard_clause": standard_clause,
@@ -40,12 +57,71 @@ def compare_clause_to_standard(user_clause, clause_type):
         "benefits": standard_data.get("benefits", []), # Added benefits
         "similarity_score": similarity_score,
         "verdict": verdict,
-        "verdict_color": verdict_color,
-        "differences": diff_analysis.get("differences", []),
-        "recommendation": diff_analysis.get("recommendation", "Review with legal counsel")
+        "verdict_color": verdict_color
     }
 
 
+def compare_clauses_to_standard(clauses):
+    """
+    Compares many clauses against their standard safe clauses at once.
+    The AI difference analysis for all of them goes out as one batched request
+    (see analyze_clause_differences_batch), and results are memoized by
+    (clause hash, clause type), so repeated calls cost nothing.
+    
+    Args:
+        clauses: List of dicts with 'text' and 'type' keys
+    
+    Returns:
+        List of comparison dicts in input order (None where the clause type has no standard)
+    """
+    results = [None] * len(clauses)
+    to_compare = {}  # memo key -> indices needing a fresh comparison
+    
+    with _COMPARISON_MEMO_LOCK:
+        for idx, clause in enumerate(clauses):
+            if clause["type"] not in STANDARD_CLAUSES:
+                continue
+            key = _comparison_key(clause["text"], clause["type"])
+            if key in _COMPARISON_MEMO:
+                _COMPARISON_MEMO.move_to_end(key)
+                results[idx] = _COMPARISON_MEMO[key]
+            else:
+                to_compare.setdefault(key, []).append(idx)
+    
+    if to_compare:
+        comparisons = [_compare_text(clauses[indices[0]]["text"], clauses[indices[0]]["type"]) for indices in to_compare.values()]
+        
+        # Get AI analysis of differences
+        diff_analyses = analyze_clause_differences_batch([
+            {"user_clause": c["user_clause"], "standard_clause": c["standard_clause"]} for c in comparisons
+        ])
+        
+        for (key, indices), comparison, diff_analysis in zip(to_compare.items(), comparisons, diff_analyses):
+            comparison["differences"] = diff_analysis.get("differences", [])
+            comparison["recommendation"] = diff_analysis.get("recommendation", "Review with legal counsel")
+            
+            differences = comparison["differences"]
+            failed = bool(differences) and isinstance(differences[0], dict) and differences[0].get("aspect") in _UNAVAILABLE_ASPECTS
+            if not failed:
+                with _COMPARISON_MEMO_LOCK:
+                    _COMPARISON_MEMO[key] = comparison
+                    if len(_COMPARISON_MEMO) > _COMPARISON_MEMO_SIZE:
+                        _COMPARISON_MEMO.popitem(last=False)  # Drop the least recently used
+            
+            for idx in indices:
+                results[idx] = comparison
+    
+    return results
+
+
+def compare_clause_to_standard(user_clause, clause_type):
+    """
+    Compares user's clause against the standard safe clause.
+    Returns side-by-side comparison with AI-generated difference analysis.
+    """
+    return compare_clauses_to_standard([{"text": user_clause, "type": clause_type}])[0]
+
+
 def check_similarity(clause_text, clause_type):
     """
     Returns similarity score and standard clause (backward compatibility).
@@ -54,5 +130,4 @@ def check_similarity(clause_text, clause_type):
         return None, None
     
     standard = STANDARD_CLAUSES[clause_type]["safe"]
-    ratio = SequenceMatcher(None, clause_text.lower(), standard.lower()).ratio()
-    return int(ratio * 100), standard
+    return standard_similarity(clause_text, clause_type), standard
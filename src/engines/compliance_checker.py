@@ -3,6 +3,8 @@ Indian Legal Compliance Checker
 Validates contract clauses against common Indian law requirements
 """
 
+import re
+
 # Indian Contract Act, 1872 - Key Requirements
 INDIAN_CONTRACT_ACT_PATTERNS = {
     "consideration": {
@@ -50,33 +52,247 @@ EMPLOYMENT_LAW_REQUIREMENTS = {
 }
 
 
-def check_compliance(contract_text, contract_type, clauses):
+# ═══════════════════════════════════════════════════════════════
+# RULE ENGINE - the tables above, compiled into one regex
+# ═══════════════════════════════════════════════════════════════
+
+ARBITRATION_TERMS = ["arbitration", "arbitrator", "arbitral"]
+TERMINATION_TERMS = ["terminate", "termination", "terminated"]
+
+# Findings on these rules depend on context ("fraud" is usually in a remedy
+# clause, not evidence of fraud), so the optional AI stage re-checks them
+UNCERTAIN_RULES = {"free_consent", "lawful_object"}
+
+
+def _phrase_rules():
+    """phrase -> rule name, for every literal phrase in the tables."""
+    rules = {}
+    for phrase in INDIAN_CONTRACT_ACT_PATTERNS["consideration"]["patterns"]:
+        rules[phrase] = "consideration"
+    for phrase in INDIAN_CONTRACT_ACT_PATTERNS["free_consent"]["red_flags"]:
+        rules[phrase] = "free_consent"
+    for phrase in INDIAN_CONTRACT_ACT_PATTERNS["lawful_object"]["prohibited"]:
+        rules[phrase] = "lawful_object"
+    for phrase in CONSUMER_PROTECTION_UNFAIR_TERMS:
+        rules[phrase] = "unfair_term"
+    for phrase in ARBITRATION_COMPLIANCE["valid_triggers"]:
+        rules[phrase] = "arbitration_trigger"
+    for phrase in ARBITRATION_COMPLIANCE["seat_requirements"]:
+        rules[phrase] = "arbitration_seat"
+    for phrase in ARBITRATION_COMPLIANCE["invalid_patterns"]:
+        rules[phrase] = "arbitration_invalid"
+    for phrase in ARBITRATION_TERMS:
+        rules[phrase] = "arbitration"
+    for phrase in TERMINATION_TERMS:
+        rules[phrase] = "termination"
+    for phrase in EMPLOYMENT_LAW_REQUIREMENTS["termination_grounds"]["required"]:
+        rules[phrase] = "termination_ground"
+    return rules
+
+
+def compliance_rule_tables():
+    """Every table the rule engine reads, as plain data (for the analysis cache fingerprint)."""
+    return {
+        "contract_act": INDIAN_CONTRACT_ACT_PATTERNS,
+        "consumer_protection": CONSUMER_PROTECTION_UNFAIR_TERMS,
+        "arbitration": ARBITRATION_COMPLIANCE,
+        "employment": EMPLOYMENT_LAW_REQUIREMENTS,
+        "arbitration_terms": ARBITRATION_TERMS,
+        "termination_terms": TERMINATION_TERMS,
+        "uncertain_rules": sorted(UNCERTAIN_RULES),
+    }
+
+
+_PHRASE_RULES = None
+_RULE_PATTERN = None
+_NOTICE_PATTERNS = None
+
+
+def _compiled_rules():
+    """(phrase -> rule, combined regex, notice-period regexes), compiled once."""
+    global _PHRASE_RULES, _RULE_PATTERN, _NOTICE_PATTERNS
+    if _RULE_PATTERN is None:
+        from src.utils.keyword_matcher import build_trie_pattern
+
+        phrase_rules = _phrase_rules()
+        notice = EMPLOYMENT_LAW_REQUIREMENTS["notice_period"]["patterns"]
+        # Capturing groups are made non-capturing in the combined pattern; the day count
+        # is read by re-matching the notice pattern on the (short) match
+        notice_alternatives = "|".join(re.sub(r"\((?!\?)", "(?:", pattern) for pattern in notice)
+        _NOTICE_PATTERNS = [re.compile(pattern) for pattern in notice]
+        _RULE_PATTERN = re.compile(
+            r"\b(?P<phrase>" + build_trie_pattern(phrase_rules) + r")\b|(?P<notice>" + notice_alternatives + ")"
+        )
+        _PHRASE_RULES = phrase_rules
+    return _PHRASE_RULES, _RULE_PATTERN, _NOTICE_PATTERNS
+
+
+def _notice_days(match_text, notice_patterns):
+    for pattern in notice_patterns:
+        found = pattern.search(match_text)
+        if found:
+            return int(found.group(1))
+    return None
+
+
+def _finding(law, issue, severity, recommendation, clause_id=None, rule=None):
+    return {
+        "law": law,
+        "issue": issue,
+        "severity": severity,
+        "recommendation": recommendation,
+        "clause_id": clause_id,
+        "rule": rule,
+        "uncertain": rule in UNCERTAIN_RULES,
+    }
+
+
+def check_compliance_rules(contract_type, clauses):
     """
-    Check contract for compliance with Indian laws using AI-driven analysis.
-    This ensures that all feedback is strictly related to the document.
+    Deterministic compliance check of clause results against the Indian law
+    tables above. Each clause is lowercased and scanned once with a single
+    compiled regex; contract-level rules (missing consideration, arbitration
+    seat, termination grounds) are decided from what the scan saw.
+
+    Args:
+        contract_type: e.g. "Employment Agreement" (enables employment rules)
+        clauses: [{"id", "text", ...}] (pipeline clause results)
+
+    Returns:
+        {"overall_status", "violations", "warnings"}; each finding also has
+        "clause_id", "rule" and "uncertain" (worth a second look by the AI stage).
     """
+    phrase_rules, pattern, notice_patterns = _compiled_rules()
+    is_employment = "employment" in (contract_type or "").lower()
+    min_days = EMPLOYMENT_LAW_REQUIREMENTS["notice_period"]["min_days"]
+
+    violations, warnings = [], []
+    seen = {}  # rule -> first clause id it matched in
+    flagged = set()  # (rule, clause id) already reported
+
+    for clause in clauses:
+        clause_id = clause.get("id")
+        for match in pattern.finditer(clause["text"].lower()):
+            if match.lastgroup == "notice":
+                days = _notice_days(match.group(), notice_patterns)
+                if is_employment and days is not None and days < min_days:
+                    violations.append(_finding(
+                        "Industrial Employment (Standing Orders) / Shops & Establishments Acts",
+                        f"{EMPLOYMENT_LAW_REQUIREMENTS['notice_period']['violation']}: {days} days",
+                        "Medium",
+                        f"Provide at least {min_days} days' notice (or pay in lieu of notice).",
+                        clause_id, "notice_period",
+                    ))
+                continue
+
+            phrase = match.group()
+            rule = phrase_rules[phrase]
+            seen.setdefault(rule, clause_id)
+            if (rule, clause_id) in flagged:
+                continue
+            if rule == "free_consent":
+                flagged.add((rule, clause_id))
+                warnings.append(_finding(
+                    "Indian Contract Act 1872, Sec 14-18", f"{INDIAN_CONTRACT_ACT_PATTERNS['free_consent']['violation_message']} ('{phrase}')",
+                    "Medium", "Confirm this clause does not make consent voidable; a contract caused by coercion, fraud or misrepresentation is voidable (Sec 19).",
+                    clause_id, rule,
+                ))
+            elif rule == "lawful_object":
+                flagged.add((rule, clause_id))
+                warnings.append(_finding(
+                    "Indian Contract Act 1872, Sec 23", f"{INDIAN_CONTRACT_ACT_PATTERNS['lawful_object']['violation_message']} ('{phrase}')",
+                    "Medium", "Check that the object of this clause is lawful; agreements with an unlawful object are void.",
+                    clause_id, rule,
+                ))
+            elif rule == "unfair_term":
+                flagged.add((rule, clause_id))
+                violations.append(_finding(
+                    "Consumer Protection Act 2019, Sec 2(46)", f"Unfair contract term: '{phrase}'",
+                    "High", "Remove or rebalance this term; unfair terms can be declared null and void.",
+                    clause_id, rule,
+                ))
+            elif rule == "arbitration_invalid":
+                flagged.add((rule, clause_id))
+                violations.append(_finding(
+                    "Arbitration & Conciliation Act 1996, Sec 12 & 18", f"One-sided arbitration: '{phrase}'",
+                    "High", "Provide for a neutral arbitrator appointed jointly or by an institution.",
+                    clause_id, rule,
+                ))
+
+    if "consideration" not in seen:
+        warnings.append(_finding(
+            "Indian Contract Act 1872, Sec 10 & 25", INDIAN_CONTRACT_ACT_PATTERNS["consideration"]["violation_message"],
+            "Low", "State the consideration (fees, salary, mutual promises) each party receives.",
+            rule="consideration",
+        ))
+    arbitration_rules = [r for r in ("arbitration", "arbitration_trigger", "arbitration_seat", "arbitration_invalid") if r in seen]
+    if arbitration_rules:
+        arbitration_clause = seen[arbitration_rules[0]]
+        if "arbitration_seat" not in seen:
+            warnings.append(_finding(
+                "Arbitration & Conciliation Act 1996, Sec 20", "Arbitration clause does not name a seat or place of arbitration",
+                "Medium", "Name the seat of arbitration (e.g. your own city) to avoid disputes over jurisdiction.",
+                arbitration_clause, "arbitration_seat",
+            ))
+        if "arbitration_trigger" not in seen:
+            warnings.append(_finding(
+                "Arbitration & Conciliation Act 1996, Sec 7", "Scope of disputes referred to arbitration is not defined",
+                "Low", "Refer 'any dispute arising out of or in connection with this Agreement' to arbitration.",
+                arbitration_clause, "arbitration_trigger",
+            ))
+    if is_employment and "termination" in seen and "termination_ground" not in seen:
+        warnings.append(_finding(
+            "Industrial Employment (Standing Orders) Act 1946", EMPLOYMENT_LAW_REQUIREMENTS["termination_grounds"]["violation"],
+            "Medium", "List the grounds for termination (misconduct, performance, redundancy) and the process.",
+            seen["termination"], "termination_grounds",
+        ))
+
+    return {"overall_status": _overall_status(violations, warnings), "violations": violations, "warnings": warnings}
+
+
+def _overall_status(violations, warnings):
+    if violations:
+        return "Non-Compliant"
+    return "Needs Review" if warnings else "Compliant"
+
+
+def check_compliance(contract_text, contract_type, clauses, use_ai=False):
+    """
+    Check contract for compliance with Indian laws.
+
+    The rule engine always runs (milliseconds). With use_ai, the clauses
+    behind uncertain rule findings are sent to Claude, whose findings replace
+    them; if the AI is unavailable, the rule findings are kept.
+
+    Args:
+        contract_text: Normalized contract text (segmented if clauses is empty)
+        contract_type: e.g. "Service Agreement"
+        clauses: Pipeline clause results ([{"id", "text", ...}])
+        use_ai: Run the optional Claude stage for uncertain findings
+    """
+    if not clauses:
+        from src.utils.segmenter import segment_clauses
+        clauses = [{"id": i, "text": text} for i, text in enumerate(segment_clauses(contract_text), 1)]
+
+    report = check_compliance_rules(contract_type, clauses)
+    uncertain = [f for f in report["violations"] + report["warnings"] if f["uncertain"]]
+    if not use_ai or not uncertain:
+        return report
+
     from src.services.llm import analyze_compliance_with_ai
-    
-    # 1. Get AI-driven dynamic compliance report
-    compliance_report = analyze_compliance_with_ai(contract_text, contract_type)
-    
-    # 2. Add static baselines as supplementary (only if needed)
-    # Most of the static logic is now superseded by the dynamic AI analysis
-    # to meet the user's requirement for "no static response".
-    
-    # Ensure structure is correct if AI fails
-    if not isinstance(compliance_report, dict):
-        compliance_report = {
-            "overall_status": "Unknown",
-            "violations": [],
-            "warnings": []
-        }
-    
-    # Fallback to overall status check
-    if not compliance_report.get("violations") and not compliance_report.get("warnings"):
-        compliance_report["overall_status"] = "Compliant"
-    
-    return compliance_report
+
+    ids = {f["clause_id"] for f in uncertain}
+    excerpt = "\n\n".join(f"Clause {c.get('id')}: {c['text']}" for c in clauses if c.get("id") in ids)
+    ai_report = analyze_compliance_with_ai(excerpt, contract_type)
+    if not isinstance(ai_report, dict) or ai_report.get("overall_status") == "Unknown":
+        return report  # AI unavailable: keep the rule findings
+
+    for key in ("violations", "warnings"):
+        kept = [f for f in report[key] if not f["uncertain"]]
+        reviewed = [dict(f, rule="ai_review", uncertain=False) for f in ai_report.get(key, []) if isinstance(f, dict)]
+        report[key] = kept + reviewed
+    report["overall_status"] = _overall_status(report["violations"], report["warnings"])
+    return report
 
 
 def generate_compliance_summary(compliance_report):
@@ -7,6 +7,10 @@ This is the KEY differentiator: We don't just analyze - we tell SMEs what to DO.
 from typing import Dict, List, Tuple
 from datetime import datetime, timedelta
 
+from src.config import RED_FLAG_PATTERNS
+from src.utils.keyword_matcher import get_keyword_matcher
+from src.utils.instrumentation import span
+
 class ContractDecisionEngine:
     """
     Converts risk analysis into clear business recommendations.
@@ -77,33 +81,25 @@ class ContractDecisionEngine:
         Red flags = absolute deal-breakers that require immediate attention.
         """
         red_flags = []
-        
-        critical_patterns = {
-            "unlimited_liability": ["unlimited liability", "unlimited indemnity", "no liability cap"],
-            "foreign_jurisdiction": ["courts in london", "courts at new york", "singapore", "arbitration in london"],
-            "instant_termination": ["without notice", "without cause", "sole discretion"],
-            "perpetual_obligations": ["perpetual", "irrevocable", "permanent"],
-            "assignment_of_all_ip": ["all intellectual property", "all ip rights", "assigns all rights"]
-        }
+        matcher = get_keyword_matcher()
         
         for clause in clauses:
             if clause.get('risk') != 'High':
                 continue
             
-            clause_text = clause.get('text', '').lower()
+            clause_text = clause.get('text', '')
+            hits = matcher.first_hits(clause_text, tables=["red_flag"])
             
-            for flag_type, patterns in critical_patterns.items():
-                for pattern in patterns:
-                    if pattern in clause_text:
-                        red_flags.append({
-                            "type": flag_type,
-                            "clause_id": clause.get('id'),
-                            "clause_type": clause.get('type'),
-                            "severity": "CRITICAL",
-                            "why_dealbreaker": self._explain_red_flag(flag_type),
-                            "text_excerpt": clause_text[:150]
-                        })
-                        break
+            for flag_type in RED_FLAG_PATTERNS:
+                if ("red_flag", flag_type) in hits:
+                    red_flags.append({
+                        "type": flag_type,
+                        "clause_id": clause.get('id'),
+                        "clause_type": clause.get('type'),
+                        "severity": "CRITICAL",
+                        "why_dealbreaker": self._explain_red_flag(flag_type),
+                        "text_excerpt": clause_text.lower()[:150]
+                    })
         
         return red_flags
     
@@ -399,6 +395,7 @@ class ContractDecisionEngine:
 
 
 # Convenience function
+@span("decision_engine.make_decision")
 def make_decision(analysis_results: Dict) -> Dict:
     """
     Simple wrapper for external use.
@@ -0,0 +1,341 @@
+"""
+Analysis Pipeline - Runs the fast (keyword-based) contract analysis headlessly.
+
+This is the same flow the Streamlit "Analyze Document" button uses, exposed as a
+plain function so workers, batch jobs and benchmarks can call it without
+booting Streamlit. Each stage is a small function that reads from and writes to
+a shared context dict, so stages can be swapped, reordered or timed on their own.
+"""
+
+import atexit
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src import config
+from src.config import (
+    ANALYSIS_CACHE_PATH, ANALYSIS_CACHE_MAX_ENTRIES, ANALYSIS_CACHE_TTL_SECONDS, CLAUSE_CHUNK_SIZE,
+    CLAUSE_SECONDS, CLAUSE_POOL_SECONDS, CLAUSE_POOL_CALL_SECONDS
+)
+from src.utils.preprocess import clean_text
+from src.utils.segmenter import segment_clauses_with_offsets
+from src.utils.classifier import classify_clause, detect_modality
+from src.utils.contract_classifier import classify_contract
+from src.utils.ambiguity import detect_ambiguity
+from src.engines.risk_engine import assess_risk_with_explanation, contract_risk_score, calculate_financial_risk
+from src.engines.decision_engine import make_decision
+from src.engines.compliance_checker import check_compliance, compliance_rule_tables
+from src.services.ner import extract_entities, ENTITY_RULES
+from src.services.multilingual import is_hindi, normalize_hindi_contract, format_for_display, get_hindi_translator
+from src.services.cache import SQLiteCache, make_key
+from src.utils.keyword_matcher import get_keyword_matcher
+from src.utils.instrumentation import count, span
+from src.utils.pools import pool_context, usable_cpus
+
+# Bump when analysis logic changes in a way the keyword tables don't capture,
+# so cached analyses from the old logic are not served
+ANALYSIS_VERSION = 4
+
+# The src/config.py settings the fast analysis reads. Cache, LLM, API, job and
+# instrumentation settings don't change its output, so they stay out of the fingerprint.
+FINGERPRINT_SETTINGS = (
+    "CLAUSE_TYPES",  # classifier
+    "CLAUSE_TYPE_KEYWORDS",  # classifier (keyword matcher)
+    "CONTRACT_TYPE_KEYWORDS",  # contract classifier
+    "RISK_KEYWORDS",  # risk engine
+    "RISK_EXPLANATIONS",  # risk engine, results
+    "RED_FLAG_PATTERNS",  # decision engine
+    "SCRIPT_SAMPLE_MIN_CHARS",  # Hindi detection
+    "SCRIPT_SAMPLE_WINDOWS",
+    "SCRIPT_SAMPLE_WINDOW_CHARS",
+)
+
+# Basic explanations shown before (optional) AI enhancement
+BASIC_GUIDANCE = {
+    "High": ("High risk detected by keyword analysis", "Consult legal counsel before signing"),
+    "Medium": ("Medium risk - review carefully", "Consider negotiating this clause"),
+    "Low": ("Low risk - appears to be standard language", "No changes needed"),
+}
+
+
+@dataclass
+class AnalysisResult:
+    """
+    Output of analyze_contract().
+    Field names match the analyzed_results dict the UI keeps in session state.
+    """
+    text: str = ""
+    norm_text: str = ""
+    contract_type: str = "Unknown"
+    entities: Dict = field(default_factory=dict)
+    clauses_count: int = 0
+    results: List[Dict] = field(default_factory=list)
+    clause_spans: List[Tuple[int, int]] = field(default_factory=list)  # (start, end) of each clause in norm_text
+    overall_risk: str = "Unknown"
+    high_risk_count: int = 0
+    medium_risk_count: int = 0
+    financial_impact: Dict = field(default_factory=dict)
+    is_hindi: bool = False
+    translation_metadata: Dict = field(default_factory=dict)
+    hindi_risks: Dict = field(default_factory=lambda: {"High": [], "Medium": []})
+    decision: Dict = field(default_factory=dict)
+    compliance: Dict = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)  # stage name -> seconds
+
+    def to_dict(self) -> Dict:
+        """Returns the analyzed_results dict layout used by app.py."""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+# ═══════════════════════════════════════════════════════════════
+# STAGES - each takes the shared context dict and updates it in place
+# ═══════════════════════════════════════════════════════════════
+
+def normalize_stage(ctx: Dict) -> None:
+    """Detects Hindi, translates it if needed and cleans the text."""
+    raw_text = ctx["raw_text"]
+    ctx["is_hindi"] = is_hindi(raw_text)
+
+    if ctx["is_hindi"]:
+        normalized_text, translation_metadata = normalize_hindi_contract(raw_text)
+        ctx["norm_text"] = clean_text(normalized_text)
+        ctx["text"] = format_for_display(raw_text, True)
+        ctx["translation_metadata"] = translation_metadata
+        ctx["hindi_risks"] = translation_metadata.get("hindi_risk_keywords_found", {"High": [], "Medium": []})
+    else:
+        ctx["norm_text"] = clean_text(raw_text)
+        ctx["text"] = raw_text
+        ctx["translation_metadata"] = {"is_hindi": False}
+        ctx["hindi_risks"] = {"High": [], "Medium": []}
+
+
+def classify_contract_stage(ctx: Dict) -> None:
+    ctx["contract_type"] = classify_contract(ctx["norm_text"])
+
+
+def entities_stage(ctx: Dict) -> None:
+    ctx["entities"] = extract_entities(ctx["norm_text"])
+
+
+def segment_stage(ctx: Dict) -> None:
+    segments = segment_clauses_with_offsets(ctx["norm_text"])
+    ctx["clauses"] = [segment.text for segment in segments]
+    ctx["clause_spans"] = [(segment.start, segment.end) for segment in segments]
+    ctx["clauses_count"] = len(segments)
+
+
+def clauses_stage(ctx: Dict) -> None:
+    ctx["results"] = analyze_clauses(ctx["clauses"], ctx.get("clause_workers"))
+
+
+def risk_score_stage(ctx: Dict) -> None:
+    results = ctx["results"]
+    ctx["overall_risk"] = contract_risk_score(results)
+    ctx["high_risk_count"] = sum(1 for r in results if r["risk"] == "High")
+    ctx["medium_risk_count"] = sum(1 for r in results if r["risk"] == "Medium")
+
+
+def financial_stage(ctx: Dict) -> None:
+    ctx["financial_impact"] = calculate_financial_risk(ctx["results"], ctx["entities"])
+
+
+def decision_stage(ctx: Dict) -> None:
+    ctx["decision"] = make_decision({
+        'results': ctx["results"],
+        'high_risk_count': ctx["high_risk_count"],
+        'medium_risk_count': ctx["medium_risk_count"],
+        'financial_impact': ctx["financial_impact"],
+        'contract_type': ctx["contract_type"],
+        'overall_risk': ctx["overall_risk"]
+    })
+
+
+def compliance_stage(ctx: Dict) -> None:
+    """Rule-based Indian law compliance check (the AI review runs separately, see jobs.py)."""
+    ctx["compliance"] = check_compliance(ctx["norm_text"], ctx["contract_type"], ctx["results"])
+
+
+Stage = Tuple[str, Callable[[Dict], None]]
+
+DEFAULT_STAGES: List[Stage] = [
+    ("normalize", normalize_stage),
+    ("classify_contract", classify_contract_stage),
+    ("entities", entities_stage),
+    ("segment", segment_stage),
+    ("clauses", clauses_stage),
+    ("risk_score", risk_score_stage),
+    ("financial", financial_stage),
+    ("decision", decision_stage),
+    ("compliance", compliance_stage),
+]
+
+
+def analyze_clause(clause_id: int, clause: str) -> Dict:
+    """
+    Fast keyword-based analysis of a single clause.
+    Returns the per-clause result dict shown in the clause-by-clause view.
+    """
+    risk_data = assess_risk_with_explanation(clause)
+    risk = risk_data["risk"]
+    explanation, suggestion = BASIC_GUIDANCE[risk]
+
+    return {
+        "id": clause_id,
+        "text": clause,
+        "type": classify_clause(clause),
+        "risk": risk,
+        "explanation": explanation,
+        "suggestion": suggestion,
+        "modality": detect_modality(clause),
+        "ambiguity": detect_ambiguity(clause),
+        "triggers": risk_data.get("triggers", []),
+        "business_consequences": [],
+        "negotiation_script": "",
+        "mitigation_strategies": []
+    }
+
+
+def _analyze_clause_chunk(first_id: int, clauses: List[str]) -> List[Dict]:
+    """Pool worker: analyze_clause() for consecutive clauses numbered from first_id."""
+    return [analyze_clause(clause_id, clause) for clause_id, clause in enumerate(clauses, start=first_id)]
+
+
+_clause_pool = None
+_clause_pool_workers = 0
+
+
+def _get_clause_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool kept between analyses, so only the first large contract pays for starting it."""
+    global _clause_pool, _clause_pool_workers
+    if _clause_pool is None or _clause_pool_workers != workers:
+        if _clause_pool is not None:
+            _clause_pool.shutdown(wait=False)
+        _clause_pool = ProcessPoolExecutor(max_workers=workers, mp_context=pool_context())
+        _clause_pool_workers = workers
+        atexit.register(_clause_pool.shutdown, wait=False)
+    return _clause_pool
+
+
+def _pool_pays_off(clauses: int, workers: int) -> bool:
+    """Whether `workers` processes analyze `clauses` clauses faster than one (cost model in src/config.py)."""
+    saved = clauses * CLAUSE_SECONDS * (1 - 1 / workers)
+    return saved > clauses * CLAUSE_POOL_SECONDS + CLAUSE_POOL_CALL_SECONDS
+
+
+def analyze_clauses(clauses: List[str], workers: Optional[int] = None) -> List[Dict]:
+    """
+    analyze_clause() for every clause, ids numbered from 1 in order.
+
+    On hosts with 2+ usable CPUs, contracts large enough for the pool to pay
+    off are split into CLAUSE_CHUNK_SIZE chunks across a process pool (one
+    pickle round trip per chunk, not per clause); results come back in clause
+    order. Everything else runs serially.
+
+    Args:
+        clauses: Clause texts
+        workers: Processes for large contracts (default and maximum: usable CPUs); 1 forces
+                 serial, e.g. inside a worker process that already analyzes whole documents
+    """
+    workers = min(workers or usable_cpus(), usable_cpus())
+    if workers < 2 or not _pool_pays_off(len(clauses), workers):
+        return _analyze_clause_chunk(1, clauses)
+
+    size = CLAUSE_CHUNK_SIZE
+    starts = range(0, len(clauses), size)
+    chunks = _get_clause_pool(workers).map(
+        _analyze_clause_chunk, [start + 1 for start in starts], [clauses[start:start + size] for start in starts]
+    )
+    return [result for chunk in chunks for result in chunk]
+
+
+def run_stages(ctx: Dict, stages: List[Stage]) -> Dict[str, float]:
+    """
+    Runs stages in order against ctx. Returns wall-clock seconds per stage,
+    which are also recorded as "pipeline.<stage>" spans.
+    """
+    timings = {}
+    for name, stage in stages:
+        start = time.perf_counter()
+        with span(f"pipeline.{name}"):
+            stage(ctx)
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+@lru_cache(maxsize=1)
+def analysis_fingerprint() -> str:
+    """
+    Hash of everything the fast analysis is configured by: the
+    FINGERPRINT_SETTINGS from src/config.py, the compiled keyword and entity
+    tables, the compliance rule tables, the Hindi dictionary and ANALYSIS_VERSION.
+    Changing any keyword list or rule changes the fingerprint, which invalidates the cache.
+    """
+    settings = {name: getattr(config, name) for name in FINGERPRINT_SETTINGS}
+    return make_key(
+        ANALYSIS_VERSION,
+        settings,
+        sorted((list(category), keywords) for category, keywords in get_keyword_matcher().tables.items()),
+        [(rule.entity_type, rule.pattern.pattern) for rule in ENTITY_RULES],
+        compliance_rule_tables(),
+        get_hindi_translator().dictionary,
+        BASIC_GUIDANCE,
+    )
+
+
+def analysis_cache_key(raw_text: str) -> str:
+    """Cache key for raw_text: hash of the cleaned text plus analysis_fingerprint()."""
+    return make_key(clean_text(raw_text), analysis_fingerprint())
+
+
+@lru_cache(maxsize=1)
+def get_result_cache() -> SQLiteCache:
+    """The shared on-disk cache of full analyses (settings in src/config.py)."""
+    return SQLiteCache(
+        ANALYSIS_CACHE_PATH,
+        max_entries=ANALYSIS_CACHE_MAX_ENTRIES,
+        ttl_seconds=ANALYSIS_CACHE_TTL_SECONDS
+    )
+
+
+def analyze_contract(raw_text: str, stages: Optional[List[Stage]] = None,
+                     cache: Optional[SQLiteCache] = None, workers: Optional[int] = None) -> AnalysisResult:
+    """
+    Runs the full fast analysis on raw contract text (English or Hindi).
+
+    Args:
+        raw_text: Contract text as extracted from the upload
+        stages: Optional replacement for DEFAULT_STAGES (e.g. to skip or swap a stage)
+        cache: Optional result cache (e.g. get_result_cache()). Only used with
+               the default stages, since custom stages aren't part of the key.
+        workers: Processes for the per-clause analysis of large contracts
+                 (see analyze_clauses); 1 keeps everything in this process
+
+    Returns:
+        AnalysisResult with per-stage timings ("cache" on a cache hit)
+    """
+    result_fields = {f.name for f in fields(AnalysisResult)}
+    use_cache = cache is not None and stages is None
+
+    if use_cache:
+        start = time.perf_counter()
+        key = analysis_cache_key(raw_text)
+        cached = cache.get(key)
+        count("pipeline.cache_hits" if cached is not None else "pipeline.cache_misses")
+        if cached is not None:
+            cached["timings"] = {"cache": time.perf_counter() - start}
+            return AnalysisResult(**{k: v for k, v in cached.items() if k in result_fields})
+
+    ctx = {"raw_text": raw_text, "clause_workers": workers}
+    timings = run_stages(ctx, stages if stages is not None else DEFAULT_STAGES)
+
+    result = AnalysisResult(
+        **{k: v for k, v in ctx.items() if k in result_fields},
+        timings=timings
+    )
+    if use_cache:
+        stored = result.to_dict()
+        del stored["timings"]
+        cache.set(key, stored)
+    return result
@@ -0,0 +1,277 @@
+"""
+Compact Clause Results - Columnar storage for per-clause analysis results.
+
+The pipeline returns one dict per clause, each holding its own copy of the
+clause text and of every trigger's context snippet. The UI keeps those in
+st.session_state for every user, so memory grows with users x contract size.
+
+ClauseTable keeps the same information as columns: small-int codes for
+id/type/risk/modality, (start, end) offsets into the one shared normalized
+text, and trigger contexts as offsets into their clause. Text is only
+materialized when a field is read. Values that differ from what the columns
+can rebuild (AI explanations, edited text, extra keys) are kept per row.
+
+Rows are read and written through ClauseView, a MutableMapping, so existing
+code such as `item["text"]`, `item.get("triggers")` or
+`result["risk"] = "High"` works unchanged. Mutating a list read from a view
+in place is only kept for values set on the row; assign a new value instead.
+"""
+
+from array import array
+from collections.abc import MutableMapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.config import RISK_EXPLANATIONS
+from src.engines.pipeline import BASIC_GUIDANCE
+
+# Keys of a pipeline clause result, in order (see pipeline.analyze_clause)
+RESULT_FIELDS = (
+    "id", "text", "type", "risk", "explanation", "suggestion", "modality", "ambiguity",
+    "triggers", "business_consequences", "negotiation_script", "mitigation_strategies",
+)
+_CODED_FIELDS = ("type", "risk", "modality")
+_TRIGGER_DEFAULTS = {"High": "This term creates significant risk.", "Medium": "This term may need clarification."}
+_EMPTY_DEFAULTS = {"ambiguity": list, "triggers": list, "business_consequences": list,
+                   "negotiation_script": str, "mitigation_strategies": list}
+
+
+class _CodedColumn:
+    """Column of repeated strings stored as 2-byte codes into a shared vocabulary."""
+
+    __slots__ = ("values", "_index", "codes")
+
+    def __init__(self):
+        self.values = []
+        self._index = {}
+        self.codes = array("H")
+
+    def code(self, value: str) -> int:
+        if value not in self._index:
+            self._index[value] = len(self.values)
+            self.values.append(value)
+        return self._index[value]
+
+    def append(self, value: str) -> None:
+        self.codes.append(self.code(value))
+
+    def __getitem__(self, row: int) -> str:
+        return self.values[self.codes[row]]
+
+    def __setitem__(self, row: int, value: str) -> None:
+        self.codes[row] = self.code(value)
+
+
+def _trigger_explanation(keyword: str, severity: str) -> Optional[str]:
+    return RISK_EXPLANATIONS.get(severity, {}).get(keyword, _TRIGGER_DEFAULTS.get(severity))
+
+
+class ClauseTable(Sequence):
+    """
+    Clause results for one contract, stored by column.
+
+    Args:
+        source: The normalized contract text the clause offsets point into
+        guidance: risk -> (default explanation, default suggestion) of rows the AI hasn't rewritten
+    """
+
+    def __init__(self, source: str, guidance: Dict[str, Tuple[str, str]] = BASIC_GUIDANCE):
+        self.source = source
+        self.guidance = guidance
+        self._ids = array("l")
+        self._starts = array("l")
+        self._ends = array("l")
+        self._columns = {name: _CodedColumn() for name in _CODED_FIELDS}
+        self._ambiguity = {}  # row -> list of terms (rows without any are absent)
+        self._triggers = {}  # row -> tuple of (keyword, severity, start, end) offsets into the clause, or dicts
+        self._overrides = {}  # row -> {field: value} that the columns can't rebuild
+
+    @classmethod
+    def from_results(cls, results: List[Dict], source: str, spans: List[Tuple[int, int]],
+                     guidance: Dict[str, Tuple[str, str]] = BASIC_GUIDANCE) -> "ClauseTable":
+        """Builds a table from pipeline result dicts and their clause spans in source."""
+        table = cls(source, guidance)
+        for result, (start, end) in zip(results, spans):
+            table.append(result, start, end)
+        return table
+
+    def append(self, result: Dict, start: int = 0, end: int = 0) -> None:
+        """Adds one clause result; (start, end) is its span in source, if it has one."""
+        row = len(self._ids)
+        text = result["text"]
+        sliced = self.source[start:end] == text
+        self._ids.append(result["id"])
+        self._starts.append(start if sliced else 0)
+        self._ends.append(end if sliced else 0)
+        for name in _CODED_FIELDS:
+            self._columns[name].append(result[name])
+        if result.get("ambiguity"):
+            self._ambiguity[row] = result["ambiguity"]
+
+        triggers = []
+        for trigger in result.get("triggers") or ():
+            offset = text.find(trigger.get("context", ""))
+            compact = (
+                set(trigger) == {"keyword", "context", "severity", "explanation"}
+                and offset != -1
+                and trigger["explanation"] == _trigger_explanation(trigger["keyword"], trigger["severity"])
+            )
+            if compact:
+                triggers.append((trigger["keyword"], trigger["severity"], offset, offset + len(trigger["context"])))
+            else:
+                triggers.append(trigger)
+        if triggers:
+            self._triggers[row] = tuple(triggers)
+
+        explanation, suggestion = self.guidance.get(result["risk"], (None, None))
+        overrides = {}
+        if not sliced:
+            overrides["text"] = text
+        if result.get("explanation") != explanation:
+            overrides["explanation"] = result.get("explanation")
+        if result.get("suggestion") != suggestion:
+            overrides["suggestion"] = result.get("suggestion")
+        for key, value in result.items():
+            if key in _EMPTY_DEFAULTS and key not in ("ambiguity", "triggers") and value != _EMPTY_DEFAULTS[key]():
+                overrides[key] = value
+            elif key not in RESULT_FIELDS:
+                overrides[key] = value
+        if overrides:
+            self._overrides[row] = overrides
+
+    # ═══════════════════════════════════════════════════════════
+    # Row access
+    # ═══════════════════════════════════════════════════════════
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ClauseView(self, row) for row in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("clause index out of range")
+        return ClauseView(self, index)
+
+    def __iter__(self) -> Iterator["ClauseView"]:
+        for row in range(len(self)):
+            yield ClauseView(self, row)
+
+    def to_list(self) -> List[Dict]:
+        """Plain result dicts (e.g. for JSON export)."""
+        return [dict(view) for view in self]
+
+    def span(self, row: int) -> Optional[Tuple[int, int]]:
+        """(start, end) of the clause in source, or None if its text doesn't come from source."""
+        if "text" in self._overrides.get(row, ()):
+            return None
+        return self._starts[row], self._ends[row]
+
+    def _keys(self, row: int) -> List[str]:
+        extra = [key for key in self._overrides.get(row, ()) if key not in RESULT_FIELDS]
+        return list(RESULT_FIELDS) + extra
+
+    def _get(self, row: int, key: str) -> Any:
+        overrides = self._overrides.get(row)
+        if overrides and key in overrides:
+            return overrides[key]
+        if key == "id":
+            return self._ids[row]
+        if key == "text":
+            return self.source[self._starts[row]:self._ends[row]]
+        if key in self._columns:
+            return self._columns[key][row]
+        if key in ("explanation", "suggestion"):
+            guidance = self.guidance.get(self._columns["risk"][row], (None, None))
+            return guidance[0] if key == "explanation" else guidance[1]
+        if key == "ambiguity":
+            return self._ambiguity.get(row, [])
+        if key == "triggers":
+            return self._materialize_triggers(row)
+        if key in _EMPTY_DEFAULTS:
+            return _EMPTY_DEFAULTS[key]()
+        raise KeyError(key)
+
+    def _materialize_triggers(self, row: int) -> List[Dict]:
+        stored = self._triggers.get(row)
+        if not stored:
+            return []
+        text = self._get(row, "text")
+        triggers = []
+        for trigger in stored:
+            if isinstance(trigger, dict):
+                triggers.append(trigger)
+                continue
+            keyword, severity, start, end = trigger
+            triggers.append({
+                "keyword": keyword,
+                "context": text[start:end],
+                "severity": severity,
+                "explanation": _trigger_explanation(keyword, severity),
+            })
+        return triggers
+
+    def _set(self, row: int, key: str, value: Any) -> None:
+        if key == "risk":
+            # Explanation/suggestion defaults depend on risk: keep the current ones
+            for dependent in ("explanation", "suggestion"):
+                if dependent not in self._overrides.get(row, {}):
+                    self._overrides.setdefault(row, {})[dependent] = self._get(row, dependent)
+        if key in self._columns:
+            self._columns[key][row] = value
+        elif key == "id":
+            self._ids[row] = value
+        elif key == "ambiguity":
+            self._ambiguity[row] = value
+        elif key == "triggers":
+            self._triggers[row] = tuple(value)
+        else:
+            self._overrides.setdefault(row, {})[key] = value
+
+    def _delete(self, row: int, key: str) -> None:
+        if key in RESULT_FIELDS:
+            raise TypeError(f"'{key}' is a clause column and can't be deleted")
+        del self._overrides.get(row, {})[key]
+
+
+class ClauseView(MutableMapping):
+    """Dict-like view of one ClauseTable row. Reads materialize values; writes go to the table."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: ClauseTable, row: int):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        return self._table._get(self._row, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._table._set(self._row, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self._table._delete(self._row, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table._keys(self._row))
+
+    def __len__(self) -> int:
+        return len(self._table._keys(self._row))
+
+    def __repr__(self) -> str:
+        return f"ClauseView({dict(self)!r})"
+
+
+def compact_analysis(analysis: Dict, guidance: Dict[str, Tuple[str, str]] = BASIC_GUIDANCE) -> Dict:
+    """
+    Returns an AnalysisResult.to_dict() with "results" as a ClauseTable over
+    "norm_text" (and "clause_spans" dropped), for keeping in session state.
+    """
+    compact = dict(analysis)
+    spans = compact.pop("clause_spans", None) or []
+    results = compact["results"]
+    if len(spans) != len(results):
+        spans = [(0, 0)] * len(results)  # e.g. an old cached analysis: keep texts per row
+    compact["results"] = ClauseTable.from_results(results, compact["norm_text"], spans, guidance)
+    return compact
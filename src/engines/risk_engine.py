@@ -1,4 +1,6 @@
 from src.config import RISK_KEYWORDS, RISK_EXPLANATIONS
+from src.utils.keyword_matcher import get_keyword_matcher
+from src.utils.instrumentation import span
 import re
 
 RISK_SCORE_MAP = {
@@ -12,39 +14,27 @@ def assess_risk_with_explanation(clause):
     Returns risk level + exact phrases that triggered it + explanations.
     This provides transparency into why a clause is risky.
     """
-    clause_lower = clause.lower()
+    hits = get_keyword_matcher().first_hits(clause, tables=["risk"])
     triggers = []
     
-    # Check High Risk keywords first
-    for kw in RISK_KEYWORDS["High"]:
-        if kw in clause_lower:
-            # Find the actual phrase with context
-            start_idx = clause_lower.find(kw)
-            context_start = max(0, start_idx - 30)
-            context_end = min(len(clause), start_idx + len(kw) + 30)
-            context = clause[context_start:context_end]
-            
-            triggers.append({
-                "keyword": kw,
-                "context": context.strip(),
-                "severity": "High",
-                "explanation": RISK_EXPLANATIONS["High"].get(kw, "This term creates significant risk.")
-            })
-    
-    # Check Medium Risk keywords (now always checked to provide complete profile)
-    for kw in RISK_KEYWORDS["Medium"]:
-        if kw in clause_lower:
-            start_idx = clause_lower.find(kw)
-            context_start = max(0, start_idx - 30)
-            context_end = min(len(clause), start_idx + len(kw) + 30)
-            context = clause[context_start:context_end]
-            
-            triggers.append({
-                "keyword": kw,
-                "context": context.strip(),
-                "severity": "Medium",
-                "explanation": RISK_EXPLANATIONS["Medium"].get(kw, "This term may need clarification.")
-            })
+    # High Risk keywords first, then Medium (always checked to provide complete profile)
+    for severity, default_explanation in (("High", "This term creates significant risk."),
+                                          ("Medium", "This term may need clarification.")):
+        found = hits.get(("risk", severity), {})
+        for kw in RISK_KEYWORDS[severity]:
+            if kw in found:
+                # Find the actual phrase with context
+                start_idx = found[kw]
+                context_start = max(0, start_idx - 30)
+                context_end = min(len(clause), start_idx + len(kw) + 30)
+                context = clause[context_start:context_end]
+                
+                triggers.append({
+                    "keyword": kw,
+                    "context": context.strip(),
+                    "severity": severity,
+                    "explanation": RISK_EXPLANATIONS[severity].get(kw, default_explanation)
+                })
     
     if triggers:
         # Return highest severity found
@@ -73,6 +63,7 @@ def assess_risk(clause):
     return result["risk"]
 
 
+@span("risk_engine.contract_risk_score")
 def contract_risk_score(results):
     """
     Calculates overall contract risk based on clause-level risks.
@@ -104,6 +95,7 @@ def contract_risk_score(results):
         return "Low"  # Mostly clean contract
 
 
+@span("risk_engine.calculate_financial_risk")
 def calculate_financial_risk(results, entities):
     """
     Estimates financial exposure from contract terms.
@@ -0,0 +1,329 @@
+"""
+Analysis API - Streamlit-free HTTP/JSON service over the analysis engines.
+
+Built on Tornado (already installed with Streamlit), so the service adds no
+dependencies. Keyword analysis and PDF rendering are CPU-bound and run in a
+process pool. Claude requests block on the network and run in a thread pool.
+The event loop only parses requests and writes responses.
+
+Endpoints (JSON in, JSON out unless noted):
+    GET  /health                 {"status": "ok", "llm": "anthropic" | "stub" | "unconfigured", "llm_metrics": {...}}
+    POST /v1/analyze             {"text": ...} or a raw PDF/DOCX/TXT body with ?filename=contract.pdf
+    POST /v1/enhance             {"clauses": [{"text", "type"}, ...]} -> AI analysis per clause
+    POST /v1/compare             {"clauses": [{"text", "type"}, ...]} -> comparison with standard clauses
+    POST /v1/compliance          {"text", "contract_type"} -> compliance report (rules + AI review) + summary
+    POST /v1/report              {"analysis": <analyze response>} or {"text": ...} -> application/pdf
+    GET  /metrics                p50/p95 per stage and counters, Prometheus text (?format=json for JSON)
+
+Request bodies over MAX_UPLOAD_BYTES (the same 5MB limit as uploads in
+app.py) are rejected with 413 as soon as the headers arrive.
+
+Worker processes send the spans they record (src/utils/instrumentation.py)
+back with each result, so /metrics covers the whole service.
+
+Usage:
+    python -m src.services.api [--port 8000] [--workers 4] [--stub-llm [--stub-latency 0.5]]
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import tornado.web
+from tornado.httpserver import HTTPServer
+
+from src.config import MAX_UPLOAD_BYTES, API_PORT, API_ANALYSIS_WORKERS, API_LLM_THREADS
+from src.engines.pipeline import analyze_contract, get_result_cache
+from src.services import llm
+from src.utils.instrumentation import drain_samples, merge_samples, metrics, metrics_snapshot, prometheus_text
+from src.utils.pools import pool_context
+from src.utils.preprocess import extract_text
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+
+# ═══════════════════════════════════════════════════════════════
+# WORKER FUNCTIONS - run in the process / thread pools
+# ═══════════════════════════════════════════════════════════════
+
+class _NamedBuffer(io.BytesIO):
+    """In-memory upload with the .name extract_text() dispatches on."""
+
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+
+
+def _extract_and_analyze(text, data=None, filename=None):
+    """Process pool: extracts an uploaded document if given, then runs the keyword pipeline."""
+    if data is not None:
+        text = extract_text(_NamedBuffer(data, filename), workers=1)
+        if text.startswith("Error extracting text") or len(text.strip()) < 50:
+            raise ValueError(f"Could not extract text from {filename}")
+    # The pool already spreads documents over the CPUs: no nested per-clause pool
+    return analyze_contract(text, cache=get_result_cache(), workers=1).to_dict()
+
+
+def _render_report(analysis):
+    """Process pool: the professional PDF report as bytes."""
+    from src.services.export_pdf import export_professional_report
+
+    buffer = io.BytesIO()
+    export_professional_report(buffer, {
+        'contract_type': analysis.get('contract_type', 'Unknown'),
+        'overall_risk': analysis.get('overall_risk', 'Unknown'),
+        'high_risk_count': analysis.get('high_risk_count', 0),
+        'medium_risk_count': analysis.get('medium_risk_count', 0),
+        'total_clauses': analysis.get('clauses_count', len(analysis.get('results', []))),
+        'clauses': analysis.get('results', []),
+        'financial_impact': analysis.get('financial_impact', {}),
+    })
+    return buffer.getvalue()
+
+
+def _compliance(text, contract_type):
+    from src.engines.compliance_checker import check_compliance, generate_compliance_summary
+
+    report = check_compliance(text, contract_type, [], use_ai=True)
+    return {"report": report, "summary": generate_compliance_summary(report)}
+
+
+def _compare(clauses):
+    from src.engines.comparison_engine import compare_clauses_to_standard
+
+    return compare_clauses_to_standard(clauses)
+
+
+def _with_metrics(fn, *args):
+    """Process pool: fn(*args) and the metrics the worker recorded since its last task."""
+    return fn(*args), drain_samples()
+
+
+def _warm_up():
+    """Imports the engines in a fresh worker so the first request doesn't pay for it."""
+    return os.getpid()
+
+
+# ═══════════════════════════════════════════════════════════════
+# HANDLERS
+# ═══════════════════════════════════════════════════════════════
+
+@tornado.web.stream_request_body
+class BaseHandler(tornado.web.RequestHandler):
+    """JSON errors, the upload size limit and access to the shared pools."""
+
+    def initialize(self, service, route):
+        self.service = service
+        self.route = route  # metric label: the route pattern, not the requested path
+        self._chunks = []
+
+    def prepare(self):
+        # Runs once the headers are in, so oversized uploads are refused before they are read
+        length = self.request.headers.get("Content-Length", "")
+        if length.isdigit() and int(length) > MAX_UPLOAD_BYTES:
+            raise tornado.web.HTTPError(413, reason=f"Request body exceeds {MAX_UPLOAD_BYTES} bytes")
+        self.request.connection.set_max_body_size(MAX_UPLOAD_BYTES)
+
+    def data_received(self, chunk):
+        self._chunks.append(chunk)
+
+    @property
+    def body(self):
+        return b"".join(self._chunks)
+
+    def on_finish(self):
+        metrics.record(f"api.{self.route}", self.request.request_time(), self.get_status() >= 500)
+
+    def write_error(self, status_code, **kwargs):
+        self.set_header("Content-Type", "application/json")
+        self.finish({"error": self._reason, "status": status_code})
+
+    def json_body(self):
+        try:
+            body = json.loads(self.body or b"{}")
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason="Body must be JSON")
+        if not isinstance(body, dict):
+            raise tornado.web.HTTPError(400, reason="Body must be a JSON object")
+        return body
+
+    def clauses_param(self, body):
+        clauses = body.get("clauses")
+        if not isinstance(clauses, list) or not all(isinstance(c, dict) and "text" in c for c in clauses):
+            raise tornado.web.HTTPError(400, reason='"clauses" must be a list of {"text", "type"} objects')
+        return [{"text": str(c["text"]), "type": str(c.get("type", "Other"))} for c in clauses]
+
+    async def in_processes(self, fn, *args):
+        result, samples = await asyncio.get_running_loop().run_in_executor(
+            self.service.processes, _with_metrics, fn, *args)
+        merge_samples(samples)
+        return result
+
+    async def in_threads(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.service.threads, fn, *args)
+
+
+class NotFoundHandler(BaseHandler):
+    """Unknown paths: a JSON 404, counted under one "api.not_found" span."""
+
+    def prepare(self):
+        raise tornado.web.HTTPError(404, reason="Not found")
+
+
+class HealthHandler(BaseHandler):
+    def get(self):
+        self.write({"status": "ok", "llm": self.service.llm_mode(), "llm_metrics": llm.gateway_stats()})
+
+
+class MetricsHandler(BaseHandler):
+    def get(self):
+        if self.get_query_argument("format", None) == "json":
+            self.write(metrics_snapshot())
+            return
+        self.set_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.write(prometheus_text())
+
+
+class AnalyzeHandler(BaseHandler):
+    async def post(self):
+        filename = self.get_query_argument("filename", None)
+        if filename is not None:
+            if not filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                raise tornado.web.HTTPError(415, reason="Supported files: PDF, DOCX, TXT")
+            job = (None, self.body, filename.lower())
+        else:
+            text = self.json_body().get("text")
+            if not isinstance(text, str) or not text.strip():
+                raise tornado.web.HTTPError(400, reason='"text" is required')
+            job = (text,)
+
+        try:
+            result = await self.in_processes(_extract_and_analyze, *job)
+        except ValueError as e:
+            raise tornado.web.HTTPError(422, reason=str(e))
+        self.write(result)
+
+
+class EnhanceHandler(BaseHandler):
+    async def post(self):
+        clauses = self.clauses_param(self.json_body())
+        analyses = await self.in_threads(llm.analyze_all_clauses_batch, clauses)
+        self.write({"analyses": analyses})
+
+
+class CompareHandler(BaseHandler):
+    async def post(self):
+        clauses = self.clauses_param(self.json_body())
+        comparisons = await self.in_threads(_compare, clauses)
+        self.write({"comparisons": comparisons})
+
+
+class ComplianceHandler(BaseHandler):
+    async def post(self):
+        body = self.json_body()
+        text = body.get("text")
+        if not isinstance(text, str) or not text.strip():
+            raise tornado.web.HTTPError(400, reason='"text" is required')
+        self.write(await self.in_threads(_compliance, text, str(body.get("contract_type", "Unknown"))))
+
+
+class ReportHandler(BaseHandler):
+    async def post(self):
+        body = self.json_body()
+        analysis = body.get("analysis")
+        if not isinstance(analysis, dict):
+            text = body.get("text")
+            if not isinstance(text, str) or not text.strip():
+                raise tornado.web.HTTPError(400, reason='"analysis" or "text" is required')
+            analysis = await self.in_processes(_extract_and_analyze, text)
+        pdf = await self.in_processes(_render_report, analysis)
+        self.set_header("Content-Type", "application/pdf")
+        self.set_header("Content-Disposition", 'attachment; filename="Contract_Risk_Report.pdf"')
+        self.write(pdf)
+
+
+# ═══════════════════════════════════════════════════════════════
+# SERVICE
+# ═══════════════════════════════════════════════════════════════
+
+class AnalysisService:
+    """
+    The worker pools shared by all handlers.
+
+    Args:
+        workers: Processes for keyword analysis and PDF rendering (default: CPU count)
+        llm_threads: Concurrent Claude requests
+    """
+
+    def __init__(self, workers=API_ANALYSIS_WORKERS, llm_threads=API_LLM_THREADS):
+        # Workers come from a forkserver, not a fork of this multithreaded process
+        self.processes = ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=pool_context())
+        self.threads = ThreadPoolExecutor(max_workers=llm_threads, thread_name_prefix="llm")
+        # Start the forkserver and a first worker now, so the first request doesn't wait for the imports
+        self.processes.submit(_warm_up).result()
+
+    def llm_mode(self):
+        if not llm.llm_configured():
+            return "unconfigured"
+        return "stub" if type(llm.client).__name__ == "StubLLMClient" else "anthropic"
+
+    def make_app(self):
+        routes = [
+            (r"/health", HealthHandler),
+            (r"/metrics", MetricsHandler),
+            (r"/v1/analyze", AnalyzeHandler),
+            (r"/v1/enhance", EnhanceHandler),
+            (r"/v1/compare", CompareHandler),
+            (r"/v1/compliance", ComplianceHandler),
+            (r"/v1/report", ReportHandler),
+        ]
+        return tornado.web.Application(
+            [(path, handler, {"service": self, "route": path}) for path, handler in routes],
+            default_handler_class=NotFoundHandler,
+            default_handler_args={"service": self, "route": "not_found"},
+        )
+
+    def shutdown(self):
+        self.processes.shutdown(cancel_futures=True)
+        self.threads.shutdown(cancel_futures=True)
+
+
+async def serve(host="127.0.0.1", port=API_PORT, workers=API_ANALYSIS_WORKERS, llm_threads=API_LLM_THREADS):
+    service = AnalysisService(workers, llm_threads)
+    server = HTTPServer(service.make_app())
+    server.listen(port, host)
+    print(f"Analysis API on http://{host}:{port} (LLM: {service.llm_mode()})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        server.stop()
+        service.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Contract analysis HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=API_ANALYSIS_WORKERS,
+                        help="Analysis processes (default: CPU count)")
+    parser.add_argument("--llm-threads", type=int, default=API_LLM_THREADS)
+    parser.add_argument("--stub-llm", action="store_true", help="Answer AI requests offline with StubLLMClient")
+    parser.add_argument("--stub-latency", type=float, default=0.5, help="Seconds per stub response")
+    args = parser.parse_args(argv)
+
+    if args.stub_llm:
+        from src.services.llm_stub import StubLLMClient
+        llm.set_client(StubLLMClient(latency=args.stub_latency))
+        llm.set_response_cache(None)  # Keep stub answers out of the real response cache
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.llm_threads))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,298 @@
+"""
+Audit Log - Append-only JSON Lines event log.
+
+Each event is one line, {"timestamp": ..., "event": ...} plus optional fields,
+so logging an event costs one append instead of rewriting the whole history.
+log_event() only queues the event; a background thread writes queued events in
+batches. Every batch is appended while holding an exclusive lock file, so
+several Streamlit sessions or worker processes can share one log without losing
+or interleaving lines. The log is rotated to `<path>.1`, `<path>.2`, ... once it
+grows past a size limit or its oldest event passes an age limit.
+
+read_events() streams events back oldest first, one line at a time, so
+filtering never loads the full history into memory.
+"""
+
+import atexit
 import json
+import os
+import queue
+import threading
+import time
 from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.config import (
+    AUDIT_LOG_PATH, AUDIT_LOG_MAX_BYTES, AUDIT_LOG_MAX_AGE_SECONDS, AUDIT_LOG_BACKUPS, AUDIT_LOG_FLUSH_SECONDS,
+    AUDIT_LOG_MAX_BATCH
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LEGACY_AUDIT_FILE = "data/audit_logs.json"  # old format: one JSON list, rewritten per event
 
-AUDIT_FILE = "data/audit_logs.json"
 
-def log_event(event):
+class _FileLock:
+    """Exclusive inter-process lock on `<path>.lock` (flock on POSIX, msvcrt on Windows)."""
+
+    def __init__(self, path: str):
+        self.path = path + ".lock"
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
     try:
-        with open(AUDIT_FILE, "r") as f:
-            data = json.load(f)
-    except:
-        data = []
-
-    data.append({
-        "timestamp": datetime.utcnow().isoformat(),
-        "event": event
-    })
-
-    with open(AUDIT_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class AuditLog:
+    """
+    Buffered, append-only JSON Lines audit log.
+
+    Args:
+        path: Log file (parent directories are created)
+        max_bytes: Rotate once the file is larger than this (None = never)
+        max_age_seconds: Rotate once the oldest event in the file is older than this (None = never)
+        backups: Rotated files to keep (`<path>.1` is the newest)
+        flush_seconds: Longest time an event waits for more events to share its append
+        max_batch: Events per append, at most
+    """
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None, max_age_seconds: Optional[float] = None,
+                 backups: int = 5, flush_seconds: float = 1.0, max_batch: int = 500):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.backups = backups
+        self.flush_seconds = flush_seconds
+        self.max_batch = max_batch
+        self.dropped = 0  # events lost to write errors
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._queue = queue.Queue()
+        self._lock = _FileLock(path)
+        self._started = False
+        self._start_lock = threading.Lock()
+
+    # ═══════════════════════════════════════════════════════════
+    # Writing
+    # ═══════════════════════════════════════════════════════════
+
+    def log(self, event: str, **fields: Any) -> None:
+        """Queues one event; returns without touching the disk."""
+        entry = {"timestamp": datetime.utcnow().isoformat(), "event": event}
+        entry.update(fields)
+        self._ensure_writer()
+        self._queue.put(entry)
+
+    def flush(self) -> None:
+        """Blocks until every event queued so far is on disk."""
+        if self._started:
+            self._queue.join()
+
+    def _ensure_writer(self) -> None:
+        if self._started:
+            return
+        with self._start_lock:
+            if not self._started:
+                threading.Thread(target=self._run, name="audit-log-writer", daemon=True).start()
+                atexit.register(self.flush)
+                self._started = True
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # Collect whatever else arrives within flush_seconds of the first event into the
+            # same append. The deadline is fixed, so steady traffic can't hold the batch back
+            deadline = time.monotonic() + self.flush_seconds
+            try:
+                while len(batch) < self.max_batch:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                pass
+
+            try:
+                self.write(batch)
+            except (OSError, TypeError, ValueError):
+                self.dropped += len(batch)  # Auditing must never take the app down
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def write(self, entries: List[Dict[str, Any]]) -> None:
+        """Appends entries synchronously (rotating first if needed). Used by the writer thread."""
+        with self._lock:
+            self._maybe_rotate()
+            self._append(entries)
+
+    def _append(self, entries: List[Dict[str, Any]]) -> None:
+        """Called with the file lock held."""
+        payload = "".join(json.dumps(entry, ensure_ascii=False, default=str) + "\n" for entry in entries)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _maybe_rotate(self) -> None:
+        """Called with the file lock held."""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size == 0:
+            return
+
+        too_big = self.max_bytes is not None and size > self.max_bytes
+        too_old = False
+        if not too_big and self.max_age_seconds is not None:
+            with open(self.path, encoding="utf-8") as f:
+                first = _parse_time(_load_line(f.readline()).get("timestamp"))
+            too_old = first is not None and (datetime.utcnow() - first).total_seconds() > self.max_age_seconds
+        if not (too_big or too_old):
+            return
+
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for n in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{n}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{n + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    # ═══════════════════════════════════════════════════════════
+    # Reading
+    # ═══════════════════════════════════════════════════════════
+
+    def files(self) -> List[str]:
+        """Existing log files, oldest first."""
+        rotated = [f"{self.path}.{n}" for n in range(self.backups, 0, -1)]
+        return [path for path in rotated + [self.path] if os.path.exists(path)]
+
+    def read_events(self, since: Optional[Any] = None, until: Optional[Any] = None,
+                    contains: Optional[str] = None, limit: Optional[int] = None,
+                    include_rotated: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Streams events oldest first.
+
+        Args:
+            since / until: datetime or ISO string bounds on the event timestamp
+            contains: Case-insensitive substring the event text must contain
+            limit: Stop after this many events
+            include_rotated: Also read the rotated files
+        """
+        since = _parse_time(since) if since is not None else None
+        until = _parse_time(until) if until is not None else None
+        needle = contains.lower() if contains else None
+        paths = self.files() if include_rotated else [p for p in [self.path] if os.path.exists(p)]
+
+        count = 0
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    entry = _load_line(line)
+                    if not entry:
+                        continue
+                    if since is not None or until is not None:
+                        stamp = _parse_time(entry.get("timestamp"))
+                        if stamp is None or (since and stamp < since) or (until and stamp > until):
+                            continue
+                    if needle and needle not in str(entry.get("event", "")).lower():
+                        continue
+                    yield entry
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
+
+    def migrate_legacy(self, legacy_path: str = LEGACY_AUDIT_FILE) -> int:
+        """
+        Appends the events of an old JSON-list audit file to this log and renames it
+        to `<legacy_path>.migrated`. Returns the number of events moved.
+        """
+        if not os.path.exists(legacy_path):
+            return 0
+        with self._lock:
+            # Another process may have migrated it while we waited for the lock
+            try:
+                with open(legacy_path, encoding="utf-8") as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                return 0
+            entries = [entry for entry in entries if isinstance(entry, dict)] if isinstance(entries, list) else []
+            if entries:
+                self._append(entries)
+            os.replace(legacy_path, legacy_path + ".migrated")
+        return len(entries)
+
+
+def _load_line(line: str) -> Dict[str, Any]:
+    """Parses one log line; a torn or corrupt line reads as {}."""
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return {}
+    return entry if isinstance(entry, dict) else {}
+
+
+_AUDIT_LOG = None
+_AUDIT_LOG_LOCK = threading.Lock()
+
+
+def get_audit_log() -> AuditLog:
+    """The shared audit log configured in src/config.py (old JSON-list logs are migrated once)."""
+    global _AUDIT_LOG
+    if _AUDIT_LOG is None:
+        with _AUDIT_LOG_LOCK:
+            if _AUDIT_LOG is None:
+                log = AuditLog(
+                    AUDIT_LOG_PATH,
+                    max_bytes=AUDIT_LOG_MAX_BYTES,
+                    max_age_seconds=AUDIT_LOG_MAX_AGE_SECONDS,
+                    backups=AUDIT_LOG_BACKUPS,
+                    flush_seconds=AUDIT_LOG_FLUSH_SECONDS,
+                    max_batch=AUDIT_LOG_MAX_BATCH,
+                )
+                log.migrate_legacy()
+                _AUDIT_LOG = log
+    return _AUDIT_LOG
+
+
+def log_event(event, **fields):
+    get_audit_log().log(event, **fields)
+
+
+def read_events(**filters) -> Iterator[Dict[str, Any]]:
+    """Streams events from the shared audit log (see AuditLog.read_events for filters)."""
+    get_audit_log().flush()
+    return get_audit_log().read_events(**filters)
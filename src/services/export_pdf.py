@@ -5,6 +5,9 @@ from reportlab.lib import colors
 from reportlab.lib.units import inch
 from datetime import datetime
 
+from src.utils.instrumentation import span
+
+@span("export_pdf.export_professional_report")
 def export_professional_report(filename, analysis_data):
     """
     Generates a professional PDF report with proper formatting.
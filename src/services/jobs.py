@@ -0,0 +1,210 @@
+"""
+Background Jobs - Runs slow Claude tasks off the Streamlit request thread.
+
+The keyword analysis finishes in about a second, but AI clause enhancement,
+the AI review of uncertain compliance findings and the decision summary each
+wait several seconds on Claude. submit_analysis_jobs() queues all three as soon as the fast analysis
+is done. A small thread pool runs them (they wait on the network, not the
+CPU), and each job records its state, progress and any partial results for
+the UI to poll:
+
+    queued -> running -> done | failed
+
+Jobs are keyed by contract text and task, so reruns and other sessions that
+analyze the same contract share one job instead of calling Claude again.
+Finished jobs are dropped after JOB_RETENTION_SECONDS.
+"""
+
+import hashlib
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from src.config import JOB_WORKERS, JOB_RETENTION_SECONDS
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+FINISHED_STATES = (DONE, FAILED)
+
+
+class Job:
+    """One background task. Read it through snapshot(); the worker thread updates it."""
+
+    def __init__(self, kind: str, key: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.key = key
+        self.state = QUEUED
+        self.progress = 0.0
+        self.message = "Waiting to start"
+        self.result = None
+        self.partial = {}  # results the task has published before finishing
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def update(self, progress: Optional[float] = None, message: Optional[str] = None,
+               partial: Optional[Dict] = None, **fields) -> None:
+        """Reports progress (0-1) from inside a task. `partial` entries are added to job.partial."""
+        with self._lock:
+            if progress is not None:
+                self.progress = min(max(progress, 0.0), 1.0)
+            if message is not None:
+                self.message = message
+            if partial:
+                self.partial.update(partial)
+            for name, value in fields.items():
+                setattr(self, name, value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "id": self.id,
+                "kind": self.kind,
+                "state": self.state,
+                "progress": self.progress,
+                "message": self.message,
+                "result": self.result,
+                "partial": dict(self.partial),
+                "error": self.error,
+                "created": self.created,
+                "finished": self.finished,
+            }
+
+
+class JobQueue:
+    """
+    In-process job queue over a thread pool.
+
+    Args:
+        workers: Tasks that run at the same time
+        retention_seconds: How long finished jobs stay available to poll
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, retention_seconds: float = JOB_RETENTION_SECONDS):
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}
+        self._by_key: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, fn: Callable[..., Any], *args, key: Optional[str] = None, **kwargs) -> str:
+        """
+        Queues fn(job, *args, **kwargs) and returns the job id. With a key, an
+        existing job for that key is reused unless it failed.
+        """
+        with self._lock:
+            self._prune()
+            if key is not None and key in self._by_key:
+                existing = self._jobs[self._by_key[key]]
+                if existing.state != FAILED:
+                    return existing.id
+            job = Job(kind, key)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._by_key[key] = job.id
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    def _run(self, job: Job, fn, args, kwargs) -> None:
+        job.update(state=RUNNING, message="Running")
+        try:
+            result = fn(job, *args, **kwargs)
+        except Exception as e:
+            job.update(state=FAILED, error=str(e), message=f"Failed: {e}", finished=time.time())
+        else:
+            job.update(1.0, "Done", state=DONE, result=result, finished=time.time())
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        for job_id, job in list(self._jobs.items()):
+            if job.finished is not None and job.finished < cutoff:
+                del self._jobs[job_id]
+                if job.key is not None and self._by_key.get(job.key) == job_id:
+                    del self._by_key[job.key]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of a job, or None if it is unknown or has expired."""
+        job = self._jobs.get(job_id)
+        return job.snapshot() if job is not None else None
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+_JOB_QUEUE = None
+_JOB_QUEUE_LOCK = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """The process-wide queue shared by all Streamlit sessions."""
+    global _JOB_QUEUE
+    if _JOB_QUEUE is None:
+        with _JOB_QUEUE_LOCK:
+            if _JOB_QUEUE is None:
+                _JOB_QUEUE = JobQueue()
+    return _JOB_QUEUE
+
+
+# ═══════════════════════════════════════════════════════════════
+# TASKS - the slow AI steps of a contract analysis
+# ═══════════════════════════════════════════════════════════════
+
+def enhance_clauses_task(job: Job, clauses: List[Dict]) -> List[Optional[Dict]]:
+    """
+    AI analysis per clause, in clause order (None where Claude returned nothing).
+    Each clause is published as partial {index: analysis} as soon as it arrives.
+    """
+    from src.services.llm import iter_clause_analyses
+
+    analyses = [None] * len(clauses)
+    for done, (idx, analysis) in enumerate(iter_clause_analyses(clauses, stream=True), 1):
+        analyses[idx] = analysis
+        job.update(done / len(clauses), f"Analyzed {done} of {len(clauses)} clauses", partial={idx: analysis})
+    return analyses
+
+
+def compliance_task(job: Job, text: str, contract_type: str, clauses: List[Dict]) -> Dict:
+    """Rule-based compliance report with uncertain findings reviewed by Claude."""
+    from src.engines.compliance_checker import check_compliance
+
+    job.update(message="Reviewing compliance findings with AI")
+    return check_compliance(text, contract_type, clauses, use_ai=True)
+
+
+def decision_summary_task(job: Job, text: str, decision: Dict, risk_profile: Dict) -> str:
+    from src.services.llm import generate_decision_summary
+
+    job.update(message="Writing decision summary")
+    return generate_decision_summary(text, decision, risk_profile)
+
+
+def submit_analysis_jobs(analysis: Dict, kinds=("enhance", "compliance", "decision_summary"),
+                         queue: Optional[JobQueue] = None) -> Dict[str, str]:
+    """
+    Queues the AI tasks for a finished keyword analysis (an
+    AnalysisResult.to_dict()). Returns {kind: job id} for the given kinds.
+    """
+    queue = queue or get_job_queue()
+    text = analysis["norm_text"]
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    jobs = {}
+    for kind in kinds:
+        if kind == "enhance":
+            args = ([{"text": r["text"], "type": r["type"]} for r in analysis["results"]],)
+            fn = enhance_clauses_task
+        elif kind == "compliance":
+            clauses = [{"id": r["id"], "text": r["text"]} for r in analysis["results"]]
+            args = (text, analysis["contract_type"], clauses)
+            fn = compliance_task
+        elif kind == "decision_summary":
+            # Plain copies: the session's results may be edited while the task runs
+            risk_profile = {"overall_risk": analysis["overall_risk"], "clauses": [dict(r) for r in analysis["results"]]}
+            args = (text, analysis["decision"], risk_profile)
+            fn = decision_summary_task
+        else:
+            raise ValueError(f"Unknown job kind: {kind}")
+        jobs[kind] = queue.submit(kind, fn, *args, key=f"{kind}:{digest}")
+    return jobs
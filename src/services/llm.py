@@ -1,42 +1,151 @@
-import anthropic
 import os
 import json
-
-client = anthropic.Anthropic(
-    api_key=os.getenv("ANTHROPIC_API_KEY"),
-    timeout=60.0  # Increased timeout for batch processing
+import queue
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from src.config import (
+    LLM_CACHE_PATH, LLM_CACHE_MAX_BYTES,
+    LLM_BATCH_MAX_CLAUSES, LLM_BATCH_INPUT_TOKENS, LLM_BATCH_CONCURRENCY, LLM_BATCH_RETRIES
 )
+from src.services.cache import SQLiteCache, make_key
+from src.services.llm_gateway import LLMGateway, make_anthropic_client, estimate_tokens
+from src.utils.instrumentation import count, span
+from src.utils.json_stream import JSONArrayStream
+
+client = make_anthropic_client(os.getenv("ANTHROPIC_API_KEY"))
+# Every request goes through the gateway: rate limits, retries, coalescing, metrics
+gateway = LLMGateway(client)
+
+MODEL = "claude-sonnet-4-20250514"
+
+_custom_client = False
+
 
-def analyze_all_clauses_batch(clauses_with_types):
+def set_client(new_client):
     """
-    BATCH PROCESSING: Analyze all clauses in a single Claude API call.
-    This is 5-10x faster than analyzing clauses one-by-one.
-    
-    Args:
-        clauses_with_types: List of dicts with 'text' and 'type' keys
-    
-    Returns:
-        List of analysis results matching the order of input clauses
+    Replaces the Anthropic client, e.g. with StubLLMClient from
+    src/services/llm_stub.py for offline runs and load tests. Anything with
+    messages.create() / messages.stream() like the SDK's works.
     """
-    
-    if not os.getenv("ANTHROPIC_API_KEY"):
-        # Return fallback for all clauses
-        return [{
-            "risk_level": "Unknown",
-            "business_consequences": ["⚠️ API key not configured"],
-            "specific_issues": [],
-            "plain_english": "API configuration required",
-            "standard_alternative": "Configure API key",
-            "negotiation_script": "",
-            "mitigation_strategies": []
-        } for _ in clauses_with_types]
-    
-    # Build batch prompt
+    global client, _custom_client
+    client = new_client
+    gateway.client = new_client
+    _custom_client = True
+
+
+def llm_configured():
+    """True if requests can be sent: an API key is set or a client was installed with set_client()."""
+    return _custom_client or bool(os.getenv("ANTHROPIC_API_KEY"))
+
+BATCH_SYSTEM = "You are a business advisor. Respond ONLY with valid JSON array. Analyze each clause for business impact."
+BATCH_MAX_TOKENS = 8000  # Larger for batch (per chunk)
+BATCH_TEMPERATURE = 0.2
+
+DIFF_BATCH_SYSTEM = "Business advisor for SMEs. Respond ONLY with valid JSON array. Compare each clause with its standard version."
+
+
+# ═══════════════════════════════════════════════════════════════
+# RESPONSE CACHE - identical requests are answered from disk
+# ═══════════════════════════════════════════════════════════════
+
+_response_cache = None
+_cache_configured = False
+
+
+def set_response_cache(cache):
+    """
+    Replaces the response cache. Any object with get(key) / set(key, value)
+    works; pass None to disable caching.
+    """
+    global _response_cache, _cache_configured
+    _response_cache = cache
+    _cache_configured = True
+
+
+def get_response_cache():
+    """The active response cache (a SQLiteCache under data/cache/ by default)."""
+    if not _cache_configured:
+        set_response_cache(_default_response_cache())
+    return _response_cache
+
+
+@lru_cache(maxsize=1)
+def _default_response_cache():
+    return SQLiteCache(LLM_CACHE_PATH, max_bytes=LLM_CACHE_MAX_BYTES)
+
+
+def response_cache_stats():
+    """Hit/miss counters and size of the response cache (empty dict if disabled)."""
+    cache = get_response_cache()
+    return cache.stats() if cache is not None and hasattr(cache, "stats") else {}
+
+
+def gateway_stats():
+    """Latency, retry, rate-limit and token counters of the shared LLM gateway."""
+    return gateway.stats()
+
+
+@span("llm.request")
+def _call_claude(system, prompt, max_tokens, temperature, model=MODEL):
+    return gateway.create_text(model, system, prompt, max_tokens, temperature)
+
+
+def _complete(system, prompt, max_tokens, temperature, parse=None, model=MODEL):
+    """
+    Returns parse(response text) for a single-turn request, served from the
+    response cache when the same (model, system, prompt, temperature, max_tokens)
+    was answered before. A response is only cached once parse() accepts it, so a
+    malformed answer is retried on the next call instead of being replayed.
+    """
+    parse = parse or (lambda text: text)
+    cache = get_response_cache()
+    key = make_key(model, system, prompt, temperature, max_tokens)
+
+    if cache is not None:
+        cached = cache.get(key)
+        count("llm.cache_hits" if cached is not None else "llm.cache_misses")
+        if cached is not None:
+            return parse(cached)
+
+    response_text = _call_claude(system, prompt, max_tokens, temperature, model)
+    result = parse(response_text)
+    if cache is not None:
+        cache.set(key, response_text)
+    return result
+
+
+def _incomplete_analysis():
+    return {
+        "risk_level": "Unknown",
+        "business_consequences": ["Analysis incomplete"],
+        "specific_issues": [],
+        "plain_english": "Analysis incomplete for this clause",
+        "standard_alternative": "Review manually",
+        "negotiation_script": "",
+        "mitigation_strategies": []
+    }
+
+
+def _failed_analysis(error):
+    return {
+        "risk_level": "Medium",
+        "business_consequences": [f"Batch analysis failed: {error}"],
+        "specific_issues": [],
+        "plain_english": "Analysis unavailable",
+        "standard_alternative": "Review manually",
+        "negotiation_script": "",
+        "mitigation_strategies": []
+    }
+
+
+def _batch_prompt(clauses_with_types):
     clauses_text = ""
     for idx, item in enumerate(clauses_with_types, 1):
         clauses_text += f"\n\n---CLAUSE {idx}---\nTYPE: {item['type']}\nTEXT: {item['text']}\n"
-    
-    prompt = f"""You are a business advisor for Indian SMEs. Analyze ALL the following contract clauses in ONE response.
+
+    return f"""You are a business advisor for Indian SMEs. Analyze ALL the following contract clauses in ONE response.
 
 {clauses_text}
 
@@ -71,52 +180,239 @@ Respond with ONLY valid JSON array (no markdown, no code blocks):
 
 CRITICAL: Return exactly {len(clauses_with_types)} analysis objects in the array, one per clause, in order."""
 
-    try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=8000,  # Larger for batch
-            temperature=0.2,
-            system="You are a business advisor. Respond ONLY with valid JSON array. Analyze each clause for business impact.",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        response_text = message.content[0].text.strip()
-        
-        # Extract JSON array
-        if "[" in response_text and "]" in response_text:
-            start = response_text.find("[")
-            end = response_text.rfind("]") + 1
-            json_str = response_text[start:end]
-            results = json.loads(json_str)
+
+def _chunk_clauses(clauses_with_types, indices):
+    """
+    Splits clause indices into chunks small enough that the prompt stays within
+    LLM_BATCH_INPUT_TOKENS and the answer fits in BATCH_MAX_TOKENS
+    (LLM_BATCH_MAX_CLAUSES analyses per response).
+    """
+    chunks = []
+    current = []
+    tokens = 0
+    for idx in indices:
+        cost = sum(estimate_tokens(str(value)) for value in clauses_with_types[idx].values()) + 20  # + headers
+        if current and (len(current) >= LLM_BATCH_MAX_CLAUSES or tokens + cost > LLM_BATCH_INPUT_TOKENS):
+            chunks.append(current)
+            current = []
+            tokens = 0
+        current.append(idx)
+        tokens += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _differences_prompt(pairs):
+    pairs_text = ""
+    for idx, item in enumerate(pairs, 1):
+        pairs_text += f"\n\n---CLAUSE {idx}---\nYOUR CLAUSE:\n{item['user_clause']}\n\nSTANDARD SAFE CLAUSE:\n{item['standard_clause']}\n"
+
+    return f"""Compare each of these clauses with its standard safe clause and explain the BUSINESS IMPACT of the differences:
+{pairs_text}
+
+Respond with ONLY valid JSON array (no markdown, no code blocks):
+[
+  {{
+    "clause_number": 1,
+    "differences": [
+      {{
+        "aspect": "what's different",
+        "your_version": "what yours says",
+        "standard_version": "what the safe version says",
+        "impact": "how this difference affects their business (be specific and concrete)"
+      }}
+    ],
+    "recommendation": "Clear action: 'Change X to Y' or 'This is acceptable as-is'"
+  }},
+  ... (one object per clause)
+]
+
+Focus on material differences that create business risk. Skip formatting differences.
+CRITICAL: Return exactly {len(pairs)} objects in the array, one per clause, in order."""
+
+
+def _failed_differences(error):
+    return {
+        "differences": [{"aspect": "Analysis unavailable", "impact": str(error)}],
+        "recommendation": "Manual review recommended"
+    }
+
+
+# How to batch one kind of per-item request: system prompt, prompt builder for a
+# list of items, response budget per chunk, and fallbacks for items that never
+# come back (incomplete()) or whose chunk kept failing (failed(error))
+BatchSpec = namedtuple("BatchSpec", ["system", "build_prompt", "max_tokens", "temperature", "incomplete", "failed"])
+
+CLAUSE_ANALYSIS_BATCH = BatchSpec(
+    BATCH_SYSTEM, _batch_prompt, BATCH_MAX_TOKENS, BATCH_TEMPERATURE, _incomplete_analysis, _failed_analysis
+)
+CLAUSE_DIFFERENCES_BATCH = BatchSpec(
+    DIFF_BATCH_SYSTEM, _differences_prompt, BATCH_MAX_TOKENS, 0.2,
+    lambda: _failed_differences("Comparison incomplete"), _failed_differences
+)
+
+
+def _analyze_chunk(batch, on_analysis, stream=False, spec=CLAUSE_ANALYSIS_BATCH):
+    """
+    One batch request. Calls on_analysis(clause_number, analysis) for each
+    analysis that comes back - as soon as its JSON object closes when streaming.
+    Clauses missing from a truncated response are simply never reported.
+    """
+    prompt = spec.build_prompt(batch)
+    parser = JSONArrayStream()
+    taken = set()
+    position = 0
+
+    def emit(analyses):
+        nonlocal position
+        for analysis in analyses:
+            position += 1
+            if not isinstance(analysis, dict):
+                continue
+            number = analysis.get("clause_number")
+            if not isinstance(number, int) or not 1 <= number <= len(batch) or number in taken:
+                number = position  # Fall back to array order
+            if 1 <= number <= len(batch) and number not in taken:
+                taken.add(number)
+                on_analysis(number, analysis)
+
+    if stream:
+        with span("llm.stream"):
+            for text in gateway.stream_text(MODEL, spec.system, prompt, spec.max_tokens, spec.temperature):
+                emit(parser.feed(text))
+    else:
+        emit(parser.feed(_call_claude(spec.system, prompt, spec.max_tokens, spec.temperature)))
+
+    if not parser.started:
+        raise ValueError("No JSON array found")
+
+
+def iter_clause_analyses(clauses_with_types, stream=False):
+    """
+    Yields (index, analysis) for every clause as soon as its analysis is ready:
+    cached clauses first, then each clause as its chunk answers (or, with
+    stream=True, as soon as its object arrives in the streamed response).
+
+    Clauses are split into token-budgeted chunks (so no response gets
+    truncated), up to LLM_BATCH_CONCURRENCY chunks run at once, and only clauses
+    whose chunk failed or came back incomplete are retried. Every index is
+    yielded exactly once; clauses that still fail get a fallback analysis.
+    """
+    return _iter_batch(clauses_with_types, CLAUSE_ANALYSIS_BATCH, stream)
+
+
+def _iter_batch(clauses_with_types, spec, stream=False):
+    """Chunked, cached, concurrent batch requests described by spec (see iter_clause_analyses)."""
+    # Per-item cache: each item is keyed on the prompt a batch of just that
+    # item would send, so only items never answered before go to the API
+    cache = get_response_cache()
+    keys = [
+        make_key(MODEL, spec.system, spec.build_prompt([item]), spec.temperature, spec.max_tokens)
+        for item in clauses_with_types
+    ]
+
+    indices_by_key = {}  # duplicate clauses are sent once and answered together
+    for idx, key in enumerate(keys):
+        indices_by_key.setdefault(key, []).append(idx)
+
+    def answer(key, analysis):
+        for idx in indices_by_key[key]:
+            result = dict(analysis)
+            result["clause_number"] = idx + 1  # Numbered by position in this request
+            yield idx, result
+
+    pending = []  # first index of each uncached clause
+    for key, indices in indices_by_key.items():
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            yield from answer(key, cached)
         else:
-            raise ValueError("No JSON array found")
-        
-        # Ensure we have results for all clauses
-        while len(results) < len(clauses_with_types):
-            results.append({
-                "risk_level": "Unknown",
-                "business_consequences": ["Analysis incomplete"],
-                "specific_issues": [],
-                "plain_english": "Analysis incomplete for this clause",
-                "standard_alternative": "Review manually",
-                "negotiation_script": "",
-                "mitigation_strategies": []
-            })
-        
-        return results[:len(clauses_with_types)]  # Trim if too many
-        
-    except Exception as e:
-        print(f"Batch analysis error: {e}")
+            pending.append(indices[0])
+    if cache is not None:
+        count("llm.cache_hits", len(indices_by_key) - len(pending))
+        count("llm.cache_misses", len(pending))
+
+    done = set()
+    errors = {}  # key -> last error for clauses whose chunk failed
+    for _attempt in range(LLM_BATCH_RETRIES + 1):
+        if not pending:
+            break
+        chunks = _chunk_clauses(clauses_with_types, pending)
+        events = queue.Queue()  # (idx, analysis) or (chunk, exception) from worker threads
+
+        def run(chunk):
+            batch = [clauses_with_types[idx] for idx in chunk]
+            try:
+                _analyze_chunk(batch, lambda number, analysis: events.put((chunk[number - 1], analysis)), stream, spec)
+            except Exception as e:
+                events.put((chunk, e))
+            events.put((chunk, None))  # chunk finished
+
+        with ThreadPoolExecutor(max_workers=min(LLM_BATCH_CONCURRENCY, len(chunks))) as pool:
+            for chunk in chunks:
+                pool.submit(run, chunk)
+
+            remaining_chunks = len(chunks)
+            while remaining_chunks:
+                item, payload = events.get()
+                if isinstance(item, list):
+                    if payload is None:
+                        remaining_chunks -= 1
+                    else:
+                        print(f"Batch analysis error: {payload}")
+                        for idx in item:
+                            if keys[idx] not in done:
+                                errors[keys[idx]] = str(payload)
+                    continue
+
+                key = keys[item]
+                if key in done:
+                    continue
+                done.add(key)
+                errors.pop(key, None)
+                if cache is not None:
+                    cache.set(key, payload)
+                yield from answer(key, payload)
+
+        pending = [idx for idx in pending if keys[idx] not in done]
+
+    for idx in pending:
+        key = keys[idx]
+        failed = spec.failed(errors[key]) if key in errors else spec.incomplete()
+        for dup in indices_by_key[key]:
+            yield dup, dict(failed)
+
+
+def analyze_all_clauses_batch(clauses_with_types, stream=False):
+    """
+    BATCH PROCESSING: Analyze all clauses with a few concurrent Claude API calls.
+    See iter_clause_analyses() for chunking, retries and streaming.
+    
+    Args:
+        clauses_with_types: List of dicts with 'text' and 'type' keys
+        stream: Use the streaming API (same results, available sooner per clause)
+    
+    Returns:
+        List of analysis results matching the order of input clauses
+    """
+    
+    if not llm_configured():
         # Return fallback for all clauses
         return [{
-            "risk_level": "Medium",
-            "business_consequences": [f"Batch analysis failed: {str(e)}"],
+            "risk_level": "Unknown",
+            "business_consequences": ["⚠️ API key not configured"],
             "specific_issues": [],
-            "plain_english": "Analysis unavailable",
-            "standard_alternative": "Review manually",
+            "plain_english": "API configuration required",
+            "standard_alternative": "Configure API key",
             "negotiation_script": "",
             "mitigation_strategies": []
         } for _ in clauses_with_types]
+    
+    results = [None] * len(clauses_with_types)
+    for idx, analysis in iter_clause_analyses(clauses_with_types, stream):
+        results[idx] = analysis
+    return results
 
 
 def analyze_clause_with_reasoning(clause_text, clause_type):
@@ -125,7 +421,7 @@ def analyze_clause_with_reasoning(clause_text, clause_type):
     For new code, use analyze_all_clauses_batch() instead.
     """
     
-    if not os.getenv("ANTHROPIC_API_KEY"):
+    if not llm_configured():
         return {
             "risk_level": "Unknown",
             "business_consequences": ["⚠️ API key not configured. Set ANTHROPIC_API_KEY environment variable."],
@@ -182,32 +478,32 @@ Respond with ONLY valid JSON (no markdown, no code blocks):
 
 CRITICAL: Everything must be DYNAMIC and based ONLY on the provided clause. Do not provide generic legal advice. Focus on concrete BUSINESS IMPACT and ACTIONABLE fixes. Use rupee amounts when possible."""
 
-    try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2000,
-            temperature=0.2,
-            system="You are a business advisor for Indian SMEs. Respond ONLY with valid JSON. Focus on document-specific business consequences and actionable mitigation, not legal jargon.",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        response_text = message.content[0].text.strip()
-        
+    def parse(response_text):
+        response_text = response_text.strip()
+
         # Robust JSON extraction
         if "{" in response_text and "}" in response_text:
             try:
                 start = response_text.find("{")
                 end = response_text.rfind("}") + 1
                 json_str = response_text[start:end]
-                result = json.loads(json_str)
+                return json.loads(json_str)
             except json.JSONDecodeError:
                 if response_text.startswith("```"):
                     response_text = response_text.split("```")[1]
                     if response_text.startswith("json"):
                         response_text = response_text[4:]
-                result = json.loads(response_text.strip())
-        else:
-            raise ValueError("No JSON object found in response")
+                return json.loads(response_text.strip())
+        raise ValueError("No JSON object found in response")
+
+    try:
+        result = _complete(
+            "You are a business advisor for Indian SMEs. Respond ONLY with valid JSON. Focus on document-specific business consequences and actionable mitigation, not legal jargon.",
+            prompt,
+            max_tokens=2000,
+            temperature=0.2,
+            parse=parse
+        )
         
         # Ensure all required fields exist
         if "business_consequences" not in result:
@@ -249,7 +545,7 @@ def generate_decision_summary(full_text, decision_data, risk_profile):
     Not just "here's what's in it" but "here's your action plan"
     """
     
-    if not os.getenv("ANTHROPIC_API_KEY"):
+    if not llm_configured():
         return "⚠️ API key not configured. Set ANTHROPIC_API_KEY to generate decision summaries."
     
     verdict = decision_data.get('verdict', 'UNKNOWN')
@@ -293,16 +589,13 @@ Write like you're their co-founder who's looking out for them. Be direct. Use "y
 If it's dangerous, be scary. If it's safe, be reassuring. Give them confidence to act."""
 
     try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
+        return _complete(
+            "You are a business advisor. Write decision-focused summaries that tell SME owners exactly what to do.",
+            prompt,
             max_tokens=1500,
-            temperature=0.3,
-            system="You are a business advisor. Write decision-focused summaries that tell SME owners exactly what to do.",
-            messages=[{"role": "user", "content": prompt}]
+            temperature=0.3
         )
         
-        return message.content[0].text
-        
     except Exception as e:
         return f"⚠️ Error generating summary: {str(e)}"
 
@@ -310,7 +603,7 @@ If it's dangerous, be scary. If it's safe, be reassuring. Give them confidence t
 def analyze_clause_differences(user_clause, standard_clause):
     """Uses Claude to identify semantic differences between user's clause and standard clause."""
     
-    if not os.getenv("ANTHROPIC_API_KEY"):
+    if not llm_configured():
         return {
             "differences": [{
                 "aspect": "Missing API Key",
@@ -343,22 +636,22 @@ JSON format:
 
 Focus on material differences that create business risk. Skip formatting differences."""
 
-    try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1000,
-            temperature=0.2,
-            system="Business advisor for SMEs. Respond with valid JSON only.",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        response_text = message.content[0].text.strip()
+    def parse(response_text):
+        response_text = response_text.strip()
         if "```" in response_text:
             response_text = response_text.split("```")[1]
             if response_text.startswith("json"):
                 response_text = response_text[4:]
-        
         return json.loads(response_text.strip())
+
+    try:
+        return _complete(
+            "Business advisor for SMEs. Respond with valid JSON only.",
+            prompt,
+            max_tokens=1000,
+            temperature=0.2,
+            parse=parse
+        )
         
     except Exception as e:
         return {
@@ -367,6 +660,27 @@ Focus on material differences that create business risk. Skip formatting differe
         }
 
 
+def analyze_clause_differences_batch(pairs):
+    """
+    Batched analyze_clause_differences(): compares many (user clause, standard
+    clause) pairs in a few concurrent requests, cached per pair.
+
+    Args:
+        pairs: List of dicts with 'user_clause' and 'standard_clause' keys
+
+    Returns:
+        List of {"differences": [...], "recommendation": ...} in input order
+    """
+    if not llm_configured():
+        return [analyze_clause_differences(p["user_clause"], p["standard_clause"]) for p in pairs]
+
+    results = [None] * len(pairs)
+    for idx, comparison in _iter_batch(pairs, CLAUSE_DIFFERENCES_BATCH):
+        comparison.pop("clause_number", None)
+        results[idx] = comparison
+    return results
+
+
 # Backward compatibility
 def generate_contract_summary(full_text, entities, risk_profile):
     """Legacy function - redirects to new decision-focused version"""
@@ -375,18 +689,11 @@ def generate_contract_summary(full_text, entities, risk_profile):
 
 def ask_llm(system_prompt, user_prompt):
     """Legacy simple LLM wrapper"""
-    if not os.getenv("ANTHROPIC_API_KEY"):
+    if not llm_configured():
         return "⚠️ API key not configured"
     
     try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1000,
-            temperature=0.3,
-            system=system_prompt,
-            messages=[{"role": "user", "content": user_prompt}]
-        )
-        return message.content[0].text
+        return _complete(system_prompt, user_prompt, max_tokens=1000, temperature=0.3)
     except Exception as e:
         return f"⚠️ AI Service Unavailable: {str(e)}"
 
@@ -396,7 +703,7 @@ def analyze_compliance_with_ai(contract_text, contract_type):
     of Indian law based on the actual contract language.
     """
     
-    if not os.getenv("ANTHROPIC_API_KEY"):
+    if not llm_configured():
         return {
             "overall_status": "Unknown",
             "violations": [],
@@ -436,21 +743,22 @@ Respond with ONLY valid JSON:
 
 CRITICAL: Only identify violations and warnings that actually appear in this text. If it is fully compliant, say so."""
 
-    try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1500,
-            temperature=0.2,
-            system="Indian legal compliance expert. Respond with valid JSON only.",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        response_text = message.content[0].text.strip()
+    def parse(response_text):
+        response_text = response_text.strip()
         if "{" in response_text and "}" in response_text:
             start = response_text.find("{")
             end = response_text.rfind("}") + 1
             return json.loads(response_text[start:end])
         return json.loads(response_text)
+
+    try:
+        return _complete(
+            "Indian legal compliance expert. Respond with valid JSON only.",
+            prompt,
+            max_tokens=1500,
+            temperature=0.2,
+            parse=parse
+        )
         
     except Exception as e:
         print(f"Compliance AI Error: {e}")
@@ -0,0 +1,285 @@
+"""
+LLM Gateway - One shared, rate-limited path for every Claude request.
+
+All requests from src/services/llm.py (Streamlit sessions, background jobs
+and API threads alike) go through a single LLMGateway, which:
+
+- reuses HTTPS connections from one tuned httpx pool (make_anthropic_client)
+- waits on token buckets for requests/min, input tokens/min and output
+  tokens/min, so bursts are spread out instead of answered with 429s
+- retries 429/529/5xx, timeouts and connection errors with exponential
+  backoff and full jitter, and never retries sooner than a retry-after header
+- coalesces identical in-flight requests, so concurrent callers of the same
+  prompt share one API call
+- records latency, retries, rate-limit waits and token usage (stats())
+
+The gateway wraps any client with the SDK's messages.create() /
+messages.stream() (e.g. StubLLMClient).
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, Iterator, Optional
+
+import anthropic
+import httpx
+
+from src.config import (
+    LLM_MAX_CONNECTIONS, LLM_KEEPALIVE_CONNECTIONS, LLM_CONNECT_TIMEOUT, LLM_READ_TIMEOUT,
+    LLM_REQUESTS_PER_MINUTE, LLM_INPUT_TOKENS_PER_MINUTE, LLM_OUTPUT_TOKENS_PER_MINUTE,
+    LLM_MAX_RETRIES, LLM_BACKOFF_BASE_SECONDS, LLM_BACKOFF_MAX_SECONDS,
+)
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+LATENCY_WINDOW = 500  # recent requests kept for latency percentiles
+
+
+def make_anthropic_client(api_key: Optional[str]) -> anthropic.Anthropic:
+    """Anthropic client over a shared keep-alive connection pool. Retries are left to the gateway."""
+    http_client = httpx.Client(
+        limits=httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_KEEPALIVE_CONNECTIONS),
+        timeout=httpx.Timeout(LLM_READ_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+    )
+    return anthropic.Anthropic(
+        api_key=api_key,
+        http_client=http_client,
+        timeout=httpx.Timeout(LLM_READ_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+        max_retries=0,
+    )
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English)."""
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at `per_minute` / 60 per second.
+
+    take() may drive the level below zero (e.g. output tokens are only known
+    after a response), which delays the next acquire() until it is repaid.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float) -> float:
+        """Blocks until `amount` is available and takes it. Returns seconds waited."""
+        amount = min(amount, self.capacity)  # a request larger than the bucket waits for a full one
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.level >= amount:
+                    self.level -= amount
+                    return waited
+                delay = (amount - self.level) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def take(self, amount: float) -> None:
+        """Takes `amount` without waiting (negative amounts give tokens back)."""
+        with self._lock:
+            self._refill()
+            self.level = min(self.capacity, self.level - amount)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from a retry-after header on an API error, if it has one."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (anthropic.APITimeoutError, anthropic.APIConnectionError)):
+        return True
+    return isinstance(error, anthropic.APIStatusError) and error.status_code in RETRYABLE_STATUS
+
+
+class LLMGateway:
+    """
+    Rate-limited, retrying, coalescing front for a messages client.
+
+    Args:
+        client: anthropic.Anthropic (see make_anthropic_client) or a stand-in
+        requests_per_minute / input_tokens_per_minute / output_tokens_per_minute: Account rate limits
+        max_retries: Extra attempts for retryable errors
+    """
+
+    def __init__(self, client, requests_per_minute=LLM_REQUESTS_PER_MINUTE,
+                 input_tokens_per_minute=LLM_INPUT_TOKENS_PER_MINUTE,
+                 output_tokens_per_minute=LLM_OUTPUT_TOKENS_PER_MINUTE,
+                 max_retries=LLM_MAX_RETRIES, backoff_base=LLM_BACKOFF_BASE_SECONDS,
+                 backoff_max=LLM_BACKOFF_MAX_SECONDS):
+        self.client = client
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._requests = TokenBucket(requests_per_minute)
+        self._input_tokens = TokenBucket(input_tokens_per_minute)
+        self._output_tokens = TokenBucket(output_tokens_per_minute)
+        self._in_flight: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._counters = {
+            "requests": 0, "errors": 0, "retries": 0, "coalesced": 0,
+            "rate_limited": 0, "throttle_seconds": 0.0, "input_tokens": 0, "output_tokens": 0,
+        }
+
+    # ═══════════════════════════════════════════════════════════
+    # Scheduling
+    # ═══════════════════════════════════════════════════════════
+
+    def _count(self, **increments) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                self._counters[name] += value
+
+    def _throttle(self, estimated_input: int) -> None:
+        waited = self._requests.acquire(1) + self._input_tokens.acquire(estimated_input)
+        # Output tokens are charged after the response; wait here while the bucket is in debt
+        waited += self._output_tokens.acquire(0)
+        if waited:
+            self._count(throttle_seconds=waited)
+
+    def _record_usage(self, usage, estimated_input: int) -> None:
+        input_tokens = getattr(usage, "input_tokens", None) or estimated_input
+        output_tokens = getattr(usage, "output_tokens", None) or 0
+        self._input_tokens.take(input_tokens - estimated_input)
+        self._output_tokens.take(output_tokens)
+        self._count(input_tokens=input_tokens, output_tokens=output_tokens)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's retry-after."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _with_retries(self, send, estimated_input: int):
+        """Calls send() after throttling, retrying retryable errors."""
+        for attempt in range(self.max_retries + 1):
+            self._throttle(estimated_input)
+            started = time.perf_counter()
+            try:
+                result = send()
+            except Exception as e:
+                self._count(errors=1)
+                if isinstance(e, anthropic.RateLimitError):
+                    self._count(rate_limited=1)
+                if attempt == self.max_retries or not _is_retryable(e):
+                    raise
+                self._count(retries=1)
+                time.sleep(self._backoff(attempt, e))
+                continue
+            with self._lock:
+                self._latencies.append(time.perf_counter() - started)
+                self._counters["requests"] += 1
+            return result
+
+    # ═══════════════════════════════════════════════════════════
+    # Requests
+    # ═══════════════════════════════════════════════════════════
+
+    def create_text(self, model: str, system: str, prompt: str, max_tokens: int, temperature: float) -> str:
+        """
+        Text of a single-turn completion. Identical requests already in flight
+        wait for that call instead of sending their own.
+        """
+        key = (model, system, prompt, max_tokens, temperature)
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self._counters["coalesced"] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            estimated_input = estimate_tokens(system) + estimate_tokens(prompt)
+            message = self._with_retries(lambda: self.client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=system,
+                messages=[{"role": "user", "content": prompt}]
+            ), estimated_input)
+            self._record_usage(getattr(message, "usage", None), estimated_input)
+            text = message.content[0].text
+            future.set_result(text)
+            return text
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def stream_text(self, model: str, system: str, prompt: str, max_tokens: int, temperature: float) -> Iterator[str]:
+        """
+        Yields response text as it streams. Opening the stream is retried like
+        create_text(); an error after the first chunk is raised to the caller,
+        since the text already yielded can't be taken back.
+        """
+        estimated_input = estimate_tokens(system) + estimate_tokens(prompt)
+
+        def open_stream():
+            manager = self.client.messages.stream(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=system,
+                messages=[{"role": "user", "content": prompt}]
+            )
+            stream = manager.__enter__()
+            try:
+                chunks = iter(stream.text_stream)
+                first = next(chunks, None)  # connection and status errors surface here
+            except BaseException:
+                manager.__exit__(None, None, None)
+                raise
+            return manager, stream, chunks, first
+
+        manager, stream, chunks, first = self._with_retries(open_stream, estimated_input)
+        try:
+            if first is not None:
+                yield first
+            yield from chunks
+            final = stream.get_final_message() if hasattr(stream, "get_final_message") else None
+            self._record_usage(getattr(final, "usage", None), estimated_input)
+        finally:
+            manager.__exit__(None, None, None)
+
+    def stats(self) -> Dict:
+        """Counters plus latency percentiles (seconds) over the last LATENCY_WINDOW requests."""
+        with self._lock:
+            stats = dict(self._counters)
+            latencies = sorted(self._latencies)
+        stats["throttle_seconds"] = round(stats["throttle_seconds"], 3)
+        if latencies:
+            stats["latency_p50"] = round(latencies[len(latencies) // 2], 3)
+            stats["latency_p95"] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3)
+            stats["latency_max"] = round(latencies[-1], 3)
+        return stats
@@ -0,0 +1,141 @@
+"""
+Offline Stub LLM - Stands in for the Anthropic client without network access.
+
+StubLLMClient answers messages.create() and messages.stream() with responses
+shaped like Claude's for every prompt in src/services/llm.py (batch clause
+analyses, clause comparisons, compliance reports, decision summaries). Risk
+levels come from the keyword risk engine, so results stay plausible. Latency
+is simulated, so the API service and UI can be load-tested locally:
+
+    from src.services import llm
+    from src.services.llm_stub import StubLLMClient
+    llm.set_client(StubLLMClient(latency=0.5))
+"""
+
+import json
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+from src.engines.risk_engine import assess_risk_with_explanation
+
+_CLAUSE_BLOCK = re.compile(r"---CLAUSE (\d+)---\n(.*?)(?=\n\n---CLAUSE \d+---|\n\nRespond with ONLY)", re.S)
+_TEXT_FIELD = re.compile(r"TEXT: (.*)", re.S)
+_USER_CLAUSE = re.compile(r"YOUR CLAUSE:\n(.*?)\n\nSTANDARD SAFE CLAUSE:", re.S)
+
+
+def _clause_analysis(number, text):
+    risk = assess_risk_with_explanation(text)
+    keywords = [t["keyword"] for t in risk["triggers"]]
+    return {
+        "clause_number": number,
+        "risk_level": risk["risk"],
+        "business_consequences": [f"'{kw}' could be used against you" for kw in keywords[:2]] or ["No material exposure found"],
+        "mitigation_strategies": [{
+            "name": f"Limit '{kw}'",
+            "action": f"Ask to qualify or remove '{kw}'",
+            "clause_example": f"... subject to mutual written agreement (replacing '{kw}') ...",
+            "timeline": "Before signing",
+            "priority": "High" if risk["risk"] == "High" else "Medium",
+        } for kw in keywords[:1]],
+        "specific_issues": [{"phrase": kw, "why_dangerous": "Shifts risk to you", "example_scenario": "Stub scenario"}
+                            for kw in keywords[:2]],
+        "plain_english": f"[stub] {risk['summary']}.",
+        "standard_alternative": "[stub] A balanced version of this clause.",
+        "negotiation_script": "[stub] Could we make this obligation mutual?" if keywords else "",
+    }
+
+
+def _respond(system, prompt):
+    """Response text for one request, dispatched on the prompt's shape."""
+    if "STANDARD SAFE CLAUSE" in prompt and "---CLAUSE" in prompt:
+        return json.dumps([
+            {
+                "clause_number": int(number),
+                "differences": [{
+                    "aspect": "Scope",
+                    "your_version": body.split("\n", 2)[1][:80] if "\n" in body else body[:80],
+                    "standard_version": "Standard safe wording",
+                    "impact": "[stub] Broader obligations than the standard clause.",
+                }],
+                "recommendation": "[stub] Align with the standard clause.",
+            }
+            for number, body in _CLAUSE_BLOCK.findall(prompt)
+        ], indent=2)
+    if "---CLAUSE" in prompt:
+        analyses = []
+        for number, body in _CLAUSE_BLOCK.findall(prompt):
+            match = _TEXT_FIELD.search(body)
+            analyses.append(_clause_analysis(int(number), match.group(1).strip() if match else body))
+        return json.dumps(analyses, indent=2)
+    if "STANDARD SAFE CLAUSE" in prompt:
+        match = _USER_CLAUSE.search(prompt)
+        return json.dumps({
+            "differences": [{"aspect": "Scope", "your_version": (match.group(1) if match else "")[:80],
+                             "standard_version": "Standard safe wording",
+                             "impact": "[stub] Broader obligations than the standard clause."}],
+            "recommendation": "[stub] Align with the standard clause.",
+        })
+    if "compliance" in system.lower():
+        return json.dumps({
+            "overall_status": "Needs Review",
+            "violations": [],
+            "warnings": [{"law": "Indian Contract Act 1872", "issue": "[stub] Review restrictive covenants.",
+                          "severity": "Medium", "recommendation": "[stub] Confirm enforceability under Section 27."}],
+        })
+    if "Respond with valid JSON only" in system:
+        return json.dumps(_clause_analysis(1, prompt))
+    return ("**🎯 Bottom Line:** [stub] Negotiate before signing.\n\n"
+            "**⚠️ Critical Issues:**\n- [stub] One-sided termination\n- [stub] Uncapped liability\n")
+
+
+class _Stream:
+    def __init__(self, text, delay):
+        self._text = text
+        self._delay = delay
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        for start in range(0, len(self._text), 64):
+            time.sleep(self._delay)
+            yield self._text[start:start + 64]
+
+
+class StubLLMClient:
+    """
+    Drop-in for anthropic.Anthropic() in src/services/llm.py.
+
+    Args:
+        latency: Seconds before a create() response (spread over the chunks when streaming)
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.messages = SimpleNamespace(create=self._create, stream=self._stream)
+
+    def _count(self):
+        with self._lock:
+            self.calls += 1
+
+    def _create(self, system="", messages=(), **kwargs):
+        self._count()
+        time.sleep(self.latency)
+        prompt = messages[0]["content"]
+        text = _respond(system, prompt)
+        usage = SimpleNamespace(input_tokens=(len(system) + len(prompt)) // 4 + 1, output_tokens=len(text) // 4 + 1)
+        return SimpleNamespace(content=[SimpleNamespace(text=text)], stop_reason="end_turn", usage=usage)
+
+    def _stream(self, system="", messages=(), **kwargs):
+        self._count()
+        text = _respond(system, messages[0]["content"])
+        chunks = max(1, len(text) // 64)
+        return _Stream(text, self.latency / chunks)
@@ -3,9 +3,16 @@ Multilingual support for Hindi contracts.
 Uses IndicTrans2 approach with transliteration and translation.
 """
 
+import json
+import os
 import re
+from functools import lru_cache
 from typing import Dict, Tuple
 
+from src.config import HINDI_DICT_PATH
+from src.utils.keyword_matcher import get_keyword_matcher, build_trie_pattern
+from src.utils.scripts import script_profile, script_share
+
 # Hindi legal terminology mapping (Devanagari → English)
 HINDI_LEGAL_DICT = {
     # Contract terms
@@ -91,29 +98,136 @@ HINDI_RISK_KEYWORDS = {
 }
 
 
-def is_hindi(text: str) -> bool:
+def devanagari_counts(text: str) -> Tuple[int, int]:
+    """(Devanagari characters, non-whitespace characters) in text, counted exactly."""
+    profile = script_profile(text, sample=False)
+    return profile.counts["Devanagari"], profile.chars
+
+
+def is_hindi(text: str, sample: bool = None) -> bool:
     """
     Detects if text contains Hindi (Devanagari script).
     Returns True if >5% of characters are Devanagari.
+
+    The script profile is cached per text, so repeated checks of one contract
+    are free; very large texts are sampled (see src/utils/scripts.py).
     """
     if not text:
         return False
     
-    devanagari_count = 0
-    total_chars = 0
-    
-    for char in text:
-        if char.strip():  # Skip whitespace
-            total_chars += 1
-            # Devanagari Unicode range: U+0900 to U+097F
-            if '\u0900' <= char <= '\u097F':
-                devanagari_count += 1
-    
-    if total_chars == 0:
-        return False
-    
     # If more than 5% Devanagari characters, consider it Hindi
-    return (devanagari_count / total_chars) > 0.05
+    return script_share(text, "Devanagari", sample) > 0.05
+
+
+def load_hindi_dictionary(path: str) -> Dict[str, str]:
+    """
+    Reads extra Hindi -> English terms from a .json object or a UTF-8 .tsv
+    file with one "hindi<TAB>english" pair per line ('#' lines are comments).
+    """
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return {str(k).strip(): str(v).strip() for k, v in json.load(f).items() if str(k).strip()}
+
+    terms = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            hindi, _, english = line.rstrip("\n").partition("\t")
+            if hindi.strip() and english.strip():
+                terms[hindi.strip()] = english.strip()
+    return terms
+
+
+class HindiTranslator:
+    """
+    Dictionary translation in a single scan.
+
+    All terms are compiled into one trie-shaped regex, so each position of the
+    text is matched against the longest dictionary term starting there
+    ("पक्षकार" wins over "पक्ष") and the output is built in one re.sub() pass,
+    however many terms the dictionary has.
+    """
+
+    def __init__(self, dictionary: Dict[str, str]):
+        self.dictionary = dict(dictionary)
+        self._pattern = re.compile(build_trie_pattern(self.dictionary)) if self.dictionary else None
+        # term -> (Devanagari chars removed, non-space chars removed, non-space chars added)
+        self._weights = {
+            term: devanagari_counts(term) + (devanagari_counts(english)[1],)
+            for term, english in self.dictionary.items()
+        }
+
+    def translate(self, text: str, counts: Tuple[int, int] = None) -> Tuple[str, Dict]:
+        """
+        Returns (translated text, coverage stats). Stats count dictionary
+        replacements and how much of the Devanagari text they covered; they
+        are derived from the matched terms, so the output is never rescanned.
+
+        Args:
+            text: Text to translate
+            counts: devanagari_counts(text), if the caller already has them
+        """
+        devanagari, non_space = counts or devanagari_counts(text)
+        counts = {}
+
+        def replace(match):
+            term = match.group()
+            counts[term] = counts.get(term, 0) + 1
+            return self.dictionary[term]
+
+        translated = self._pattern.sub(replace, text) if self._pattern is not None else text
+
+        covered = removed = added = 0
+        for term, count in counts.items():
+            term_devanagari, term_removed, term_added = self._weights[term]
+            covered += term_devanagari * count
+            removed += term_removed * count
+            added += term_added * count
+
+        stats = {
+            "dictionary_terms": len(self.dictionary),
+            "terms_matched": len(counts),
+            "replacements": sum(counts.values()),
+            "devanagari_chars": devanagari,
+            "devanagari_translated": covered,
+            "coverage": round(covered / devanagari, 4) if devanagari else 1.0,
+            # Devanagari share of the output, for the same >5% test as is_hindi()
+            "remaining_devanagari_ratio": round((devanagari - covered) / (non_space - removed + added), 4)
+            if non_space - removed + added else 0.0,
+            "top_terms": sorted(counts.items(), key=lambda item: -item[1])[:10],
+        }
+        return translated, stats
+
+
+@lru_cache(maxsize=1)
+def get_hindi_translator() -> HindiTranslator:
+    """Translator over HINDI_LEGAL_DICT plus the terms in HINDI_DICT_PATH, if that file exists."""
+    dictionary = dict(HINDI_LEGAL_DICT)
+    if HINDI_DICT_PATH and os.path.exists(HINDI_DICT_PATH):
+        dictionary.update(load_hindi_dictionary(HINDI_DICT_PATH))
+    return HindiTranslator(dictionary)
+
+
+def translate_hindi_with_stats(text: str) -> Tuple[str, Dict]:
+    """
+    translate_hindi_to_english() plus the translator's coverage stats
+    (None if the text isn't Hindi).
+    """
+    # The same check as is_hindi(), so both agree on sampled texts. Below
+    # SCRIPT_SAMPLE_MIN_CHARS the exact counts are its cached profile.
+    if not is_hindi(text):
+        return text, None
+
+    translated, stats = get_hindi_translator().translate(text, devanagari_counts(text))
+
+    # For demo purposes, if we still have significant Devanagari,
+    # we'll use a transliteration approach
+    if stats["remaining_devanagari_ratio"] > 0.05:
+        # Keep Hindi text but mark it as needing translation
+        return f"[Hindi Contract - Partial Translation]\n{translated}", stats
+
+    return translated, stats
 
 
 def translate_hindi_to_english(text: str) -> str:
@@ -121,7 +235,7 @@ def translate_hindi_to_english(text: str) -> str:
     Translates Hindi contract text to English for processing.
     
     Strategy:
-    1. Replace Hindi legal terms with English equivalents
+    1. Replace Hindi legal terms with English equivalents (longest match, one pass)
     2. Keep numbers and Latin script as-is
     3. Use Google Translate API fallback (if available)
     
@@ -130,24 +244,7 @@ def translate_hindi_to_english(text: str) -> str:
     - Or Google Cloud Translation API
     - Or Azure Translator
     """
-    
-    if not is_hindi(text):
-        return text
-    
-    # Start with original text
-    translated = text
-    
-    # Replace known Hindi legal terms
-    for hindi_term, english_term in HINDI_LEGAL_DICT.items():
-        translated = translated.replace(hindi_term, english_term)
-    
-    # For demo purposes, if we still have significant Devanagari,
-    # we'll use a transliteration approach
-    if is_hindi(translated):
-        # Keep Hindi text but mark it as needing translation
-        return f"[Hindi Contract - Partial Translation]\n{translated}"
-    
-    return translated
+    return translate_hindi_with_stats(text)[0]
 
 
 def detect_hindi_risk_keywords(text: str) -> Dict[str, list]:
@@ -155,12 +252,12 @@ def detect_hindi_risk_keywords(text: str) -> Dict[str, list]:
     Detects high-risk keywords in Hindi text.
     Returns dict of risk levels and found keywords.
     """
+    hits = get_keyword_matcher().first_hits(text, tables=["hindi_risk"])
     found_risks = {"High": [], "Medium": []}
     
     for risk_level, keywords in HINDI_RISK_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in text:
-                found_risks[risk_level].append(keyword)
+        found = hits.get(("hindi_risk", risk_level), {})
+        found_risks[risk_level] = [keyword for keyword in keywords if keyword in found]
     
     return found_risks
 
@@ -181,12 +278,13 @@ def normalize_hindi_contract(text: str) -> Tuple[str, Dict]:
     hindi_risks = detect_hindi_risk_keywords(text)
     
     # Translate to English
-    translated = translate_hindi_to_english(text)
+    translated, coverage = translate_hindi_with_stats(text)
     
     metadata = {
         "is_hindi": True,
         "translation_method": "dictionary_based",
         "hindi_risk_keywords_found": hindi_risks,
+        "coverage": coverage,
         "note": "Dictionary-based translation for demo. Production would use IndicTrans2 or Google Translate API."
     }
     
@@ -1,147 +1,229 @@
 import re
-import streamlit as st
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Union
 
-def extract_entities(text):
-    """
-    Enhanced NER: Extracts 12+ entity types from contracts using Regex Patterns.
-    Pure Python implementation optimized for cloud deployment.
-    """
-    entities = {
-        # Original 4 types
-        "Parties (ORG)": set(),
-        "Dates": set(),
-        "Amounts": set(),
-        "Jurisdiction (GPE)": set(),
-        
-        # NEW: 8+ additional types
-        "Deliverables": set(),
-        "Performance Metrics (SLAs)": set(),
-        "Timeline Milestones": set(),
-        "IP Ownership": set(),
-        "Confidentiality Scope": set(),
-        "Notice Periods": set(),
-        "Termination Conditions": set(),
-        "Liability Caps": set()
-    }
-
-    # Regex Extraction Logic
-    
+from src.utils.instrumentation import span
+
+# Output order of entity types
+ENTITY_TYPES = [
+    # Original 4 types
+    "Parties (ORG)",
+    "Dates",
+    "Amounts",
+    "Jurisdiction (GPE)",
+
+    # NEW: 8+ additional types
+    "Deliverables",
+    "Performance Metrics (SLAs)",
+    "Timeline Milestones",
+    "IP Ownership",
+    "Confidentiality Scope",
+    "Notice Periods",
+    "Termination Conditions",
+    "Liability Caps"
+]
+
+# Longest free-text gap the jurisdiction/termination patterns will bridge.
+# Unbounded lazy gaps (.*?) rescan the rest of the line for every candidate start.
+MAX_GAP_CHARS = 200
+
+# Streaming mode: text is scanned in windows of STREAM_WINDOW_CHARS that overlap
+# by STREAM_OVERLAP_CHARS, so entities shorter than the overlap are never split
+STREAM_WINDOW_CHARS = 64 * 1024
+STREAM_OVERLAP_CHARS = 2048
+
+# format(match) -> values to add; first_only rules stop after their first match (re.search)
+EntityRule = namedtuple("EntityRule", ["entity_type", "pattern", "format", "first_only"])
+
+
+def _rule(entity_type, pattern, fmt, first_only=False):
+    return EntityRule(entity_type, re.compile(pattern, re.IGNORECASE), fmt, first_only)
+
+
+def _whole(m):
+    return [m.group()]
+
+
+def _group(m):
+    return [m.group(1)]
+
+
+def _stripped(m):
+    return [m.group(1).strip()]
+
+
+def _stripped_100(m):
+    return [m.group(1).strip()[:100]]  # Limit length
+
+
+def _milestone(m):
+    if m.re.groups > 1:
+        return [f"{m.group(1)} - {m.group(2)}"]
+    return [m.group(1)[:80]]
+
+
+def _notice(m):
+    return [f"{m.group(1)} notice"]
+
+
+def _parties(m):
+    return [m.group(1).strip(), m.group(2).strip()]
+
+
+_GAP = r"[^\n]{0,%d}?" % MAX_GAP_CHARS
+
+ENTITY_RULES: List[EntityRule] = [
     # 1. Dates
-    date_matches = re.findall(r"\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December),?\s+\d{4}|\d{2}/\d{2}/\d{4}", text, re.IGNORECASE)
-    entities["Dates"].update(date_matches)
-    
+    _rule("Dates", r"\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December),?\s+\d{4}|\d{2}/\d{2}/\d{4}", _whole),
+
     # 2. Amounts
     # Matches ₹ or Rs. followed by numbers
-    amount_matches = re.findall(r"(?:Rs\.?|INR|₹|USD|\$)\s?[\d,]+(?:\.\d{2})?(?:/-)?(?:\s+(?:Lakh|Crore|Million|Billion))?", text, re.IGNORECASE)
-    entities["Amounts"].update(amount_matches)
+    _rule("Amounts", r"(?:Rs\.?|INR|₹|USD|\$)\s?[\d,]+(?:\.\d{2})?(?:/-)?(?:\s+(?:Lakh|Crore|Million|Billion))?", _whole),
 
     # 3. Parties (Heuristic Capitalization)
     # Looking for "Between [X] and [Y]" patterns commonly found in contracts
-    parties_pattern = r"BETWEEN\s+([A-Z][a-zA-Z0-9\s\.,]+?)\s+(?:AND|&)\s+([A-Z][a-zA-Z0-9\s\.,]+?)\s+(?:WHEREAS|dated|collected)"
-    parties_match = re.search(parties_pattern, text, re.IGNORECASE)
-    if parties_match:
-         entities["Parties (ORG)"].add(parties_match.group(1).strip())
-         entities["Parties (ORG)"].add(parties_match.group(2).strip())
+    _rule("Parties (ORG)", r"BETWEEN\s+([A-Z][a-zA-Z0-9\s\.,]+?)\s+(?:AND|&)\s+([A-Z][a-zA-Z0-9\s\.,]+?)\s+(?:WHEREAS|dated|collected)", _parties, first_only=True),
 
     # 4. Jurisdiction
-    jurisdiction_pattern = r"(?:subject to|governed by).*?jurisdiction.*?courts.*?in\s+([A-Z][a-zA-Z\s]+)"
-    gpe_match = re.findall(jurisdiction_pattern, text, re.IGNORECASE)
-    entities["Jurisdiction (GPE)"].update([g.strip() for g in gpe_match])
+    # Each keyword is taken at its first occurrence (atomic groups), so a failed
+    # candidate is abandoned after one bounded pass instead of backtracking
+    _rule("Jurisdiction (GPE)", r"(?:subject to|governed by)(?>" + _GAP + r"jurisdiction)(?>" + _GAP + r"courts)" + _GAP + r"in\s+([A-Z][a-zA-Z\s]+)", _stripped),
 
     # ===================================================================
     # NEW ENTITY EXTRACTIONS
     # ===================================================================
-    
+
     # 1. Deliverables
-    deliverable_patterns = [
-        r"deliver(?:able)?s?:?\s+([^\.;]+)",
-        r"(?:shall|will|must)\s+(?:provide|deliver|furnish)\s+([^\.;]+)",
-        r"work product(?:\s+includes?)?:?\s+([^\.;]+)"
-    ]
-    for pattern in deliverable_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        entities["Deliverables"].update([m.strip()[:100] for m in matches])  # Limit length
-    
+    _rule("Deliverables", r"deliver(?:able)?s?:?\s+([^\.;]+)", _stripped_100),
+    _rule("Deliverables", r"(?:shall|will|must)\s+(?:provide|deliver|furnish)\s+([^\.;]+)", _stripped_100),
+    _rule("Deliverables", r"work product(?:\s+includes?)?:?\s+([^\.;]+)", _stripped_100),
+
     # 2. Performance Metrics / SLAs
-    sla_patterns = [
-        r"(\d+%)\s+(?:uptime|availability)",
-        r"(?:response time|turnaround time)(?:\s+of)?\s+(\d+\s+(?:hours?|days?|minutes?))",
-        r"(?:SLA|service level):\s+([^\.;]+)",
-        r"(\d+)\s+(?:business days?|working days?)"
-    ]
-    for pattern in sla_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
-            entities["Performance Metrics (SLAs)"].add(match if isinstance(match, str) else str(match))
-    
+    _rule("Performance Metrics (SLAs)", r"(\d+%)\s+(?:uptime|availability)", _group),
+    _rule("Performance Metrics (SLAs)", r"(?:response time|turnaround time)(?:\s+of)?\s+(\d+\s+(?:hours?|days?|minutes?))", _group),
+    _rule("Performance Metrics (SLAs)", r"(?:SLA|service level):\s+([^\.;]+)", _group),
+    _rule("Performance Metrics (SLAs)", r"(\d+)\s+(?:business days?|working days?)", _group),
+
     # 3. Timeline Milestones
-    milestone_patterns = [
-        r"milestone\s+\d+:?\s+([^\.;]+)",
-        r"(?:phase|stage)\s+\d+:?\s+([^\.;]+)",
-        r"within\s+(\d+\s+(?:days?|weeks?|months?))\s+of\s+([^\.;]+)",
-        r"by\s+([A-Z][a-z]+\s+\d{1,2},?\s+\d{4})"  # Specific dates like "March 15, 2024"
-    ]
-    for pattern in milestone_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
-            if isinstance(match, tuple):
-                entities["Timeline Milestones"].add(f"{match[0]} - {match[1]}")
-            else:
-                entities["Timeline Milestones"].add(match[:80])
-    
+    _rule("Timeline Milestones", r"milestone\s+\d+:?\s+([^\.;]+)", _milestone),
+    _rule("Timeline Milestones", r"(?:phase|stage)\s+\d+:?\s+([^\.;]+)", _milestone),
+    _rule("Timeline Milestones", r"within\s+(\d+\s+(?:days?|weeks?|months?))\s+of\s+([^\.;]+)", _milestone),
+    _rule("Timeline Milestones", r"by\s+([A-Z][a-z]+\s+\d{1,2},?\s+\d{4})", _milestone),  # Specific dates like "March 15, 2024"
+
     # 4. IP Ownership
-    ip_patterns = [
-        r"(?:intellectual property|IP|copyright|patent|trademark)\s+(?:shall|will)\s+(?:vest in|belong to|be owned by)\s+([^\.;]+)",
-        r"ownership of (?:work product|deliverables|IP):?\s+([^\.;]+)",
-        r"(?:Client|Vendor|Company)\s+(?:owns|retains)\s+(?:all rights|ownership)(?:\s+to)?(?:\s+the)?\s+([^\.;]+)"
-    ]
-    for pattern in ip_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        entities["IP Ownership"].update([m.strip()[:100] for m in matches])
-    
+    _rule("IP Ownership", r"(?:intellectual property|IP|copyright|patent|trademark)\s+(?:shall|will)\s+(?:vest in|belong to|be owned by)\s+([^\.;]+)", _stripped_100),
+    _rule("IP Ownership", r"ownership of (?:work product|deliverables|IP):?\s+([^\.;]+)", _stripped_100),
+    _rule("IP Ownership", r"(?:Client|Vendor|Company)\s+(?:owns|retains)\s+(?:all rights|ownership)(?:\s+to)?(?:\s+the)?\s+([^\.;]+)", _stripped_100),
+
     # 5. Confidentiality Scope
-    confidentiality_patterns = [
-        r"confidential information includes:?\s+([^\.;]+)",
-        r"confidentiality period(?:\s+of)?\s+(\d+\s+years?)",
-        r"(?:proprietary|confidential)\s+([^\.;]+?)\s+(?:shall|must)\s+(?:not|be kept)",
-        r"non-disclosure(?:\s+of)?:?\s+([^\.;]+)"
-    ]
-    for pattern in confidentiality_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        entities["Confidentiality Scope"].update([m.strip()[:100] for m in matches])
-    
+    _rule("Confidentiality Scope", r"confidential information includes:?\s+([^\.;]+)", _stripped_100),
+    _rule("Confidentiality Scope", r"confidentiality period(?:\s+of)?\s+(\d+\s+years?)", _stripped_100),
+    _rule("Confidentiality Scope", r"(?:proprietary|confidential)\s+([^\.;]+?)\s+(?:shall|must)\s+(?:not|be kept)", _stripped_100),
+    _rule("Confidentiality Scope", r"non-disclosure(?:\s+of)?:?\s+([^\.;]+)", _stripped_100),
+
     # 6. Notice Periods
-    notice_patterns = [
-        r"(\d+)\s+(?:days?|months?)\s+(?:written\s+)?notice",
-        r"notice period(?:\s+of)?\s+(\d+\s+(?:days?|months?))",
-        r"(?:upon|with)\s+(\d+\s+(?:days?|months?))\s+prior notice"
-    ]
-    for pattern in notice_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
-            entities["Notice Periods"].add(f"{match} notice" if isinstance(match, str) else str(match))
-    
+    _rule("Notice Periods", r"(\d+)\s+(?:days?|months?)\s+(?:written\s+)?notice", _notice),
+    _rule("Notice Periods", r"notice period(?:\s+of)?\s+(\d+\s+(?:days?|months?))", _notice),
+    _rule("Notice Periods", r"(?:upon|with)\s+(\d+\s+(?:days?|months?))\s+prior notice", _notice),
+
     # 7. Termination Conditions
-    termination_patterns = [
-        r"terminat(?:e|ion)(?:\s+for)?:?\s+([^\.;]+?)\s+(?:if|upon|in case of)",
-        r"(?:either party|Client|Vendor)\s+may terminate(?:\s+this agreement)?:?\s+([^\.;]+)",
-        r"grounds for termination:?\s+([^\.;]+)"
-    ]
-    for pattern in termination_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        entities["Termination Conditions"].update([m.strip()[:100] for m in matches])
-    
+    # Bounded lazy gap; \s++ can't give whitespace back since every connector starts with a letter
+    _rule("Termination Conditions", r"terminat(?:e|ion)(?:\s+for)?:?\s+([^\.;]{1,%d}?)\s++(?:if|upon|in case of)" % MAX_GAP_CHARS, _stripped_100),
+    _rule("Termination Conditions", r"(?:either party|Client|Vendor)\s+may terminate(?:\s+this agreement)?:?\s+([^\.;]+)", _stripped_100),
+    _rule("Termination Conditions", r"grounds for termination:?\s+([^\.;]+)", _stripped_100),
+
     # 8. Liability Caps
-    liability_patterns = [
-        r"(?:maximum|aggregate)\s+liability(?:\s+shall)?(?:\s+not)?\s+exceed\s+((?:Rs\.?|INR|₹)\s?[\d,]+)",
-        r"liability(?:\s+is)?\s+limited to\s+([^\.;]+)",
-        r"cap(?:ped)?\s+at\s+((?:Rs\.?|INR|₹)\s?[\d,]+)"
-    ]
-    for pattern in liability_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        entities["Liability Caps"].update([m.strip() for m in matches])
-
-    return {k: sorted(list(v)) for k, v in entities.items()}
+    _rule("Liability Caps", r"(?:maximum|aggregate)\s+liability(?:\s+shall)?(?:\s+not)?\s+exceed\s+((?:Rs\.?|INR|₹)\s?[\d,]+)", _stripped),
+    _rule("Liability Caps", r"liability(?:\s+is)?\s+limited to\s+([^\.;]+)", _stripped),
+    _rule("Liability Caps", r"cap(?:ped)?\s+at\s+((?:Rs\.?|INR|₹)\s?[\d,]+)", _stripped),
+]
+
+
+def _select_rules(entity_types: Optional[Iterable[str]]) -> List[EntityRule]:
+    if entity_types is None:
+        return ENTITY_RULES
+    wanted = set(entity_types)
+    unknown = wanted.difference(ENTITY_TYPES)
+    if unknown:
+        raise ValueError(f"Unknown entity types: {sorted(unknown)}")
+    return [rule for rule in ENTITY_RULES if rule.entity_type in wanted]
+
+
+def _scan_window(window: str, offset: int, limit: int, rules: List[EntityRule], found: Dict, resume: Dict) -> None:
+    """
+    Runs rules over window (which starts at absolute offset), keeping matches that
+    start before limit. resume holds each rule's absolute scan position, so a rule
+    picks up where its previous match ended, exactly like one findall over the text.
+    """
+    for idx, rule in enumerate(rules):
+        pos = resume.get(idx, 0)
+        if pos is None:
+            continue  # first_only rule already matched
+        for match in rule.pattern.finditer(window, max(0, pos - offset)):
+            if match.start() >= limit:
+                break
+            found[rule.entity_type].update(rule.format(match))
+            resume[idx] = None if rule.first_only else offset + match.end()
+            if rule.first_only:
+                break
+
+
+def _result(found: Dict) -> Dict[str, List[str]]:
+    return {k: sorted(list(v)) for k, v in found.items()}
+
+
+@span("ner.extract_entities")
+def extract_entities(text, entity_types=None):
+    """
+    Enhanced NER: Extracts 12+ entity types from contracts using Regex Patterns.
+    Pure Python implementation optimized for cloud deployment.
+
+    Args:
+        text: Contract text
+        entity_types: Optional subset of ENTITY_TYPES to extract (default: all)
+    """
+    rules = _select_rules(entity_types)
+    found = {t: set() for t in ENTITY_TYPES if any(rule.entity_type == t for rule in rules)}
+    _scan_window(text, 0, len(text), rules, found, {})
+    return _result(found)
+
+
+@span("ner.extract_entities_stream")
+def extract_entities_stream(chunks: Union[str, Iterable[str]], entity_types=None,
+                            window: int = STREAM_WINDOW_CHARS, overlap: int = STREAM_OVERLAP_CHARS):
+    """
+    Same output as extract_entities(), but reads text in overlapping windows so
+    time stays linear and memory stays bounded on very large documents.
+
+    Args:
+        chunks: Contract text, or an iterable of text pieces (e.g. PDF pages)
+        entity_types: Optional subset of ENTITY_TYPES to extract (default: all)
+        window: Characters scanned per window
+        overlap: Characters carried into the next window; entities longer than
+                 this may be cut at a window edge
+    """
+    if isinstance(chunks, str):
+        chunks = [chunks]
+
+    rules = _select_rules(entity_types)
+    found = {t: set() for t in ENTITY_TYPES if any(rule.entity_type == t for rule in rules)}
+    resume = {}
+    buffer = ""
+    offset = 0  # absolute position of buffer[0]
+
+    for chunk in chunks:
+        for start in range(0, len(chunk), window):
+            buffer += chunk[start:start + window]
+            if len(buffer) < window + overlap:
+                continue
+            # Matches starting in the last `overlap` characters wait for the next window
+            limit = len(buffer) - overlap
+            _scan_window(buffer, offset, limit, rules, found, resume)
+            buffer = buffer[limit:]
+            offset += limit
+
+    _scan_window(buffer, offset, len(buffer), rules, found, resume)
+    return _result(found)
 
 
 def extract_entities_summary(entities_dict):
@@ -1,3 +1,5 @@
+from src.utils.keyword_matcher import get_keyword_matcher
+
 AMBIGUOUS_TERMS = [
     "reasonable",
     "best efforts",
@@ -7,11 +9,6 @@ AMBIGUOUS_TERMS = [
 ]
 
 def detect_ambiguity(clause):
-    found = []
-    clause_lower = clause.lower()
-
-    for term in AMBIGUOUS_TERMS:
-        if term in clause_lower:
-            found.append(term)
-
-    return found
+    hits = get_keyword_matcher().first_hits(clause, tables=["ambiguity"])
+    found_terms = hits.get(("ambiguity", "Ambiguous"), {})
+    return [term for term in AMBIGUOUS_TERMS if term in found_terms]
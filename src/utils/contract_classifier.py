@@ -1,16 +1,16 @@
 from src.config import CONTRACT_TYPE_KEYWORDS
+from src.utils.keyword_matcher import get_keyword_matcher
 
 def classify_contract(text):
     """
     Identifies the type of contract based on content analysis.
     Uses keyword matching with scoring to handle mixed content.
     """
-    text_lower = text.lower()
+    hits = get_keyword_matcher().first_hits(text, tables=["contract"])
     
     scores = {}
-    for contract_type, keywords in CONTRACT_TYPE_KEYWORDS.items():
-        score = sum(1 for kw in keywords if kw in text_lower)
-        scores[contract_type] = score
+    for contract_type in CONTRACT_TYPE_KEYWORDS:
+        scores[contract_type] = len(hits.get(("contract", contract_type), {}))
     
     # Return type with highest score
     if max(scores.values()) > 0:
@@ -0,0 +1,300 @@
+"""
+Instrumentation - Timing spans, counters and on-demand profiling.
+
+    from src.utils.instrumentation import span, count
+
+    @span("ner.extract_entities")
+    def extract_entities(text): ...
+
+    with span("llm.request"):
+        ...
+    count("llm.cache_hits")
+
+A span times its block or function call with the monotonic perf_counter().
+For each span name it keeps call, error and total-time counts, plus the last
+INSTRUMENTATION_WINDOW durations, so p50/p95 follow recent traffic. Recording
+costs about a microsecond. Spans therefore go on per-document and per-request
+calls, not per-clause ones. The pipeline records each stage as
+"pipeline.<stage>".
+
+Metrics are per process. Pool workers return theirs with drain_samples(), and
+the parent adds them with merge_samples() (see src/services/api.py).
+metrics_snapshot() exports JSON and prometheus_text() exports the Prometheus
+text format. The API serves both at /metrics, and app.py shows them in a hidden
+diagnostics panel (open the app with ?diagnostics=1).
+
+capture() profiles one block on demand with cProfile and/or tracemalloc.
+"""
+
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional
+
+from src.config import INSTRUMENTATION_ENABLED, INSTRUMENTATION_WINDOW
+
+PROMETHEUS_PREFIX = "contract_analyzer"
+
+
+class _SpanStats:
+    __slots__ = ("calls", "errors", "total", "max", "recent")
+
+    def __init__(self, window: int):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+
+def _percentile(ordered: List[float], share: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+class Metrics:
+    """
+    Thread-safe store of span durations and counters for one process.
+
+    Args:
+        window: Recent durations kept per span for the percentiles
+        enabled: False turns record() and count() into no-ops
+    """
+
+    def __init__(self, window: int = INSTRUMENTATION_WINDOW, enabled: bool = INSTRUMENTATION_ENABLED):
+        self.window = window
+        self.enabled = enabled
+        self._spans: Dict[str, _SpanStats] = {}
+        self._counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, error: bool = False) -> None:
+        """Adds one timed call of span `name`."""
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                stats = self._spans[name] = _SpanStats(self.window)
+            stats.calls += 1
+            stats.errors += error
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+            stats.recent.append(seconds)
+
+    def count(self, name: str, value: float = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> Dict:
+        """{"spans": {name: calls, errors, total/mean/p50/p95/max seconds}, "counters": {name: value}}."""
+        with self._lock:
+            spans = {name: (s.calls, s.errors, s.total, s.max, sorted(s.recent)) for name, s in self._spans.items()}
+            counters = dict(self._counters)
+        return {
+            "spans": {
+                name: {
+                    "calls": calls,
+                    "errors": errors,
+                    "total_seconds": total,
+                    "mean_seconds": total / calls if calls else 0.0,
+                    "p50_seconds": _percentile(recent, 0.5) if recent else 0.0,
+                    "p95_seconds": _percentile(recent, 0.95) if recent else 0.0,
+                    "max_seconds": peak,
+                }
+                for name, (calls, errors, total, peak, recent) in sorted(spans.items())
+            },
+            "counters": dict(sorted(counters.items())),
+        }
+
+    def drain(self) -> Dict:
+        """Everything recorded so far, as plain data for merge(), and a reset."""
+        with self._lock:
+            samples = {
+                "spans": {name: {"calls": s.calls, "errors": s.errors, "total": s.total, "max": s.max,
+                                 "recent": list(s.recent)} for name, s in self._spans.items()},
+                "counters": dict(self._counters),
+            }
+            self._spans.clear()
+            self._counters.clear()
+        return samples
+
+    def merge(self, samples: Dict) -> None:
+        """Adds the output of another process's drain()."""
+        with self._lock:
+            for name, sample in samples.get("spans", {}).items():
+                stats = self._spans.get(name)
+                if stats is None:
+                    stats = self._spans[name] = _SpanStats(self.window)
+                stats.calls += sample["calls"]
+                stats.errors += sample["errors"]
+                stats.total += sample["total"]
+                stats.max = max(stats.max, sample["max"])
+                stats.recent.extend(sample["recent"])
+            for name, value in samples.get("counters", {}).items():
+                self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+
+metrics = Metrics()
+
+
+class span:
+    """
+    Times a block (with span("name"): ...) or every call of a function
+    (@span("name")) into `metrics`. Calls that raise count as errors. Not for
+    generator functions, since only creating the generator would be timed.
+    """
+
+    __slots__ = ("name", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        metrics.record(self.name, time.perf_counter() - self._start, exc_type is not None)
+        return False
+
+    def __call__(self, fn):
+        name = self.name
+
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return timed
+
+
+def count(name: str, value: float = 1) -> None:
+    """Adds value to counter `name` in `metrics`."""
+    metrics.count(name, value)
+
+
+def metrics_snapshot() -> Dict:
+    return metrics.snapshot()
+
+
+def drain_samples() -> Dict:
+    """This process's metrics since the last drain, for merge_samples() in another process."""
+    return metrics.drain()
+
+
+def merge_samples(samples: Dict) -> None:
+    metrics.merge(samples)
+
+
+# ═══════════════════════════════════════════════════════════════
+# PROMETHEUS EXPORT
+# ═══════════════════════════════════════════════════════════════
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def prometheus_text(snapshot: Optional[Dict] = None, prefix: str = PROMETHEUS_PREFIX) -> str:
+    """
+    Metrics in the Prometheus text exposition format: one summary of span
+    durations (p50/p95 quantiles, _sum, _count), span error totals and
+    event counters, each labelled by name.
+    """
+    snapshot = snapshot or metrics.snapshot()
+    lines = [
+        f"# HELP {prefix}_span_seconds Duration of instrumented calls (quantiles over recent calls).",
+        f"# TYPE {prefix}_span_seconds summary",
+    ]
+    for name, stats in snapshot["spans"].items():
+        label = f'span="{_label(name)}"'
+        lines.append(f'{prefix}_span_seconds{{{label},quantile="0.5"}} {stats["p50_seconds"]:.6f}')
+        lines.append(f'{prefix}_span_seconds{{{label},quantile="0.95"}} {stats["p95_seconds"]:.6f}')
+        lines.append(f"{prefix}_span_seconds_sum{{{label}}} {stats['total_seconds']:.6f}")
+        lines.append(f"{prefix}_span_seconds_count{{{label}}} {stats['calls']}")
+    lines += [
+        f"# HELP {prefix}_span_errors_total Instrumented calls that raised.",
+        f"# TYPE {prefix}_span_errors_total counter",
+    ]
+    lines += [f'{prefix}_span_errors_total{{span="{_label(name)}"}} {stats["errors"]}'
+              for name, stats in snapshot["spans"].items()]
+    lines += [
+        f"# HELP {prefix}_events_total Event counters.",
+        f"# TYPE {prefix}_events_total counter",
+    ]
+    lines += [f'{prefix}_events_total{{name="{_label(name)}"}} {value:g}' for name, value in snapshot["counters"].items()]
+    return "\n".join(lines) + "\n"
+
+
+# ═══════════════════════════════════════════════════════════════
+# PROFILING - cProfile / tracemalloc on demand
+# ═══════════════════════════════════════════════════════════════
+
+class Capture:
+    """What capture() measured: wall time, cProfile report and memory figures."""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.profile_text = None  # top functions by cumulative time
+        self.peak_bytes = None  # peak traced memory during the block
+        self.top_allocations = []  # (file:line, bytes) still allocated at the end, largest first
+
+    def to_dict(self) -> Dict:
+        return {
+            "seconds": self.seconds,
+            "profile_text": self.profile_text,
+            "peak_bytes": self.peak_bytes,
+            "top_allocations": self.top_allocations,
+        }
+
+
+@contextmanager
+def capture(cpu: bool = True, memory: bool = False, limit: int = 25):
+    """
+    Profiles the block with cProfile (cpu) and tracemalloc (memory). Both slow
+    the block down, so use it for one-off diagnosis, not on every request.
+
+        with capture(memory=True) as result:
+            analyze_contract(text)
+        print(result.profile_text, result.peak_bytes)
+
+    Args:
+        cpu: Collect a cProfile report of the `limit` slowest functions (cumulative)
+        memory: Trace allocations: peak bytes and the `limit` largest allocation sites
+    """
+    result = Capture()
+    profiler = cProfile.Profile() if cpu else None
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if memory:
+        tracemalloc.reset_peak()
+    if profiler is not None:
+        profiler.enable()
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result.seconds = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+            result.profile_text = out.getvalue()
+        if memory:
+            result.peak_bytes = tracemalloc.get_traced_memory()[1]
+            top = tracemalloc.take_snapshot().statistics("lineno")[:limit]
+            result.top_allocations = [(str(stat.traceback), stat.size) for stat in top]
+            if started_tracing:
+                tracemalloc.stop()
@@ -0,0 +1,97 @@
+"""
+Incremental JSON-array parser for streamed LLM responses.
+
+Claude answers batch requests with a JSON array of objects. When the answer is
+streamed, each object can be used as soon as its closing brace arrives instead
+of waiting for the whole array. Text before the opening bracket (preambles,
+```json fences) is skipped.
+"""
+
+import json
+import re
+from typing import Any, List
+
+# Characters that change parser state outside / inside a JSON string
+_STRUCTURE = re.compile(r'["{}\[\]]')
+_STRING_END = re.compile(r'["\\]')
+
+
+class JSONArrayStream:
+    """
+    Feed chunks of a JSON array; get back each top-level object once it closes.
+
+    >>> parser = JSONArrayStream()
+    >>> parser.feed('[{"a": 1}, {"b"')
+    [{'a': 1}]
+    >>> parser.feed(': "}"}]')
+    [{'b': '}'}]
+    """
+
+    def __init__(self):
+        self.started = False  # seen the opening "["
+        self.finished = False  # seen the closing "]"
+        self._parts = []  # pieces of the object being read
+        self._depth = 0  # nesting depth inside the current element
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> List[Any]:
+        """Consumes the next chunk. Returns the objects completed by it, in order."""
+        items = []
+        pos = 0
+        length = len(text)
+
+        while pos < length and not self.finished:
+            if not self.started:
+                bracket = text.find("[", pos)
+                if bracket == -1:
+                    return items
+                self.started = True
+                pos = bracket + 1
+                continue
+
+            if self._escape:
+                # The character after a backslash never ends a string
+                self._escape = False
+                if self._depth:
+                    self._parts.append(text[pos])
+                pos += 1
+                continue
+
+            pattern = _STRING_END if self._in_string else _STRUCTURE
+            match = pattern.search(text, pos)
+            if match is None:
+                if self._depth:
+                    self._parts.append(text[pos:])
+                return items
+
+            end = match.end()
+            ch = match.group()
+            if self._depth:
+                self._parts.append(text[pos:end])
+
+            if self._in_string:
+                if ch == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if self._depth == 0:
+                    self._parts = [ch]
+                self._depth += 1
+            elif self._depth == 0:
+                if ch == "]":
+                    self.finished = True  # end of the top-level array
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        items.append(json.loads("".join(self._parts)))
+                    except json.JSONDecodeError:
+                        pass  # Malformed element - skip it, keep streaming the rest
+                    self._parts = []
+            pos = end
+
+        return items
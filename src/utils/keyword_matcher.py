@@ -0,0 +1,166 @@
+"""
+Shared multi-pattern keyword matcher.
+
+All keyword tables (risk keywords, clause types, contract types, ambiguous terms,
+red flags, Hindi risk phrases) are compiled once from src/config.py into a
+single matcher, and every consumer asks it for hits instead of running its own
+`kw in text.lower()` loop. Each clause is lowercased once and the lowered copy
+is shared by all consumers.
+
+Each consumer asks for one table of 5-49 keywords, which is checked with one
+C-level str.find() per keyword. Measured on the sample contract's ~500
+character clauses: ~24us per clause for the risk, ambiguity, red-flag and
+clause-type lookups together, against ~36us for one trie-regex pass over all
+145 keywords and ~48us for finding them all at once. Scanning each clause once
+and sharing the hits would therefore be slower, so the lookups stay per table.
+
+build_trie_pattern() compiles a word list into one trie-shaped regex, for
+callers that need every match position (Hindi translation, compliance rules).
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_END = ""  # trie key marking the end of a keyword
+
+
+def build_trie(words: Iterable[str]) -> Dict:
+    """Builds a nested-dict trie. Terminal nodes hold the full word under ''."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[_END] = word
+    return trie
+
+
+def build_trie_pattern(words: Iterable[str]) -> str:
+    """
+    Builds a regex that matches exactly the given words, shaped like their trie
+    (e.g. "pay", "payment", "penalty" -> "p(?:ay(?:ment)?|enalty)").
+    The regex engine only follows one branch per character, and the greedy
+    optional suffixes make it prefer the longest word at each position.
+    """
+    def to_pattern(node):
+        branches = [re.escape(ch) + to_pattern(child) for ch, child in sorted(node.items()) if ch != _END]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if _END in node else body
+
+    return to_pattern(build_trie(words))
+
+
+class KeywordMatcher:
+    """
+    Precompiled matcher over named keyword tables.
+
+    Tables are given as {(table, label): [keywords]}, e.g.
+    {("risk", "High"): ["sole discretion", ...]}. Matching is case-insensitive
+    substring matching, the same semantics as `kw in text.lower()`.
+    """
+
+    def __init__(self, tables: Dict[Tuple[str, str], Iterable[str]]):
+        self.tables = {category: [kw.lower() for kw in keywords] for category, keywords in tables.items()}
+
+        self._categories = {}  # keyword -> [category, ...]
+        for category, keywords in self.tables.items():
+            for kw in keywords:
+                self._categories.setdefault(kw, [])
+                if category not in self._categories[kw]:
+                    self._categories[kw].append(category)
+
+        self._labels = {}  # table -> [(label, keywords), ...] in table order
+        for (table, label), keywords in self.tables.items():
+            self._labels.setdefault(table, []).append((label, keywords))
+
+    def first_hits(self, text: str, tables: Optional[Iterable[str]] = None) -> Dict[Tuple[str, str], Dict[str, int]]:
+        """
+        Returns {(table, label): {keyword: first offset}} for keywords present in text.
+
+        Args:
+            text: Text to scan
+            tables: Optional table names to restrict the result to (e.g. ["contract"])
+        """
+        plan = self._plan_for(tuple(tables) if tables is not None else None)
+        lowered = lowercase(text)
+        grouped = {}
+        for kw, categories in plan:
+            pos = lowered.find(kw)
+            if pos != -1:
+                for category in categories:
+                    grouped.setdefault(category, {})[kw] = pos
+        return grouped
+
+    def first_label(self, text: str, table: str) -> Optional[str]:
+        """
+        Returns the first label of `table` (in table order) with any keyword in
+        text, or None. Stops at the first hit, like a chain of if/any() checks.
+        """
+        lowered = lowercase(text)
+        for label, keywords in self._labels.get(table, ()):
+            for kw in keywords:
+                if kw in lowered:
+                    return label
+        return None
+
+    @lru_cache(maxsize=32)
+    def _plan_for(self, tables: Optional[Tuple[str, ...]]) -> Tuple[Tuple[str, Tuple], ...]:
+        """(keyword, categories) pairs covering the requested tables."""
+        return tuple(
+            (kw, tuple(c for c in categories if tables is None or c[0] in tables))
+            for kw, categories in self._categories.items()
+            if tables is None or any(c[0] in tables for c in categories)
+        )
+
+
+@lru_cache(maxsize=1)
+def get_keyword_matcher() -> KeywordMatcher:
+    """The shared matcher built from src/config.py and the module keyword tables."""
+    from src.config import RISK_KEYWORDS, CLAUSE_TYPE_KEYWORDS, CONTRACT_TYPE_KEYWORDS, RED_FLAG_PATTERNS
+    from src.utils.ambiguity import AMBIGUOUS_TERMS
+    from src.services.multilingual import HINDI_RISK_KEYWORDS
+
+    tables = {}
+    for severity, keywords in RISK_KEYWORDS.items():
+        tables[("risk", severity)] = keywords
+    for clause_type, keywords in CLAUSE_TYPE_KEYWORDS.items():
+        tables[("clause", clause_type)] = keywords
+    for contract_type, keywords in CONTRACT_TYPE_KEYWORDS.items():
+        tables[("contract", contract_type)] = keywords
+    for flag_type, keywords in RED_FLAG_PATTERNS.items():
+        tables[("red_flag", flag_type)] = keywords
+    for severity, keywords in HINDI_RISK_KEYWORDS.items():
+        tables[("hindi_risk", severity)] = keywords
+    tables[("ambiguity", "Ambiguous")] = AMBIGUOUS_TERMS
+
+    return KeywordMatcher(tables)
+
+
+# Whole documents are not worth keeping around; clauses are re-read by several consumers
+_LOWERCASE_CACHE_MAX_CHARS = 20000
+
+
+def lowercase(text: str) -> str:
+    """text.lower(), cached for clause-sized text so consumers share one copy."""
+    if len(text) > _LOWERCASE_CACHE_MAX_CHARS:
+        return text.lower()
+    return _cached_lowercase(text)
+
+
+@lru_cache(maxsize=1024)
+def _cached_lowercase(text: str) -> str:
+    return text.lower()
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased word tokens. The one tokenizer for clause similarity, knowledge
+    base embeddings and BM25, lowercased the same way as keyword matching.
+    """
+    return TOKEN_PATTERN.findall(lowercase(text))
@@ -0,0 +1,37 @@
+"""
+Process Pools - How the PDF and clause worker pools start their processes.
+
+The Streamlit app and the API are multithreaded (Tornado, background jobs,
+Claude requests). Forking a multithreaded process copies locks that other
+threads may be holding at that moment, and a child that needs one of them
+hangs. pool_context() therefore starts workers from a forkserver: a clean,
+single-threaded process started once, which imports the analysis modules up
+front so each worker is still a cheap fork. Where there is no forkserver
+(Windows), workers are spawned.
+
+    ProcessPoolExecutor(max_workers=4, mp_context=pool_context())
+"""
+
+import multiprocessing
+import os
+
+# Imported once by the forkserver, so workers don't each re-import the main
+# script, numpy, pypdf, ... Like any non-fork start method, this needs the
+# main script to guard its entry point with `if __name__ == "__main__":`.
+FORKSERVER_PRELOAD = ["__main__", "src.engines.pipeline"]
+
+
+def pool_context():
+    """multiprocessing context for ProcessPoolExecutor(mp_context=...)."""
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(FORKSERVER_PRELOAD)
+    return context
+
+
+def usable_cpus() -> int:
+    """CPUs this process may run on (its affinity mask, e.g. a container's cpuset), at least 1."""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
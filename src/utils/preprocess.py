@@ -1,28 +1,117 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 from pypdf import PdfReader
 from docx import Document
 import re
 
-def extract_text(file):
+from src.config import PDF_PARALLEL_MIN_PAGES, PDF_PAGES_PER_TASK
+from src.utils.instrumentation import count, span
+from src.utils.pools import pool_context
+
+
+def _read_bytes(file):
+    """Bytes of an upload buffer, open file or path, without moving the caller's position."""
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if isinstance(file, str):
+        with open(file, "rb") as f:
+            return f.read()
+    if hasattr(file, "getvalue"):  # Streamlit UploadedFile / BytesIO: no copy of the stream position
+        return file.getvalue()
+    position = file.tell()
+    data = file.read()
+    file.seek(position)
+    return data
+
+
+_worker_reader = None  # each pool worker parses the PDF once, then extracts its share of pages
+
+
+def _init_page_worker(data):
+    global _worker_reader
+    _worker_reader = PdfReader(io.BytesIO(data))
+
+
+def _extract_page_range(start, stop):
+    """Worker: text of pages [start, stop)."""
+    return [_worker_reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def iter_pdf_pages(file, workers=None):
+    """
+    Yields the text of each PDF page, in order, as soon as it is decoded.
+
+    Args:
+        file: Upload buffer, open binary file, bytes or path
+        workers: Processes for PDFs of PDF_PARALLEL_MIN_PAGES+ pages (default: CPU count).
+                 Pages are still yielded in order; 1 keeps everything in this process.
+    """
+    data = _read_bytes(file)
+    reader = PdfReader(io.BytesIO(data))
+    page_count = len(reader.pages)
+    count("preprocess.pdf_pages", page_count)
+    workers = workers or os.cpu_count() or 1
+
+    if workers < 2 or page_count < PDF_PARALLEL_MIN_PAGES:
+        for page in reader.pages:
+            yield page.extract_text() or ""
+        return
+
+    starts = range(0, page_count, PDF_PAGES_PER_TASK)
+    stops = [min(start + PDF_PAGES_PER_TASK, page_count) for start in starts]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context(),
+                             initializer=_init_page_worker, initargs=(data,)) as pool:
+        # map() returns results in submission order while later ranges are still being decoded
+        for pages in pool.map(_extract_page_range, starts, stops):
+            yield from pages
+
+
+def _file_name(file):
+    """Name of an upload, open file or path, for dispatching on its extension."""
+    return getattr(file, "name", file if isinstance(file, str) else "")
+
+
+def iter_text(file, workers=None):
+    """
+    Yields a document's text piece by piece (PDF pages, DOCX paragraphs, or the
+    whole TXT file), so consumers can start before the last page is parsed.
+    extract_text() joins the pieces with spaces.
+    """
+    name = _file_name(file).lower()  # CONTRACT.PDF is a PDF too
+    if name.endswith(".pdf"):
+        yield from iter_pdf_pages(file, workers)
+    elif name.endswith(".docx"):
+        source = file if not hasattr(file, "getvalue") else io.BytesIO(file.getvalue())
+        for p in Document(source).paragraphs:
+            yield p.text
+    else:
+        content = _read_bytes(file)
+        # Try multiple encodings
+        for encoding in ['utf-8', 'latin-1', 'cp1252']:
+            try:
+                yield content.decode(encoding)
+                return
+            except UnicodeDecodeError:
+                continue
+        yield content.decode('utf-8', errors='replace') # Fallback
+
+
+@span("preprocess.extract_text")
+def extract_text(file, workers=None):
+    name = _file_name(file)
     try:
-        if file.name.endswith(".pdf"):
-            reader = PdfReader(file)
-            text = " ".join(page.extract_text() for page in reader.pages)
+        if name.lower().endswith(".pdf"):
+            text = " ".join(iter_pdf_pages(file, workers))
             return text if text.strip() else "Empty PDF file detected."
-        elif file.name.endswith(".docx"):
-            doc = Document(file)
-            text = " ".join(p.text for p in doc.paragraphs)
+        elif name.lower().endswith(".docx"):
+            text = " ".join(iter_text(file))
             return text if text.strip() else "Empty DOCX file detected."
         else:
-            content = file.read()
-            # Try multiple encodings
-            for encoding in ['utf-8', 'latin-1', 'cp1252']:
-                try:
-                    return content.decode(encoding)
-                except UnicodeDecodeError:
-                    continue
-            return content.decode('utf-8', errors='replace') # Fallback
+            return next(iter_text(file))
     except Exception as e:
-        return f"Error extracting text from {file.name}: {str(e)}"
+        return f"Error extracting text from {name}: {str(e)}"
 
 def clean_text(text):
     text = re.sub(r"\n+", "\n", text)
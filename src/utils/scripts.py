@@ -0,0 +1,118 @@
+"""
+Script Detection - Per-script character counts for Indic contracts.
+
+script_profile() counts the non-whitespace characters of a text in each Indic
+script block (Devanagari, Bengali, Gurmukhi, Gujarati, Oriya, Tamil, Telugu,
+Kannada, Malayalam) in one vectorized pass. The text is viewed as a NumPy
+array of code points, and the counts come from one bincount. Full profiles of
+document-sized texts are cached by a digest of the text (not the text itself,
+so no document is kept alive). The is_hindi() checks made on the same contract
+by the pipeline, normalize_hindi_contract() and the translator therefore only
+scan it once. Hashing costs about a fifth of a scan.
+
+For multi-megabyte inputs, sample=True counts SCRIPT_SAMPLE_WINDOWS evenly
+spaced windows instead of the whole text (the shares are then estimates).
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from types import MappingProxyType
+from typing import Optional
+
+import numpy as np
+
+from src.config import SCRIPT_SAMPLE_MIN_CHARS, SCRIPT_SAMPLE_WINDOWS, SCRIPT_SAMPLE_WINDOW_CHARS
+
+# The Indic blocks are contiguous, 128 code points each, from U+0900 to U+0D7F
+INDIC_SCRIPTS = ("Devanagari", "Bengali", "Gurmukhi", "Gujarati", "Oriya", "Tamil", "Telugu", "Kannada", "Malayalam")
+_INDIC_START = 0x0900
+_BLOCK_SIZE = 0x80
+_INDIC_END = _INDIC_START + _BLOCK_SIZE * len(INDIC_SCRIPTS)
+
+# Lookup table of the code points str.isspace() accepts (the whitespace str.strip()
+# removes). All are below U+3001; larger code points are clipped to the last, False entry
+_WHITESPACE = np.array([chr(cp).isspace() for cp in range(0x3001)] + [False])
+
+# Profiles of short strings (dictionary terms, clauses) are cheap and not worth caching,
+# and neither are sampled ones (hashing the whole text would cost more than the sample)
+_PROFILE_CACHE_MIN_CHARS = 1000
+_PROFILE_CACHE_SIZE = 16
+_profile_cache = OrderedDict()  # (digest, sample) -> ScriptProfile, least recently used first
+_profile_cache_lock = threading.Lock()
+
+# chars: non-whitespace characters counted; counts: script -> characters ("Other" for the rest)
+ScriptProfile = namedtuple("ScriptProfile", ["chars", "counts", "sampled"])
+
+
+def _codepoints(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le", errors="surrogatepass"), dtype=np.uint32)
+
+
+def _count(text: str):
+    """(non-whitespace characters, per-script counts array) for text."""
+    codepoints = _codepoints(text)
+    codepoints = codepoints[~_WHITESPACE[np.minimum(codepoints, _WHITESPACE.size - 1)]]
+    indic = codepoints[(codepoints >= _INDIC_START) & (codepoints < _INDIC_END)]
+    blocks = np.bincount((indic - _INDIC_START) // _BLOCK_SIZE, minlength=len(INDIC_SCRIPTS))
+    return int(codepoints.size), blocks
+
+
+def _sample(text: str) -> str:
+    """SCRIPT_SAMPLE_WINDOWS evenly spaced windows of text, joined."""
+    step = len(text) // SCRIPT_SAMPLE_WINDOWS
+    return "".join(text[start:start + SCRIPT_SAMPLE_WINDOW_CHARS] for start in range(0, step * SCRIPT_SAMPLE_WINDOWS, step))
+
+
+def _profile(text: str, sample: bool) -> ScriptProfile:
+    sampled = sample and len(text) > SCRIPT_SAMPLE_WINDOWS * SCRIPT_SAMPLE_WINDOW_CHARS
+    chars, blocks = _count(_sample(text) if sampled else text)
+    counts = {script: int(count) for script, count in zip(INDIC_SCRIPTS, blocks)}
+    counts["Other"] = chars - int(blocks.sum())
+    return ScriptProfile(chars, MappingProxyType(counts), sampled)
+
+
+def _cached_profile(text: str, sample: bool) -> ScriptProfile:
+    key = (hashlib.sha1(text.encode("utf-8", errors="surrogatepass"), usedforsecurity=False).digest(), sample)
+    with _profile_cache_lock:
+        profile = _profile_cache.get(key)
+        if profile is not None:
+            _profile_cache.move_to_end(key)
+            return profile
+    profile = _profile(text, sample)
+    with _profile_cache_lock:
+        _profile_cache[key] = profile
+        if len(_profile_cache) > _PROFILE_CACHE_SIZE:
+            _profile_cache.popitem(last=False)
+    return profile
+
+
+def script_profile(text: str, sample: Optional[bool] = None) -> ScriptProfile:
+    """
+    Per-script character counts of text (whitespace excluded).
+
+    Args:
+        text: Text to profile
+        sample: Count evenly spaced windows instead of every character. The
+                default (None) samples texts over SCRIPT_SAMPLE_MIN_CHARS.
+    """
+    if sample is None:
+        sample = len(text) > SCRIPT_SAMPLE_MIN_CHARS
+    if len(text) < _PROFILE_CACHE_MIN_CHARS or (sample and len(text) > SCRIPT_SAMPLE_WINDOWS * SCRIPT_SAMPLE_WINDOW_CHARS):
+        return _profile(text, sample)
+    return _cached_profile(text, sample)
+
+
+def script_share(text: str, script: str, sample: Optional[bool] = None) -> float:
+    """Fraction of the non-whitespace characters of text that are in `script` (0.0 for empty text)."""
+    profile = script_profile(text, sample)
+    return profile.counts.get(script, 0) / profile.chars if profile.chars else 0.0
+
+
+def dominant_indic_script(text: str, min_share: float = 0.05, sample: Optional[bool] = None) -> Optional[str]:
+    """The Indic script with the most characters, if over min_share of the text; else None."""
+    profile = script_profile(text, sample)
+    if not profile.chars:
+        return None
+    script = max(INDIC_SCRIPTS, key=lambda name: profile.counts[name])
+    return script if profile.counts[script] / profile.chars > min_share else None
@@ -1,50 +1,188 @@
+"""
+Clause Segmentation - Splits contract text into clauses at legal numbering.
+
+iter_clauses() consumes text piece by piece (e.g. PDF pages from
+preprocess.iter_text) and yields each clause as soon as the start of the next
+one has been read, with its character offsets in the concatenated text for
+highlighting. segment_clauses() is the whole-text wrapper the pipeline uses.
+"""
+
 import re
+from collections import namedtuple
+from typing import Iterable, Iterator, List
+
+from src.utils.instrumentation import span
+
+# One clause and its [start, end) character span in the source text
+Clause = namedtuple("Clause", ["text", "start", "end"])
+
+# Regex for common legal numbering: 1., 1.1, (a), (i), [1], Article I
+CLAUSE_PATTERN = re.compile(r"(?:\n\s*\(?[a-zA-Z0-9]+\)[\.\)]|\n\s*\d+\.\d+|\n\s*ARTICLE\s+[IVX]+|\n\s*SECTION\s+\d+)")
+# The same numbering without the leading newline: text that begins with it also starts a clause
+CLAUSE_START = re.compile(r"\(?[a-zA-Z0-9]+\)[\.\)]|\d+\.\d+|ARTICLE\s+[IVX]+|SECTION\s+\d+")
+# Sentence boundaries (approximate): period/question/exclamation followed by space
+# and capital letter, or by a newline
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+(?=[A-Z])|(?<=[.!?])\s*\n')
+NON_SPACE = re.compile(r"\S")
+
+FALLBACK_MIN_CLAUSES = 3  # fewer numbered clauses than this: also split by sentences
+FALLBACK_CHUNK_WORDS = 80
+
+
+def _stripped(source: str, start: int, end: int, base: int = 0) -> Clause:
+    """Clause for source[start:end] with surrounding whitespace trimmed (offsets shifted by base)."""
+    text = source[start:end]
+    stripped = text.strip()
+    lead = len(text) - len(text.lstrip())
+    return Clause(stripped, base + start + lead, base + start + lead + len(stripped))
 
+
+def _sentence_chunks(text: str) -> Iterator[Clause]:
+    """
+    Groups sentences into chunks of about FALLBACK_CHUNK_WORDS words, for text
+    without numbering. Sentences are joined by single spaces, so a chunk's text
+    can differ from source[start:end] in whitespace.
+    """
+    words = 0
+    sentences = []
+    chunk_start = 0
+    pos = 0
+    boundaries = [(m.start(), m.end()) for m in SENTENCE_PATTERN.finditer(text)] + [(len(text), len(text))]
+    for sep_start, sep_end in boundaries:
+        sentence = text[pos:sep_start]
+        if not sentences:
+            chunk_start = pos
+        sentences.append(sentence)
+        words += len(sentence.split())
+        if words >= FALLBACK_CHUNK_WORDS:
+            yield _chunk(text, sentences, chunk_start, sep_start)
+            sentences = []
+            words = 0
+        pos = sep_end
+    if sentences:
+        chunk = _chunk(text, sentences, chunk_start, len(text))
+        if chunk.text:
+            yield chunk
+
+
+def _chunk(text: str, sentences: List[str], start: int, end: int) -> Clause:
+    span = _stripped(text, start, end)
+    return Clause(" ".join(sentences).strip(), span.start, span.end)
+
+
+def iter_clauses(pieces: Iterable[str]) -> Iterator[Clause]:
+    """
+    Segments text given as consecutive pieces. Yields Clause(text, start, end)
+    in order; offsets index into "".join(pieces), and text is that slice with
+    surrounding whitespace stripped.
+
+    Heuristic: a clause starts at legal numbering ("1.1", "(a).", "ARTICLE IV",
+    "SECTION 3") on a new line. If the whole text has fewer than
+    FALLBACK_MIN_CLAUSES, sentence-based chunks of ~80 words are added after
+    the numbered clauses (so the first clauses are held back until a third is
+    found).
+    """
+    buffer = ""  # source text from `base` on
+    base = 0  # source offset of buffer[0]
+    scan = 0  # buffer offset up to which chunks are final
+    clause_start = None  # buffer offset where the open clause begins
+    found = 0  # clauses started so far
+    held = []  # first clauses, until we know the fallback is not needed
+    head = []  # all pieces, kept only while the fallback may still be needed
+
+    def start_clause(at):
+        """A clause begins at buffer offset `at`; returns the clause it closes, if any."""
+        nonlocal clause_start, found
+        closed = _stripped(buffer, clause_start, at, base) if clause_start is not None else None
+        clause_start = at
+        found += 1
+        return closed
+
+    def on_text(start, end):
+        """Text between two numbering matches: starts a clause, continues one, or is blank."""
+        nonlocal clause_start, found
+        first = NON_SPACE.search(buffer, start, end)
+        if first is None:
+            return None
+        if CLAUSE_START.match(buffer, first.start(), end):
+            return start_clause(start)
+        if clause_start is None:
+            clause_start = start
+            found += 1
+        return None
+
+    def consume(final):
+        """Yields clauses closed by the numbering matches that can no longer change."""
+        nonlocal scan
+        for match in CLAUSE_PATTERN.finditer(buffer, scan):
+            if not final and match.end() >= len(buffer):
+                break  # More text could extend this match (e.g. "1.2" -> "1.23")
+            closed = on_text(scan, match.start())
+            if closed is not None:
+                yield closed
+            closed = start_clause(match.start())
+            if closed is not None:
+                yield closed
+            scan = match.end()
+        if final:
+            closed = on_text(scan, len(buffer))
+            if closed is not None:
+                yield closed
+            scan = len(buffer)
+
+    def release(closed):
+        if held is None:
+            yield from closed
+            return
+        held.extend(closed)
+        if found >= FALLBACK_MIN_CLAUSES:
+            yield from held
+            held.clear()
+
+    for piece in pieces:
+        if not piece:
+            continue
+        if head is not None:
+            head.append(piece)
+        buffer += piece
+        for clause in release(list(consume(final=False))):
+            yield clause
+        if found >= FALLBACK_MIN_CLAUSES:
+            head = None
+            held = None
+        # Keep only the open clause and the unscanned tail
+        keep = min(scan, clause_start) if clause_start is not None else scan
+        if keep:
+            buffer = buffer[keep:]
+            base += keep
+            scan -= keep
+            if clause_start is not None:
+                clause_start -= keep
+
+    closed = list(consume(final=True))
+    if clause_start is not None:
+        last = _stripped(buffer, clause_start, len(buffer), base)
+        closed.append(last)
+
+    if held is None:
+        yield from closed
+        return
+    yield from held
+    yield from closed
+    if found < FALLBACK_MIN_CLAUSES:
+        yield from _sentence_chunks("".join(head))
+
+
+@span("segmenter.segment_clauses_with_offsets")
+def segment_clauses_with_offsets(text: str) -> List[Clause]:
+    """segment_clauses() with the character span of each clause in text."""
+    return list(iter_clauses([text]))
+
+
+@span("segmenter.segment_clauses")
 def segment_clauses(text):
     """
     Segments contract text into clauses based on legal numbering and formatting.
     Heuristic: Looks for patterns like "1.", "1.1.", "(a)", or double newlines.
     """
-    # Regex for common legal numbering: 1., 1.1, (a), (i), [1], Article I
-    clause_pattern = r"(?:\n\s*\(?[a-zA-Z0-9]+\)[\.\)]|\n\s*\d+\.\d+|\n\s*ARTICLE\s+[IVX]+|\n\s*SECTION\s+\d+)"
-    
-    # Split pattern but keep delimiters to reattach them
-    chunks = re.split(f"({clause_pattern})", text)
-    
-    clauses = []
-    current_clause = ""
-
-    for chunk in chunks:
-        if not chunk.strip():
-            continue
-            
-        # If it looks like a new clause start, save the previous one and start new
-        if re.match(clause_pattern, "\n" + chunk.strip()): # minor hack to match our pattern
-             if current_clause:
-                 clauses.append(current_clause.strip())
-             current_clause = chunk
-        else:
-             current_clause += chunk
-
-    if current_clause:
-        clauses.append(current_clause.strip())
-        
-    # Fallback: if fewer than 3 clauses detected, might be bad formatting. 
-    # Use simple paragraph/sentence splitting.
-    if len(clauses) < 3:
-        # Regex to split by sentence boundaries (approximate)
-        # Matches period/question/exclamation followed by space and capital letter or newline
-        sentence_pattern = r'(?<=[.!?])\s+(?=[A-Z])|(?<=[.!?])\s*\n'
-        raw_sentences = re.split(sentence_pattern, text)
-        
-        current_chunk = ""
-        for sent in raw_sentences:
-            current_chunk += sent + " "
-            # Group into chunks of ~80 words
-            if len(current_chunk.split()) >= 80:
-                clauses.append(current_chunk.strip())
-                current_chunk = ""
-        if current_chunk.strip():
-            clauses.append(current_chunk.strip())
-
-    return clauses
+    return [clause.text for clause in iter_clauses([text])]
@@ -0,0 +1,95 @@
+"""
+Clause Similarity - Pluggable scorers for comparing clauses to reference text.
+
+Every backend works in two steps: prepare(reference) builds a reusable
+signature once (e.g. for each STANDARD_CLAUSES entry), and score(text, signature)
+returns a similarity between 0.0 and 1.0.
+
+Backends:
+- "token_lcs" (default): Indel similarity over word tokens,
+  2 * LCS(words) / (len(a) + len(b)), the same formula SequenceMatcher.ratio()
+  approximates. The LCS is computed bit-parallel: the reference becomes one
+  bitmask per distinct word, and each word of the text costs a few big-int
+  operations. That is linear in the text length, instead of difflib's
+  pure-Python block search, which is quadratic in the worst case.
+- "difflib": the original character-level SequenceMatcher.ratio().
+
+benchmarks/similarity_benchmark.py measures speed and agreement. token_lcs is
+~20-30x faster than difflib on clauses of 50-5,000 words (~1.5ms vs ~40ms at
+5,000 words). On near-matches (standard clauses with 10-30% of words
+replaced) it stays within ~0.03-0.09 of SequenceMatcher without autojunk, the
+score difflib approximates. Scores from difflib as shipped can differ by up
+to ~0.3 on the same clauses. Its autojunk heuristic ignores common characters
+in strings of 200+ characters, which makes its score erratic: it differs from
+its own junk-free score by about as much. Set SIMILARITY_BACKEND = "difflib"
+to get the old scores back.
+"""
+
+from collections import namedtuple
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, Optional
+
+from src.config import SIMILARITY_BACKEND
+from src.utils.keyword_matcher import tokenize
+
+SimilarityBackend = namedtuple("SimilarityBackend", ["prepare", "score"])
+
+# Reference text prepared for token_lcs: word count and word -> bitmask of positions
+TokenSignature = namedtuple("TokenSignature", ["length", "masks"])
+
+
+def token_signature(reference: str) -> TokenSignature:
+    masks: Dict[str, int] = {}
+    tokens = tokenize(reference)
+    for position, token in enumerate(tokens):
+        masks[token] = masks.get(token, 0) | (1 << position)
+    return TokenSignature(len(tokens), masks)
+
+
+def token_lcs_ratio(text: str, signature: TokenSignature) -> float:
+    """2 * LCS / total length over word tokens (bit-parallel LCS, Hyyro 2004)."""
+    tokens = tokenize(text)
+    total = len(tokens) + signature.length
+    if total == 0:
+        return 1.0
+
+    masks = signature.masks
+    full = (1 << signature.length) - 1
+    row = full  # zero bits mark reference positions already matched
+    for token in tokens:
+        matches = row & masks.get(token, 0)
+        if matches:
+            row = ((row + matches) | (row - matches)) & full
+
+    lcs = signature.length - row.bit_count()
+    return 2 * lcs / total
+
+
+def difflib_ratio(text: str, reference: str) -> float:
+    return SequenceMatcher(None, text.lower(), reference).ratio()
+
+
+BACKENDS: Dict[str, SimilarityBackend] = {
+    "token_lcs": SimilarityBackend(token_signature, token_lcs_ratio),
+    "difflib": SimilarityBackend(lambda reference: reference.lower(), difflib_ratio),
+}
+
+
+def get_similarity_backend(name: Optional[str] = None) -> SimilarityBackend:
+    """Returns the named backend (default: SIMILARITY_BACKEND from src/config.py)."""
+    name = name or SIMILARITY_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown similarity backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+    return BACKENDS[name]
+
+
+@lru_cache(maxsize=256)
+def _prepared(reference: str, name: str):
+    return get_similarity_backend(name).prepare(reference)
+
+
+def similarity(text: str, reference: str, backend: Optional[str] = None) -> float:
+    """Similarity of text to reference (0.0-1.0). The reference's signature is cached."""
+    name = backend or SIMILARITY_BACKEND
+    return get_similarity_backend(name).score(text, _prepared(reference, name))
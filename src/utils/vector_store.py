@@ -1,77 +1,297 @@
-
-
 # from sentence_transformers import SentenceTransformer (Removed for Lite Mode)
 # from sklearn.metrics.pairwise import cosine_similarity
+import hashlib
+import json
+import math
+import os
+import re
+import zlib
+from collections import Counter
+
+import numpy as np
 import streamlit as st
 
+from src.config import KB_CORPUS_PATH, KB_VECTORS_PATH, KB_EMBEDDING_DIM, KB_BM25_K1, KB_BM25_B
+from src.utils.keyword_matcher import tokenize
+
 # Lite Mode: No heavy embedding models
 @st.cache_resource
 def load_embedding_model():
     return None
 
+
+class HashingEmbedder:
+    """
+    Offline, CPU-only text embedder: hashed TF-IDF over word unigrams and bigrams.
+
+    Features are hashed into `dim` buckets with crc32 (stable across processes,
+    unlike hash()), so no vocabulary has to be stored. IDF weights are fitted
+    on the knowledge base corpus; vectors are L2-normalized, so a dot product
+    is the cosine similarity.
+    """
+
+    def __init__(self, dim=KB_EMBEDDING_DIM):
+        self.dim = dim
+        self.idf = np.ones(dim, dtype=np.float32)
+
+    def _features(self, text):
+        """Returns {bucket: signed term frequency} for one text."""
+        tokens = tokenize(text)
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        features = {}
+        for gram, count in Counter(grams).items():
+            h = zlib.crc32(gram.encode("utf-8"))
+            bucket = h % self.dim
+            sign = 1.0 if (h >> 31) & 1 else -1.0  # Signed hashing keeps collisions unbiased
+            features[bucket] = features.get(bucket, 0.0) + sign * (1.0 + math.log(count))
+        return features
+
+    def fit(self, texts):
+        """Fits IDF weights on the corpus."""
+        df = np.zeros(self.dim, dtype=np.float32)
+        for text in texts:
+            buckets = list(self._features(text))
+            df[buckets] += 1
+        self.idf = (np.log((1 + len(texts)) / (1 + df)) + 1).astype(np.float32)
+        return self
+
+    def embed(self, texts):
+        """Returns a (len(texts), dim) float32 matrix of normalized vectors."""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            if features:
+                matrix[row, list(features)] = list(features.values())
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+class BM25Index:
+    """
+    Inverted index with Okapi BM25 scoring.
+
+    Each term's postings hold the ids of the documents containing it and the
+    term's precomputed BM25 weight in each, so a query only touches the
+    postings of its own terms. Query time depends on how common the query
+    terms are, not on the corpus size.
+    """
+
+    def __init__(self, documents, k1=KB_BM25_K1, b=KB_BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.num_docs = len(documents)
+
+        term_freqs = [Counter(tokenize(doc)) for doc in documents]
+        doc_lengths = np.array([sum(tf.values()) for tf in term_freqs], dtype=np.float32)
+        avg_length = float(doc_lengths.mean()) if self.num_docs and doc_lengths.sum() else 1.0
+
+        raw = {}  # term -> ([doc ids], [term frequencies])
+        for doc_id, tf in enumerate(term_freqs):
+            for term, count in tf.items():
+                ids, counts = raw.setdefault(term, ([], []))
+                ids.append(doc_id)
+                counts.append(count)
+
+        self.idf = {}
+        self.postings = {}  # term -> (doc ids int32 array, BM25 weights float32 array)
+        for term, (ids, counts) in raw.items():
+            ids = np.array(ids, dtype=np.int32)
+            tf = np.array(counts, dtype=np.float32)
+            idf = math.log(1 + (self.num_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+            norm = k1 * (1 - b + b * doc_lengths[ids] / avg_length)
+            self.idf[term] = idf
+            self.postings[term] = (ids, (idf * tf * (k1 + 1) / (tf + norm)).astype(np.float32))
+
+    def search(self, query, top_k=3):
+        """
+        Returns [(doc id, bm25 score, relevance 0-1)] for the top_k documents.
+        Relevance divides the score by the most a document could score for this
+        query (every query term with saturated frequency), so it is comparable
+        across queries.
+        """
+        query_terms = Counter(term for term in tokenize(query) if term in self.postings)
+        if not query_terms:
+            return []
+
+        doc_ids = np.concatenate([self.postings[term][0] for term in query_terms])
+        weights = np.concatenate([self.postings[term][1] * count for term, count in query_terms.items()])
+        candidates, inverse = np.unique(doc_ids, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights)
+
+        k = min(top_k, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        max_score = sum(self.idf[term] * (self.k1 + 1) * count for term, count in query_terms.items())
+        return [
+            (int(candidates[i]), float(scores[i]), float(min(scores[i] / max_score, 1.0)) if max_score > 0 else 0.0)
+            for i in top
+        ]
+
+
+def _risk_from_analysis(analysis):
+    """'Risk: High. ...' -> 'High'; standard/neutral entries -> 'Low'."""
+    match = re.match(r"Risk:\s*(High|Medium|Low)", analysis)
+    return match.group(1) if match else "Low"
+
+
 class VectorKnowledgeBase:
-    def __init__(self):
+    def __init__(self, corpus_path=KB_CORPUS_PATH, vectors_path=KB_VECTORS_PATH, dim=KB_EMBEDDING_DIM):
         # self.model = load_embedding_model()
+        self.corpus_path = corpus_path
+        self.vectors_path = vectors_path
+        self.embedder = HashingEmbedder(dim)
         self.documents = []
         self.metadata = []
-        
-        # Initialize with static data only (no vectors)
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self._bm25 = None  # built on first keyword search
+
         self._initialize_knowledge_base()
-        
+
     def _initialize_knowledge_base(self):
-        # Data: (Text, Type, Analysis)
-        kb_data = [
-            ("The Vendor shall indemnify the Client against all claims, unlimited in amount.", "Indemnity", "Risk: High. Unlimited liability can bankrupt a small vendor."),
-            ("The Vendor's liability shall be capped at the total contract value.", "Indemnity", "Standard: Safe. Liability is limited to a reasonable amount."),
-            ("This Agreement may be terminated by the Client at any time without notice.", "Termination", "Risk: High. Unilateral termination without notice creates business uncertainty."),
-            ("Either party may terminate this Agreement with 30 days prior written notice.", "Termination", "Standard: Safe. Mutual termination with notice period."),
-            ("Any dispute shall be subject to the exclusive jurisdiction of the courts in London, UK.", "Jurisdiction", "Risk: High. Foreign jurisdiction is expensive and impractical for Indian SMEs."),
-            ("Disputes shall be resolved by arbitration in New Delhi under the Indian Arbitration Act.", "Jurisdiction", "Standard: Safe. Local arbitration is cost-effective."),
-            ("The Client owns all Intelligent Property created by the Vendor during this engagement.", "IP", "Neutral. Standard for 'work for hire' but ensure you retain pre-existing IP."),
-            ("Payment shall be made within 90 days of invoice receipt.", "Payment", "Risk: Medium. 90 days is a long cycle for SMEs; negotiate for 30-45 days.")
+        # Data: one JSON object per line with "text", "type" and "analysis"
+        documents = []
+        metadata = []
+        if self.corpus_path and os.path.exists(self.corpus_path):
+            with open(self.corpus_path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)
+                    documents.append(item["text"])
+                    metadata.append({"type": item.get("type", "Other"), "analysis": item.get("analysis", "")})
+
+        self.documents = documents
+        self.metadata = metadata
+        self._build_vectors()
+
+    def _fingerprint(self):
+        """Identifies the corpus + embedder settings the persisted vectors were built from."""
+        digest = hashlib.sha256(f"hashing-tfidf-v1|{self.embedder.dim}".encode("utf-8"))
+        for doc in self.documents:
+            digest.update(doc.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _build_vectors(self):
+        """Loads persisted vectors if they match the corpus, otherwise embeds and saves them."""
+        self._bm25 = None
+        fingerprint = self._fingerprint()
+        if self.vectors_path and os.path.exists(self.vectors_path):
+            try:
+                with np.load(self.vectors_path) as saved:
+                    if str(saved["fingerprint"]) == fingerprint:
+                        self.embedder.idf = saved["idf"]
+                        self.vectors = saved["vectors"]
+                        return
+            except (OSError, KeyError, ValueError):
+                pass  # Corrupt or old format - rebuild below
+
+        self.embedder.fit(self.documents)
+        self.vectors = self.embedder.embed(self.documents)
+        if self.vectors_path:
+            directory = os.path.dirname(self.vectors_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Write to a temp file first so a crash never leaves half a file behind
+            tmp_path = self.vectors_path + ".tmp.npz"
+            np.savez(tmp_path, fingerprint=np.array(fingerprint), idf=self.embedder.idf, vectors=self.vectors)
+            os.replace(tmp_path, self.vectors_path)
+
+    def add_documents(self, items):
+        """
+        Adds reference clauses (dicts with "text", "type", "analysis") and re-embeds.
+        Call save_corpus() to keep them for the next start.
+        """
+        for item in items:
+            self.documents.append(item["text"])
+            self.metadata.append({"type": item.get("type", "Other"), "analysis": item.get("analysis", "")})
+        self._build_vectors()
+
+    def save_corpus(self, path=None):
+        path = path or self.corpus_path
+        with open(path, "w", encoding="utf-8") as f:
+            for doc, meta in zip(self.documents, self.metadata):
+                f.write(json.dumps({"text": doc, **meta}, ensure_ascii=False) + "\n")
+
+    def search_batch(self, queries, top_k=3):
+        """
+        Vector search for many queries at once: one matrix multiply for all
+        query/document scores, then argpartition for each query's top_k.
+        Returns one result list per query.
+        """
+        if not queries or not self.documents:
+            return [[] for _ in queries]
+
+        scores = self.embedder.embed(queries) @ self.vectors.T  # (queries, documents) cosine
+        k = min(top_k, len(self.documents))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+        all_results = []
+        for row, candidates in enumerate(top):
+            ranked = candidates[np.argsort(-scores[row, candidates], kind="stable")]
+            all_results.append([
+                {
+                    "text": self.documents[idx],
+                    "score": float(max(scores[row, idx], 0.0)),
+                    "metadata": self.metadata[idx]
+                }
+                for idx in ranked if scores[row, idx] > 0
+            ])
+        return all_results
+
+    def search_bm25(self, query, top_k=3):
+        """
+        Keyword search over the inverted index. "score" is the BM25 relevance
+        scaled to 0-1; "bm25" is the raw score.
+        """
+        if self._bm25 is None:
+            self._bm25 = BM25Index(self.documents)
+        return [
+            {
+                "text": self.documents[doc_id],
+                "score": relevance,
+                "bm25": bm25,
+                "metadata": self.metadata[doc_id]
+            }
+            for doc_id, bm25, relevance in self._bm25.search(query, top_k)
         ]
-        
-        self.documents = [item[0] for item in kb_data]
-        self.metadata = [{"type": item[1], "analysis": item[2]} for item in kb_data]
-        # self.vectors = self.model.encode(self.documents)
 
-    def search(self, query, top_k=3):
+    def search(self, query, top_k=3, mode="vector"):
         """
-        Lite Mode: Keyword-based fallback search.
+        Returns the top_k most relevant knowledge base clauses with scores (0-1).
+
+        Args:
+            mode: "vector" (cosine over TF-IDF embeddings) or "bm25" (keyword relevance)
         """
-        results = []
-        query_words = set(query.lower().split())
-        
-        scores = []
-        for i, doc in enumerate(self.documents):
-            doc_words = set(doc.lower().split())
-            vocab = query_words.union(doc_words)
-            # Simple Jaccard similarity as fallback
-            intersection = query_words.intersection(doc_words)
-            score = len(intersection) / len(vocab) if vocab else 0
-            scores.append((score, i))
-            
-        # Sort by score
-        scores.sort(key=lambda x: x[0], reverse=True)
-        top_indices = [idx for score, idx in scores[:top_k] if score > 0]
-        
-        for idx in top_indices:
-            results.append({
-                "text": self.documents[idx],
-                "score": 0.5, # Dummy score
-                "metadata": self.metadata[idx]
-            })
-            
-        return results
+        if mode == "bm25":
+            return self.search_bm25(query, top_k)
+        if mode != "vector":
+            raise ValueError(f"Unknown search mode '{mode}' (use 'vector' or 'bm25')")
+        return self.search_batch([query], top_k)[0]
 
     def analyze_multilingual_risk(self, clause_text, threshold=0.55):
         """
-        Lite Mode: Returns neutral result as vector analysis is disabled.
+        Risk of the closest knowledge base clause, if it is at least `threshold` similar.
         """
-        return {"risk": "Low", "type": "Safe", "score": 0.0, "reason": "Vector analysis disabled in Lite Mode."}
+        matches = self.search(clause_text, top_k=1)
+        if not matches or matches[0]["score"] < threshold:
+            best = matches[0]["score"] if matches else 0.0
+            return {"risk": "Low", "type": "Safe", "score": best, "reason": "No similar clause in the knowledge base."}
+
+        match = matches[0]
+        risk = _risk_from_analysis(match["metadata"]["analysis"])
+        return {
+            "risk": risk,
+            "type": match["metadata"]["type"] if risk != "Low" else "Safe",
+            "score": match["score"],
+            "reason": match["metadata"]["analysis"]
+        }
 
     def get_embedding(self, text):
-        return [0.0] * 384 # Dummy vector
+        return self.embedder.embed([text])[0]
 
 @st.cache_resource
 def get_vector_kb():
@@ -0,0 +1,34 @@
+import time
+
+from src.services.audit import AuditLog
+
+
+def _lines(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return sum(1 for _ in f)
+    except FileNotFoundError:
+        return 0
+
+
+def test_steady_traffic_is_written_within_the_flush_window(tmp_path):
+    path = str(tmp_path / "audit.jsonl")
+    log = AuditLog(path, flush_seconds=0.5)
+    # Events arrive faster than the window, so a sliding window would never write
+    for i in range(10):
+        log.log("event", n=i)
+        time.sleep(0.2)
+    assert _lines(path) > 0  # before flush()
+    log.flush()
+    assert _lines(path) == 10
+
+
+def test_batches_are_capped(tmp_path):
+    path = str(tmp_path / "audit.jsonl")
+    log = AuditLog(path, flush_seconds=30, max_batch=5)
+    for i in range(10):
+        log.log("event", n=i)
+    deadline = time.monotonic() + 5
+    while _lines(path) < 10 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert _lines(path) == 10  # two full batches, written long before the window ends